@@ -0,0 +1,162 @@
+import heapq
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set
+
+from assembly_line import orchestrate_assembly
+
+
+class AssemblyTask(NamedTuple):
+    name: str
+    action: Callable[[], Any]
+    requires: Sequence[str] = ()
+    # Expected seconds; only the ratios matter for scheduling
+    estimate: float = 1.0
+
+
+class AssemblyEvent(NamedTuple):
+    task: str
+    status: str  # "done", "failed" or "cancelled"
+    result: Any = None
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+
+
+class ShellStep:
+    """A picklable action that runs one shell command and fails on a non-zero exit."""
+    def __init__(self, command: str, cwd: Optional[str] = None):
+        self.command = command
+        self.cwd = cwd
+
+    def __call__(self) -> str:
+        completed = subprocess.run(self.command, shell=True, cwd=self.cwd, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"'{self.command}' exited with {completed.returncode}: {completed.stderr.strip()[-500:]}")
+        return completed.stdout
+
+
+def critical_path_lengths(tasks: Sequence[AssemblyTask]) -> Dict[str, float]:
+    """
+    The Longest Weld (bottom levels).
+    For every task, its estimate plus the heaviest chain of dependents after it.
+    Raises ValueError on unknown prerequisites or circular dependencies.
+    """
+    index = {task.name: i for i, task in enumerate(tasks)}
+    if len(index) != len(tasks):
+        raise ValueError("Duplicate task names on the assembly floor")
+    edges = []
+    for task in tasks:
+        for prerequisite in task.requires:
+            if prerequisite not in index:
+                raise ValueError(f"Task '{task.name}' requires unknown task '{prerequisite}'")
+            edges.append([index[prerequisite], index[task.name]])
+    order = orchestrate_assembly(len(tasks), edges)
+    if len(order) != len(tasks):
+        raise ValueError("Circular dependency detected. Parts are stuck waiting for each other.")
+
+    dependents: List[List[int]] = [[] for _ in tasks]
+    for prerequisite, dependent in edges:
+        dependents[prerequisite].append(dependent)
+    level = [0.0] * len(tasks)
+    for i in reversed(order):
+        level[i] = tasks[i].estimate + max((level[d] for d in dependents[i]), default=0.0)
+    return {task.name: level[i] for i, task in enumerate(tasks)}
+
+
+def execute_assembly(tasks: Iterable[AssemblyTask], workers: int = 4, use_processes: bool = False,
+                     executor: Optional[Executor] = None) -> Iterator[AssemblyEvent]:
+    """
+    The Parallel Assembly Floor.
+    Runs every task once its prerequisites are done, at most `workers` at a time,
+    always starting the ready task with the longest remaining chain first.
+    Events are yielded the moment each task finishes. A failure cancels only
+    the tasks that depend on it; independent branches keep running.
+    """
+    tasks = list(tasks)
+    levels = critical_path_lengths(tasks)
+    by_name = {task.name: task for task in tasks}
+    waiting_on = {task.name: len(set(task.requires)) for task in tasks}
+    dependents: Dict[str, List[str]] = {task.name: [] for task in tasks}
+    for task in tasks:
+        for prerequisite in set(task.requires):
+            dependents[prerequisite].append(task.name)
+
+    # The conveyor belt, heaviest chain first (ties keep the caller's order)
+    position = {task.name: i for i, task in enumerate(tasks)}
+    ready = [(-levels[name], position[name], name) for name, locks in waiting_on.items() if locks == 0]
+    heapq.heapify(ready)
+
+    owned = executor is None
+    if owned:
+        executor = ProcessPoolExecutor(max_workers=workers) if use_processes else ThreadPoolExecutor(max_workers=workers)
+    running: Dict[Future, str] = {}
+    started: Dict[str, float] = {}
+    cancelled: Set[str] = set()
+    try:
+        while ready or running:
+            while ready and len(running) < workers:
+                _, _, name = heapq.heappop(ready)
+                started[name] = time.perf_counter()
+                running[executor.submit(by_name[name].action)] = name
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                elapsed = time.perf_counter() - started[name]
+                error = future.exception()
+                if error is None:
+                    yield AssemblyEvent(name, "done", future.result(), None, elapsed)
+                    for dependent in dependents[name]:
+                        waiting_on[dependent] -= 1
+                        if waiting_on[dependent] == 0 and dependent not in cancelled:
+                            heapq.heappush(ready, (-levels[dependent], position[dependent], dependent))
+                    continue
+                yield AssemblyEvent(name, "failed", None, error, elapsed)
+                # Scrap everything downstream of the broken part, and only that
+                doomed = [d for d in dependents[name] if d not in cancelled]
+                while doomed:
+                    dependent = doomed.pop()
+                    if dependent in cancelled:
+                        continue
+                    cancelled.add(dependent)
+                    yield AssemblyEvent(dependent, "cancelled", None, error, 0.0)
+                    doomed.extend(d for d in dependents[dependent] if d not in cancelled)
+    finally:
+        if owned:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# --- THE ASSEMBLY FLOOR CONSOLE ---
+if __name__ == "__main__":
+    def station(seconds: float, fail: bool = False) -> Callable[[], str]:
+        def work() -> str:
+            time.sleep(seconds)
+            if fail:
+                raise RuntimeError("weld cracked")
+            return f"{seconds:.2f}s of work"
+        return work
+
+    # lint/test/build of two independent modules, then a package step that needs both builds
+    plan = [
+        AssemblyTask("lint:core", station(0.2), (), 0.2),
+        AssemblyTask("test:core", station(0.6), ("lint:core",), 0.6),
+        AssemblyTask("build:core", station(0.3), ("test:core",), 0.3),
+        AssemblyTask("lint:forge", station(0.1), (), 0.1),
+        AssemblyTask("test:forge", station(0.3), ("lint:forge",), 0.3),
+        AssemblyTask("build:forge", station(0.2), ("test:forge",), 0.2),
+        AssemblyTask("docs", station(0.4), (), 0.4),
+        AssemblyTask("flaky:desktop", station(0.1, fail=True), (), 0.1),
+        AssemblyTask("build:desktop", station(0.5), ("flaky:desktop",), 0.5),
+        AssemblyTask("package", station(0.2), ("build:core", "build:forge"), 0.2),
+    ]
+    serial = sum(task.estimate for task in plan)
+    chain = max(critical_path_lengths(plan).values())
+
+    print("=== SHELA PARALLEL ASSEMBLY FLOOR ===")
+    t0 = time.perf_counter()
+    for event in execute_assembly(plan, workers=4):
+        note = f" ({event.error})" if event.error else ""
+        print(f"  [{time.perf_counter() - t0:5.2f}s] {event.status:<9} {event.task}{note}")
+    wall = time.perf_counter() - t0
+    print(f"Wall clock {wall:.2f}s | critical path {chain:.2f}s | serial sum {serial:.2f}s")
+    print("=====================================")
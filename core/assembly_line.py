@@ -1,4 +1,5 @@
-from typing import List
+from array import array
+from typing import Iterable, List, NamedTuple, Sequence, Tuple
 from collections import deque, defaultdict
 
 def orchestrate_assembly(V: int, edges: List[List[int]]) -> List[int]:
@@ -41,8 +42,200 @@ def orchestrate_assembly(V: int, edges: List[List[int]]) -> List[int]:
         # Circular dependency detected. Parts are stuck waiting for each other.
         return []
 
+class IncrementalTopoOrder:
+    """
+    The Living Blueprint (Pearce-Kelly dynamic topological order).
+    Keeps a valid assembly order while parts and welds are added. A weld that
+    already agrees with the order costs O(1); otherwise only the parts ranked
+    between its two ends are searched and shuffled, and a weld that would close
+    a loop is refused at the same cost.
+    """
+    def __init__(self, V: int = 0, edges: Iterable[Tuple[int, int]] = ()):
+        edges = [tuple(edge) for edge in edges]
+        self.successors: List[set] = [set() for _ in range(V)]
+        self.predecessors: List[set] = [set() for _ in range(V)]
+        for prereq, dependent in edges:
+            self.successors[prereq].add(dependent)
+            self.predecessors[dependent].add(prereq)
+        order = orchestrate_assembly(V, [list(edge) for edge in edges])
+        if len(order) != V:
+            raise ValueError("Circular dependency detected. Parts are stuck waiting for each other.")
+        # rank[part] is its slot in the order; slot[i] is the part in slot i
+        self.slot: List[int] = order
+        self.rank: List[int] = [0] * V
+        for i, part in enumerate(order):
+            self.rank[part] = i
+        # Parts visited by the last out-of-order insertion (instrumentation)
+        self.last_region = 0
+
+    def __len__(self) -> int:
+        return len(self.slot)
+
+    def order(self) -> List[int]:
+        return list(self.slot)
+
+    def add_node(self) -> int:
+        """A fresh part with no welds, placed at the end of the line."""
+        part = len(self.slot)
+        self.successors.append(set())
+        self.predecessors.append(set())
+        self.rank.append(part)
+        self.slot.append(part)
+        return part
+
+    def add_edge(self, prereq: int, dependent: int) -> bool:
+        """Weld prereq -> dependent. Returns False, changing nothing, if it would close a cycle."""
+        if prereq == dependent:
+            return False
+        if dependent in self.successors[prereq]:
+            return True
+        rank = self.rank
+        lower, upper = rank[dependent], rank[prereq]
+        self.last_region = 0
+        if lower > upper:
+            self._weld(prereq, dependent)
+            return True
+
+        # Forward from the dependent through parts ranked below the prereq
+        forward, seen = [], {dependent}
+        stack = [dependent]
+        while stack:
+            part = stack.pop()
+            forward.append(part)
+            for nxt in self.successors[part]:
+                if nxt == prereq:
+                    self.last_region = len(forward)
+                    return False
+                if nxt not in seen and rank[nxt] < upper:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        # Backward from the prereq through parts ranked above the dependent
+        backward, seen = [], {prereq}
+        stack = [prereq]
+        while stack:
+            part = stack.pop()
+            backward.append(part)
+            for prev in self.predecessors[part]:
+                if prev not in seen and rank[prev] > lower:
+                    seen.add(prev)
+                    stack.append(prev)
+        self.last_region = len(forward) + len(backward)
+
+        # Reuse the same slots: the prereq's ancestors first, then the dependent's descendants
+        forward.sort(key=rank.__getitem__)
+        backward.sort(key=rank.__getitem__)
+        moved = backward + forward
+        slots = sorted(rank[part] for part in moved)
+        for part, i in zip(moved, slots):
+            rank[part] = i
+            self.slot[i] = part
+        self._weld(prereq, dependent)
+        return True
+
+    def _weld(self, prereq: int, dependent: int) -> None:
+        self.successors[prereq].add(dependent)
+        self.predecessors[dependent].add(prereq)
+
+
+class DeadlockReport(NamedTuple):
+    # component[part] is the id of the strongly connected group holding it
+    component: array
+    # Every group, indexed by component id
+    groups: List[List[int]]
+    # Groups that jam the line: several parts, or a part welded to itself
+    cycles: List[List[int]]
+    # Component ids in a valid assembly order of the condensed DAG
+    order: List[int]
+
+
+def diagnose_deadlocks(V: int, edges: Sequence[Sequence[int]]) -> DeadlockReport:
+    """
+    The Jam Inspector (Tarjan's SCC, iterative).
+    Finds every group of parts waiting on each other, where orchestrate_assembly
+    can only report that some deadlock exists. Explicit stacks and flat arrays
+    replace recursion, so million-part lines do not exhaust the call stack.
+    Kinetic Complexity: O(V + E) Time | O(V + E) Space.
+    """
+    # Compressed blueprints: the dependents of part u are targets[offsets[u]:offsets[u + 1]]
+    offsets = array('l', [0]) * (V + 1)
+    for prereq, _ in edges:
+        offsets[prereq + 1] += 1
+    for u in range(V):
+        offsets[u + 1] += offsets[u]
+    fill = array('l', offsets)
+    targets = array('l', [0]) * len(edges)
+    self_welded = bytearray(V)
+    for prereq, dependent in edges:
+        targets[fill[prereq]] = dependent
+        fill[prereq] += 1
+        if prereq == dependent:
+            self_welded[prereq] = 1
+
+    UNSEEN = -1
+    index = array('l', [UNSEEN]) * V
+    low = array('l', [0]) * V
+    component = array('l', [UNSEEN]) * V
+    on_stack = bytearray(V)
+    # Next edge to inspect for each part on the descent path
+    cursor = array('l', [0]) * V
+    tarjan_stack: List[int] = []
+    groups: List[List[int]] = []
+    counter = 0
+
+    for root in range(V):
+        if index[root] != UNSEEN:
+            continue
+        descent = [root]
+        index[root] = low[root] = counter
+        counter += 1
+        cursor[root] = offsets[root]
+        tarjan_stack.append(root)
+        on_stack[root] = 1
+        while descent:
+            u = descent[-1]
+            e = cursor[u]
+            if e < offsets[u + 1]:
+                cursor[u] = e + 1
+                v = targets[e]
+                if index[v] == UNSEEN:
+                    index[v] = low[v] = counter
+                    counter += 1
+                    cursor[v] = offsets[v]
+                    tarjan_stack.append(v)
+                    on_stack[v] = 1
+                    descent.append(v)
+                elif on_stack[v] and index[v] < low[u]:
+                    low[u] = index[v]
+                continue
+            # Every weld out of u inspected: close it off
+            descent.pop()
+            if descent:
+                parent = descent[-1]
+                if low[u] < low[parent]:
+                    low[parent] = low[u]
+            if low[u] == index[u]:
+                group_id = len(groups)
+                group = []
+                while True:
+                    part = tarjan_stack.pop()
+                    on_stack[part] = 0
+                    component[part] = group_id
+                    group.append(part)
+                    if part == u:
+                        break
+                groups.append(group)
+
+    cycles = [group for group in groups if len(group) > 1 or self_welded[group[0]]]
+    # Tarjan closes sink groups first, so the reverse is a topological order
+    return DeadlockReport(component, groups, cycles, list(range(len(groups) - 1, -1, -1)))
+
+
 # --- THE FACTORY FLOOR OUTLET ---
 if __name__ == "__main__":
+    # python assembly_line.py          the six-part demo
+    # python assembly_line.py bench    also time the living blueprint and the jam inspector at scale
+    import sys
+
     total_components = 6
     # 0->1, 0->2, 1->3, 2->3, 3->4, 5->4
     welds = [[0, 1], [0, 2], [1, 3], [2, 3], [3, 4], [5, 4]]
@@ -58,3 +251,51 @@ if __name__ == "__main__":
     else:
         print("CRITICAL ERROR: Deadlock detected. Scrapping build.")
     print("==========================================")
+    if len(sys.argv) < 2 or sys.argv[1] != "bench":
+        sys.exit(0)
+
+    # --- THE LIVING BLUEPRINT BENCH ---
+    import random
+    import time
+
+    rng = random.Random(40)
+    parts, initial, inserts = 100_000, 20_000, 2_000
+    # A hidden ranking guarantees every weld is acyclic
+    hidden = list(range(parts))
+    rng.shuffle(hidden)
+
+    def acyclic_weld():
+        a, b = rng.sample(range(parts), 2)
+        return [hidden[min(a, b)], hidden[max(a, b)]]
+
+    base = [acyclic_weld() for _ in range(initial)]
+    fresh = [acyclic_weld() for _ in range(inserts)]
+    print("\n=== LIVING BLUEPRINT BENCH ===")
+    blueprint = IncrementalTopoOrder(parts, base)
+    region = 0
+    t0 = time.perf_counter()
+    for prereq, dependent in fresh:
+        blueprint.add_edge(prereq, dependent)
+        region += blueprint.last_region
+    incremental = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    orchestrate_assembly(parts, base)
+    recompute = time.perf_counter() - t0
+    loops = sum(not blueprint.add_edge(dependent, prereq) for prereq, dependent in fresh[:200])
+    print(f"{parts} parts, {initial} welds, {inserts} insertions")
+    print(f"Incremental: {1e6 * incremental / inserts:.1f} us/weld (avg region {region / inserts:.0f} parts)")
+    print(f"Full Kahn recompute: {1e3 * recompute:.1f} ms/weld")
+    print(f"Reversed welds refused as loops: {loops}/200")
+    print("==============================")
+
+    # --- THE JAM INSPECTOR BENCH ---
+    parts = 1_000_000
+    welds = [[u, rng.randrange(parts)] for u in range(parts) for _ in range(2)]
+    print("\n=== JAM INSPECTOR BENCH ===")
+    t0 = time.perf_counter()
+    report = diagnose_deadlocks(parts, welds)
+    elapsed = time.perf_counter() - t0
+    largest = max(len(group) for group in report.cycles) if report.cycles else 0
+    print(f"{parts} parts, {len(welds)} welds: {len(report.groups)} groups, {len(report.cycles)} jams "
+          f"(largest {largest} parts) in {elapsed:.2f}s")
+    print("===========================")
@@ -0,0 +1,188 @@
+import heapq
+import json
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from shela_ear import calculate_dissonance
+
+
+class ResonanceNode:
+    def __init__(self, word: str):
+        # The anchored motif
+        self.word = word
+        # Children keyed by their exact dissonance from this motif
+        self.echoes: Dict[int, 'ResonanceNode'] = {}
+
+
+class ResonanceTree:
+    """
+    The BK-Tree (Burkhard-Keller) over the Forgiving Ear metric.
+    Kinetic Complexity: O(L) distance evaluations per insert (L = depth),
+    queries prune every branch the triangle inequality rules out.
+    """
+    def __init__(self, words: Iterable[str] = (), metric: Callable[[str, str], int] = calculate_dissonance):
+        self.metric = metric
+        self.root: Optional[ResonanceNode] = None
+        self.size = 0
+        # Every call to the metric is counted so the pruning can be measured
+        self.evaluations = 0
+        self.build(words)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, word: str) -> bool:
+        return bool(self.query(word, 0))
+
+    def _measure(self, a: str, b: str) -> int:
+        self.evaluations += 1
+        return self.metric(a, b)
+
+    def build(self, words: Iterable[str]) -> int:
+        """Bulk insert. Returns how many new motifs were anchored."""
+        added = 0
+        for word in words:
+            if self.insert(word):
+                added += 1
+        return added
+
+    def insert(self, word: str) -> bool:
+        if self.root is None:
+            self.root = ResonanceNode(word)
+            self.size = 1
+            return True
+
+        current = self.root
+        while True:
+            distance = self._measure(word, current.word)
+            if distance == 0:
+                # Already in the choir
+                return False
+            child = current.echoes.get(distance)
+            if child is None:
+                current.echoes[distance] = ResonanceNode(word)
+                self.size += 1
+                return True
+            current = child
+
+    def query(self, word: str, radius: int) -> List[Tuple[int, str]]:
+        """
+        Every motif within `radius` strikes of `word`, as (distance, word)
+        pairs sorted by distance.
+        """
+        if self.root is None or radius < 0:
+            return []
+
+        harmonics = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            distance = self._measure(word, node.word)
+            if distance <= radius:
+                harmonics.append((distance, node.word))
+            # Triangle inequality: only echoes in [d - r, d + r] can resonate
+            low, high = distance - radius, distance + radius
+            for edge, child in node.echoes.items():
+                if low <= edge <= high:
+                    stack.append(child)
+        harmonics.sort()
+        return harmonics
+
+    def nearest(self, word: str, k: int = 1) -> List[Tuple[int, str]]:
+        """
+        The `k` closest motifs to `word`, as (distance, word) pairs sorted
+        by distance. Branches are explored best-first by their lower bound.
+        """
+        if self.root is None or k <= 0:
+            return []
+
+        # Max-heap (negated) of the k best candidates found so far
+        best: List[Tuple[int, str]] = []
+        # Min-heap of (lower_bound, tiebreak, node) still worth visiting
+        frontier = [(0, 0, self.root)]
+        tiebreak = 1
+        while frontier:
+            bound, _, node = heapq.heappop(frontier)
+            if len(best) == k and bound > -best[0][0]:
+                # Nothing left can beat the current k-th candidate
+                break
+            distance = self._measure(word, node.word)
+            if len(best) < k:
+                heapq.heappush(best, (-distance, node.word))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, node.word))
+            tau = -best[0][0] if len(best) == k else None
+            for edge, child in node.echoes.items():
+                child_bound = abs(distance - edge)
+                if tau is None or child_bound <= tau:
+                    heapq.heappush(frontier, (child_bound, tiebreak, child))
+                    tiebreak += 1
+
+        return sorted((-neg, w) for neg, w in best)
+
+    def to_dict(self) -> dict:
+        """Flatten the tree into a JSON-friendly structure (iterative, depth-safe)."""
+        if self.root is None:
+            return {"size": 0, "nodes": []}
+        # Each node: [word, parent_index, edge]; parents always precede children
+        nodes = [[self.root.word, -1, 0]]
+        stack = [(self.root, 0)]
+        while stack:
+            node, index = stack.pop()
+            for edge, child in node.echoes.items():
+                nodes.append([child.word, index, edge])
+                stack.append((child, len(nodes) - 1))
+        return {"size": self.size, "nodes": nodes}
+
+    @classmethod
+    def from_dict(cls, data: dict, metric: Callable[[str, str], int] = calculate_dissonance) -> 'ResonanceTree':
+        tree = cls(metric=metric)
+        built: List[ResonanceNode] = []
+        for word, parent, edge in data.get("nodes", []):
+            node = ResonanceNode(word)
+            if parent == -1:
+                tree.root = node
+            else:
+                built[parent].echoes[edge] = node
+            built.append(node)
+        tree.size = len(built)
+        return tree
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str, metric: Callable[[str, str], int] = calculate_dissonance) -> 'ResonanceTree':
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f), metric=metric)
+
+
+# --- THE RESONANCE BENCH ---
+if __name__ == "__main__":
+    import random
+    import string
+
+    rng = random.Random(7)
+
+    def forge_vocabulary(n: int) -> List[str]:
+        return ["".join(rng.choice(string.ascii_uppercase[:8]) for _ in range(rng.randint(4, 10))) for _ in range(n)]
+
+    print("==========================================")
+    print("   SHELA RESONANCE TREE: PRUNING BENCH    ")
+    print("==========================================")
+    print(f"{'vocab':>8} {'radius':>7} {'evals/query':>12} {'% of linear':>12}")
+    for size in (1000, 5000, 20000):
+        tree = ResonanceTree(forge_vocabulary(size))
+        probes = forge_vocabulary(50)
+        for radius in (0, 1, 2, 3):
+            tree.evaluations = 0
+            for probe in probes:
+                tree.query(probe, radius)
+            per_query = tree.evaluations / len(probes)
+            print(f"{len(tree):>8} {radius:>7} {per_query:>12.1f} {100 * per_query / len(tree):>11.1f}%")
+        tree.evaluations = 0
+        for probe in probes:
+            tree.nearest(probe, 5)
+        per_query = tree.evaluations / len(probes)
+        print(f"{len(tree):>8} {'k=5':>7} {per_query:>12.1f} {100 * per_query / len(tree):>11.1f}%")
+    print("==========================================")
@@ -0,0 +1,310 @@
+import fcntl
+import hashlib
+import json
+import os
+import queue
+import selectors
+import socket
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# sun_path is 108 bytes on Linux; deep workspaces fall back to a hashed name in /tmp
+MAX_SOCKET_PATH = 100
+ATTACH_ATTEMPTS = 50
+
+
+def bus_path_for(workspace_file: str) -> str:
+    """The socket every duo instance on the same state file agrees on."""
+    path = os.path.abspath(os.path.join(os.path.dirname(workspace_file), ".shela_bus.sock"))
+    if len(path.encode()) <= MAX_SOCKET_PATH:
+        return path
+    digest = hashlib.sha1(path.encode()).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"shela-bus-{digest}.sock")
+
+
+class CarbonBus:
+    """
+    The Shared Nerve (pub/sub over a Unix-domain socket).
+    The first instance to take the lock beside the socket hosts the bus; later
+    ones attach as clients. Every published event reaches every other member
+    within milliseconds, and none is echoed back to its sender. If the host
+    leaves, the survivors hold a new election and one of them hosts from then on.
+    The state file stays the durable record; the bus only says "look now".
+
+    Events arrive in `inbox`; `fileno()` turns readable when one is waiting, so
+    the bus can sit in the same select() as stdin.
+    """
+    def __init__(self, path: str, member: str):
+        self.path = path
+        self.member = member
+        self.inbox: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self.is_host = False
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._send_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._lock_file = None
+        self._listener: Optional[socket.socket] = None
+        self._peers: List[socket.socket] = []
+        self._link: Optional[socket.socket] = None
+        self._threads: List[threading.Thread] = []
+        self._attach()
+
+    # --- Election ---
+
+    def _attach(self) -> None:
+        for _ in range(ATTACH_ATTEMPTS):
+            if self._closed.is_set():
+                return
+            lock_file = open(self.path + ".lock", "a+")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                if self._connect():
+                    return
+                # The host holds the lock but has not bound yet
+                time.sleep(0.02)
+                continue
+            self._host(lock_file)
+            return
+        raise ConnectionError(f"could not join or host the bus at {self.path}")
+
+    def _connect(self) -> bool:
+        link = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            link.connect(self.path)
+        except OSError:
+            link.close()
+            return False
+        self._link = link
+        self.is_host = False
+        self._spawn(self._listen, link, "shela-bus-client")
+        return True
+
+    def _host(self, lock_file) -> None:
+        # Whoever owns the lock owns the path: a socket left behind by a crashed host is stale
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.path)
+        listener.listen()
+        listener.setblocking(False)
+        self._lock_file = lock_file
+        self._listener = listener
+        self.is_host = True
+        # Registered here, so a close() racing the thread start cannot leave it a dead fd
+        selector = selectors.DefaultSelector()
+        selector.register(listener, selectors.EVENT_READ)
+        self._spawn(self._serve, selector, "shela-bus-host")
+
+    def _spawn(self, target, resource: Any, name: str) -> None:
+        thread = threading.Thread(target=target, args=(resource,), name=name, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    # --- Delivery ---
+
+    def _deliver(self, line: bytes) -> None:
+        if self._closed.is_set():
+            return
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return
+        self.inbox.put(event)
+        try:
+            os.write(self._wake_w, b"!")
+        except BlockingIOError:
+            pass  # The pipe is already full of wake-ups
+
+    def _broadcast(self, line: bytes, origin: Optional[socket.socket] = None) -> None:
+        with self._send_lock:
+            for peer in list(self._peers):
+                if peer is origin:
+                    continue
+                try:
+                    peer.sendall(line)
+                except OSError:
+                    # Only hang up here; the serve thread sees the EOF, unregisters and closes it,
+                    # so its selector never holds a closed fd that accept() could hand out again
+                    self._peers.remove(peer)
+                    try:
+                        peer.shutdown(socket.SHUT_RDWR)
+                    except OSError:
+                        pass
+
+    def _drop(self, peer: socket.socket) -> None:
+        if peer in self._peers:
+            self._peers.remove(peer)
+        peer.close()
+
+    def _serve(self, selector: selectors.BaseSelector) -> None:
+        listener = self._listener
+        pending: Dict[socket.socket, bytes] = {}
+        while not self._closed.is_set():
+            for key, _ in selector.select(timeout=0.2):
+                if key.fileobj is listener:
+                    try:
+                        peer, _ = listener.accept()
+                    except OSError:
+                        continue
+                    with self._send_lock:
+                        self._peers.append(peer)
+                    selector.register(peer, selectors.EVENT_READ)
+                    pending[peer] = b""
+                    continue
+                peer = key.fileobj
+                try:
+                    data = peer.recv(65536)
+                except OSError:
+                    data = b""
+                if not data:
+                    selector.unregister(peer)
+                    pending.pop(peer, None)
+                    with self._send_lock:
+                        self._drop(peer)
+                    continue
+                *lines, pending[peer] = (pending[peer] + data).split(b"\n")
+                for line in lines:
+                    self._deliver(line)
+                    self._broadcast(line + b"\n", origin=peer)
+        selector.close()
+
+    def _listen(self, link: socket.socket) -> None:
+        buffer = b""
+        while True:
+            try:
+                data = link.recv(65536)
+            except OSError:
+                data = b""
+            if not data:
+                break
+            *lines, buffer = (buffer + data).split(b"\n")
+            for line in lines:
+                self._deliver(line)
+        link.close()
+        if not self._closed.is_set():
+            # The host is gone; one survivor takes over, the rest attach to it
+            try:
+                self._attach()
+            except OSError:
+                self._link = None  # Deaf from here on; the state file still records everything
+
+    # --- The public surface ---
+
+    def publish(self, kind: str, **payload: Any) -> Dict[str, Any]:
+        event = {"kind": kind, "member": self.member, "ts": time.time(), **payload}
+        line = json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n"
+        if self.is_host:
+            self._broadcast(line)
+        else:
+            with self._send_lock:
+                try:
+                    self._link.sendall(line)
+                except (OSError, AttributeError):
+                    pass  # Mid-failover: the state file still carries it
+        return event
+
+    def fileno(self) -> int:
+        return self._wake_r
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Every event waiting, oldest first, without blocking."""
+        try:
+            while os.read(self._wake_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        events = []
+        while True:
+            try:
+                events.append(self.inbox.get_nowait())
+            except queue.Empty:
+                return events
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        try:
+            return self.inbox.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._link is not None:
+            try:
+                self._link.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._listener is not None:
+            self._listener.close()
+            with self._send_lock:
+                for peer in list(self._peers):
+                    self._drop(peer)
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+        if self._lock_file is not None:
+            self._lock_file.close()
+        # The wake pipe outlives every thread that could still write to it
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=1)
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+def join_bus(workspace_file: str, member: str) -> Optional[CarbonBus]:
+    """Attach to (or host) the bus for this workspace; None where Unix sockets are unavailable."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        return CarbonBus(bus_path_for(workspace_file), member)
+    except OSError:
+        return None
+
+
+# --- THE SHARED NERVE BENCH ---
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as scratch:
+        state = os.path.join(scratch, ".shela_duo_state.md")
+        with open(state, "w") as f:
+            f.write("# Duo Session State\n")
+        members = [join_bus(state, f"carbon-{i}") for i in range(8)]
+        print("=== SHELA SHARED NERVE ===")
+        print(f"Host: {[bus.member for bus in members if bus.is_host]} | attached: {len(members) - 1}")
+
+        latencies = []
+        for round_ in range(200):
+            sender = members[round_ % len(members)]
+            receiver = members[(round_ + 1) % len(members)]
+            sent = sender.publish("carbon", prompt=f"prompt {round_}")
+            while True:
+                event = receiver.get(timeout=1)
+                if event and event.get("prompt") == f"prompt {round_}":
+                    break
+            latencies.append(time.time() - sent["ts"])
+        latencies.sort()
+        print(f"Bus delivery over {len(latencies)} prompts: median {1000 * latencies[len(latencies) // 2]:.2f} ms, "
+              f"p99 {1000 * latencies[int(len(latencies) * 0.99)]:.2f} ms")
+        print(f"Polling the state file every 0.5 s: ~250 ms average wait, {len(members)} full reads per tick")
+
+        host = next(bus for bus in members if bus.is_host)
+        survivors = [bus for bus in members if bus is not host]
+        t0 = time.perf_counter()
+        host.close()
+        while sum(bus.is_host for bus in survivors) != 1:
+            time.sleep(0.005)
+        print(f"Host left; a survivor took over in {1000 * (time.perf_counter() - t0):.1f} ms")
+        for bus in survivors:
+            bus.close()
+    print("==========================")
@@ -0,0 +1,383 @@
+import hashlib
+import json
+import os
+import random
+import struct
+import sys
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+# Chunk sizes tuned for a markdown session log: small enough that an appended
+# turn or an edited line re-sends a few KiB, large enough to keep manifests short
+MIN_CHUNK = 512
+AVG_CHUNK = 2048
+MAX_CHUNK = 16384
+STORE_DIR = ".shela_chunks"
+FRAME = struct.Struct(">II")
+DIGEST_SIZE = 32
+MASK64 = (1 << 64) - 1
+
+# The Gear table: one fixed random 64-bit word per byte value, identical on every peer
+_gear_rng = random.Random(0x5E1A)
+GEAR = [_gear_rng.getrandbits(64) for _ in range(256)]
+
+
+def chunk_boundaries(data: bytes, min_size: int = MIN_CHUNK, avg_size: int = AVG_CHUNK,
+                     max_size: int = MAX_CHUNK) -> List[int]:
+    """
+    The Cut Points (content-defined chunking with a Gear rolling hash).
+    Returns the end offset of every chunk. A cut falls wherever the hash of the
+    last ~64 bytes has its top bits clear, so boundaries move with the content:
+    inserting a line shifts one or two chunks, not every chunk after it.
+    """
+    # avg_size is a power of two; test the high bits, which mix the widest window
+    mask = (avg_size - 1) << (64 - avg_size.bit_length() + 1)
+    ends = []
+    start, n = 0, len(data)
+    gear = GEAR
+    while start < n:
+        if n - start <= min_size:
+            ends.append(n)
+            break
+        limit = min(n, start + max_size)
+        h = 0
+        cut = limit
+        # The first min_size bytes can never end a chunk, so they are not hashed
+        for i in range(start + min_size, limit):
+            h = ((h << 1) + gear[data[i]]) & MASK64
+            if not h & mask:
+                cut = i + 1
+                break
+        ends.append(cut)
+        start = cut
+    return ends
+
+
+def split_chunks(data: bytes) -> List[bytes]:
+    chunks, start = [], 0
+    for end in chunk_boundaries(data):
+        chunks.append(data[start:end])
+        start = end
+    return chunks
+
+
+def digest_of(chunk: bytes) -> str:
+    return hashlib.sha256(chunk).hexdigest()
+
+
+class SyncReport(NamedTuple):
+    chunks: int
+    chunks_sent: int
+    bytes_sent: int   # everything on the wire, chunk bodies and protocol alike
+    bytes_full: int   # what copying the whole file would have cost
+
+    @property
+    def saved(self) -> float:
+        return 1 - self.bytes_sent / self.bytes_full if self.bytes_full else 0.0
+
+
+class ChunkStore:
+    """Content-addressed chunks on disk: <root>/<first two hex digits>/<rest of the sha256>."""
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def has(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def put(self, chunk: bytes) -> str:
+        digest = digest_of(chunk)
+        path = self.path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(chunk)
+            os.replace(tmp, path)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        with open(self.path(digest), "rb") as f:
+            return f.read()
+
+    def prune(self, keep: Set[str]) -> int:
+        """Delete every stored chunk whose digest is not in `keep`; returns how many went."""
+        removed = 0
+        for prefix in os.listdir(self.root):
+            shard = os.path.join(self.root, prefix)
+            if len(prefix) != 2 or not os.path.isdir(shard):
+                continue
+            for rest in os.listdir(shard):
+                # Half-written .tmp files belong to a put still in flight
+                if rest.endswith(".tmp") or prefix + rest in keep:
+                    continue
+                os.unlink(os.path.join(shard, rest))
+                removed += 1
+            if not os.listdir(shard):
+                os.rmdir(shard)
+        return removed
+
+
+class SyncPeer:
+    """
+    The Receiving Ear.
+    Answers the sync protocol for one directory: which chunks of this manifest
+    are missing, take these chunks, and rebuild the file. Before saying what
+    it lacks, it chunks its own copy of the file (unless it wrote that copy
+    itself), so an older version already on disk is reused even when the
+    chunk store is empty. Each file's manifest is recorded beside its stamp,
+    and after every assemble the store keeps only chunks some recorded (or
+    still pending) manifest names, so it never outgrows the files it mirrors.
+    """
+    def __init__(self, root: str, store_dir: str = STORE_DIR):
+        self.root = os.path.abspath(root)
+        self.store = ChunkStore(os.path.join(self.root, store_dir))
+        self.stamps_path = os.path.join(self.store.root, "stamps.json")
+        self._pending: Dict[str, List[str]] = {}
+
+    def _resolve(self, name: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, name))
+        if os.path.commonpath([path, self.root]) != self.root:
+            raise ValueError(f"'{name}' escapes the workspace")
+        return path
+
+    def _stamps(self) -> Dict[str, Dict[str, List]]:
+        # name -> {"stamp": [size, mtime_ns], "manifest": [hex digests]}
+        try:
+            with open(self.stamps_path) as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {name: record for name, record in records.items() if isinstance(record, dict)}
+
+    @staticmethod
+    def _stamp(path: str) -> List[int]:
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+
+    def _remember(self, name: str, path: str, manifest: List[str]) -> None:
+        stamps = self._stamps()
+        stamps[name] = {"stamp": self._stamp(path), "manifest": manifest}
+        tmp = f"{self.stamps_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(stamps, f)
+        os.replace(tmp, self.stamps_path)
+
+    def _index_existing(self, name: str) -> None:
+        path = self._resolve(name)
+        if not os.path.exists(path) or self._stamps().get(name, {}).get("stamp") == self._stamp(path):
+            return
+        with open(path, "rb") as f:
+            manifest = [self.store.put(chunk) for chunk in split_chunks(f.read())]
+        self._remember(name, path, manifest)
+
+    def _sweep(self) -> int:
+        keep = {digest for record in self._stamps().values() for digest in record.get("manifest", [])}
+        for manifest in self._pending.values():
+            keep.update(manifest)
+        return self.store.prune(keep)
+
+    def handle(self, message: Dict, payload: bytes = b"") -> Tuple[Dict, bytes]:
+        op = message.get("op")
+        if op == "missing":
+            # The manifest rides as raw 32-byte digests and is kept for the assemble that follows
+            name = message["name"]
+            self._index_existing(name)
+            manifest = [payload[i:i + DIGEST_SIZE].hex() for i in range(0, len(payload), DIGEST_SIZE)]
+            self._pending[name] = manifest
+            lacking = {d for d in manifest if not self.store.has(d)}
+            return {}, b"".join(bytes.fromhex(d) for d in sorted(lacking))
+        if op == "put":
+            digests, start = [], 0
+            for size in message["sizes"]:
+                digests.append(self.store.put(payload[start:start + size]))
+                start += size
+            return {"stored": len(digests)}, b""
+        if op == "assemble":
+            name = message["name"]
+            path = self._resolve(name)
+            manifest = self._pending.pop(name, None)
+            if manifest is None:
+                raise ValueError(f"no manifest announced for '{name}'")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                for digest in manifest:
+                    if not self.store.has(digest):
+                        f.close()
+                        os.unlink(tmp)
+                        raise ValueError(f"chunk {digest[:12]} never arrived")
+                    f.write(self.store.get(digest))
+            os.replace(tmp, path)
+            self._remember(name, path, manifest)
+            self._sweep()
+            return {"size": os.path.getsize(path)}, b""
+        raise ValueError(f"unknown sync op '{op}'")
+
+
+def encode_frame(message: Dict, payload: bytes = b"") -> bytes:
+    header = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return FRAME.pack(len(header), len(payload)) + header + payload
+
+
+def read_frame(stream: BinaryIO) -> Optional[Tuple[Dict, bytes]]:
+    head = stream.read(FRAME.size)
+    if len(head) < FRAME.size:
+        return None
+    header_size, payload_size = FRAME.unpack(head)
+    message = json.loads(stream.read(header_size))
+    return message, stream.read(payload_size)
+
+
+class LocalLink:
+    """A peer in this process. Frames are encoded only to count what a wire would carry."""
+    def __init__(self, peer: SyncPeer):
+        self.peer = peer
+        self.bytes_out = 0
+        self.bytes_in = 0
+
+    def request(self, message: Dict, payload: bytes = b"") -> Tuple[Dict, bytes]:
+        self.bytes_out += len(encode_frame(message, payload))
+        reply, body = self.peer.handle(message, payload)
+        self.bytes_in += len(encode_frame(reply, body))
+        return reply, body
+
+
+class StreamLink:
+    """A peer on the far end of a byte stream: a subprocess's pipes, a socket file, an ssh session."""
+    def __init__(self, rfile: BinaryIO, wfile: BinaryIO):
+        self.rfile = rfile
+        self.wfile = wfile
+        self.bytes_out = 0
+        self.bytes_in = 0
+
+    def request(self, message: Dict, payload: bytes = b"") -> Tuple[Dict, bytes]:
+        frame = encode_frame(message, payload)
+        self.wfile.write(frame)
+        self.wfile.flush()
+        self.bytes_out += len(frame)
+        answer = read_frame(self.rfile)
+        if answer is None:
+            raise ConnectionError("the sync peer hung up")
+        reply, body = answer
+        self.bytes_in += len(encode_frame(reply, body))
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply, body
+
+    def close(self) -> None:
+        self.wfile.write(encode_frame({"op": "bye"}))
+        self.wfile.flush()
+
+
+def serve_stream(peer: SyncPeer, rfile: BinaryIO, wfile: BinaryIO) -> None:
+    """Answer frames from `rfile` until the sender says bye or hangs up."""
+    while True:
+        frame = read_frame(rfile)
+        if frame is None or frame[0].get("op") == "bye":
+            return
+        try:
+            reply, body = peer.handle(*frame)
+        except (OSError, ValueError, KeyError) as error:
+            reply, body = {"error": str(error)}, b""
+        wfile.write(encode_frame(reply, body))
+        wfile.flush()
+
+
+def push_file(source_path: str, link, name: Optional[str] = None) -> SyncReport:
+    """
+    The Delta Duet.
+    Send `source_path` to the peer behind `link` as `name`, shipping only the
+    chunks it lacks. Three round trips: announce the manifest (32 bytes per
+    chunk), send what is missing, assemble.
+    """
+    name = name or os.path.basename(source_path)
+    with open(source_path, "rb") as f:
+        data = f.read()
+    chunks = split_chunks(data)
+    manifest = [hashlib.sha256(chunk).digest() for chunk in chunks]
+    sent_before = link.bytes_out + link.bytes_in
+
+    _, lacking = link.request({"op": "missing", "name": name}, b"".join(manifest))
+    missing = {lacking[i:i + DIGEST_SIZE] for i in range(0, len(lacking), DIGEST_SIZE)}
+    outgoing = []
+    for digest, chunk in zip(manifest, chunks):
+        if digest in missing:
+            missing.discard(digest)
+            outgoing.append(chunk)
+    if outgoing:
+        link.request({"op": "put", "sizes": [len(chunk) for chunk in outgoing]}, b"".join(outgoing))
+    link.request({"op": "assemble", "name": name})
+
+    wire = link.bytes_out + link.bytes_in - sent_before
+    return SyncReport(len(chunks), len(outgoing), wire, len(data))
+
+
+def sync_directories(source_root: str, dest_root: str, names: Sequence[str]) -> Dict[str, SyncReport]:
+    """Push each named file from one workspace to another on this machine."""
+    link = LocalLink(SyncPeer(dest_root))
+    return {name: push_file(os.path.join(source_root, name), link, name) for name in names}
+
+
+# --- THE DELTA DUET CONSOLE ---
+if __name__ == "__main__":
+    # python chunk_sync.py serve DIR          answer the protocol on stdin/stdout
+    # python chunk_sync.py push FILE DIR      push a file into another workspace, in process
+    # python chunk_sync.py bench              measure an append and an edit on a synthetic log
+    if len(sys.argv) >= 3 and sys.argv[1] == "serve":
+        serve_stream(SyncPeer(sys.argv[2]), sys.stdin.buffer, sys.stdout.buffer)
+        sys.exit(0)
+    if len(sys.argv) >= 4 and sys.argv[1] == "push":
+        report = push_file(sys.argv[2], LocalLink(SyncPeer(sys.argv[3])))
+        print(f"{report.chunks_sent}/{report.chunks} chunks, {report.bytes_sent} bytes sent "
+              f"vs {report.bytes_full} for a full copy ({report.saved:.1%} saved)")
+        sys.exit(0)
+
+    import shutil
+    import tempfile
+    import time
+
+    rng = random.Random(7)
+    voices = ["MOZART", "LOKI", "BETZALEL", "EXE", "Q"]
+    words = "the score compiled tempo rest fugue weld glitch harmony oracle breath iron".split()
+
+    def turn(i: int) -> str:
+        body = " ".join(rng.choice(words) for _ in range(rng.randint(20, 120)))
+        return f"\n<<<{rng.choice(voices)}>>>[turn {i}]\n{body}\n"
+
+    with tempfile.TemporaryDirectory() as scratch:
+        alice, bob = os.path.join(scratch, "alice"), os.path.join(scratch, "bob")
+        os.makedirs(alice)
+        log = os.path.join(alice, ".shela_duo_state.md")
+        with open(log, "w") as f:
+            f.write("# Duo Session State\n" + "".join(turn(i) for i in range(3000)))
+
+        print("=== SHELA DELTA DUET ===")
+        t0 = time.perf_counter()
+        first = sync_directories(alice, bob, [".shela_duo_state.md"])[".shela_duo_state.md"]
+        print(f"First sync:  {first.bytes_sent:>9} bytes of {first.bytes_full} "
+              f"({first.chunks} chunks) in {time.perf_counter() - t0:.2f}s")
+
+        with open(log, "a") as f:
+            f.write("".join(turn(i) for i in range(3000, 3005)))
+        t0 = time.perf_counter()
+        appended = sync_directories(alice, bob, [".shela_duo_state.md"])[".shela_duo_state.md"]
+        print(f"After append: {appended.bytes_sent:>8} bytes of {appended.bytes_full} "
+              f"({appended.chunks_sent} chunks, {appended.saved:.1%} saved) in {time.perf_counter() - t0:.2f}s")
+
+        with open(log, "rb") as f:
+            data = f.read()
+        middle = len(data) // 2
+        with open(log, "wb") as f:
+            f.write(data[:middle] + b"\n<<<CARBON>>>\nan edit in the middle of the score\n" + data[middle:])
+        t0 = time.perf_counter()
+        edited = sync_directories(alice, bob, [".shela_duo_state.md"])[".shela_duo_state.md"]
+        print(f"After edit:   {edited.bytes_sent:>8} bytes of {edited.bytes_full} "
+              f"({edited.chunks_sent} chunks, {edited.saved:.1%} saved) in {time.perf_counter() - t0:.2f}s")
+
+        with open(log, "rb") as a, open(os.path.join(bob, ".shela_duo_state.md"), "rb") as b:
+            print(f"Replicas identical: {a.read() == b.read()}")
+        shutil.rmtree(bob)
+    print("========================")
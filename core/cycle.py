@@ -1,4 +1,8 @@
-from typing import Optional
+from array import array
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+# Successor of a timeline's final measure: it falls off into the void
+VOID = -1
 
 class Node:
     def __init__(self, val: str):
@@ -37,8 +41,127 @@ def find_temporal_glitch(head: Optional[Node]) -> Optional[Node]:
 
     return adagio # The bars of the cage!
 
+class Glitch(NamedTuple):
+    start: int   # First index inside the loop
+    length: int  # Measures per repetition
+    tail: int    # Measures played before the loop is entered
+
+
+class TimelineAtlas(NamedTuple):
+    # loop[i]: id of the loop index i falls into, or VOID if its timeline ends
+    loop: array
+    # tail[i]: steps from i until it enters its loop (0 on the loop itself) or falls off the end
+    tail: array
+    # Per loop id: its length and one index lying on it
+    lengths: List[int]
+    anchors: List[int]
+
+
+def flatten_timeline(head: Optional[Node]) -> Tuple[array, List[Node]]:
+    """Renumber a linked Node chain into a successor array (VOID marks the end)."""
+    nodes: List[Node] = []
+    position = {}
+    current = head
+    while current is not None and id(current) not in position:
+        position[id(current)] = len(nodes)
+        nodes.append(current)
+        current = current.next
+    successor = array('l', [VOID]) * len(nodes)
+    for i, node in enumerate(nodes):
+        if node.next is not None:
+            successor[i] = position[id(node.next)]
+    return successor, nodes
+
+
+def brent_glitch(successor: Sequence[int], start: int = 0) -> Optional[Glitch]:
+    """
+    Brent's Teleporting Phantom.
+    The tortoise jumps to the hare at every power of two, so the loop length
+    falls out directly and each step costs one index lookup instead of the
+    three pointer hops of Floyd's chase.
+    Kinetic Complexity: O(tail + length) Time | O(1) Space.
+    """
+    if start == VOID:
+        return None
+    power, length, hare = 1, 0, start
+    while not length:
+        # The tortoise waits while the hare runs up to `power` steps ahead
+        tortoise = hare
+        for steps in range(1, power + 1):
+            hare = successor[hare]
+            if hare == tortoise:
+                length = steps
+                break
+            if hare == VOID:
+                return None
+        power *= 2
+
+    # Send two phantoms `length` apart from the beginning; they meet at the loop's door
+    tortoise = hare = start
+    for _ in range(length):
+        hare = successor[hare]
+    tail = 0
+    while tortoise != hare:
+        tortoise = successor[tortoise]
+        hare = successor[hare]
+        tail += 1
+    return Glitch(tortoise, length, tail)
+
+
+def map_timelines(successor: Sequence[int]) -> TimelineAtlas:
+    """
+    The Ouroboros Atlas.
+    Classifies every index of a functional graph at once: which loop it ends in
+    and how far away that loop is. Each index is walked exactly once; the
+    walk's trail is then stamped in bulk from its far end.
+    Kinetic Complexity: O(n) Time | O(n) Space in flat arrays.
+    """
+    n = len(successor)
+    UNMAPPED = -2
+    loop = array('l', [UNMAPPED]) * n
+    tail = array('l', [0]) * n
+    # Which walk last stepped on each index, to spot a walk biting its own tail
+    walked_by = array('l', [-1]) * n
+    lengths: List[int] = []
+    anchors: List[int] = []
+
+    for origin in range(n):
+        if loop[origin] != UNMAPPED:
+            continue
+        trail = []
+        u = origin
+        while u != VOID and loop[u] == UNMAPPED and walked_by[u] != origin:
+            walked_by[u] = origin
+            trail.append(u)
+            u = successor[u]
+
+        if u == VOID:
+            destination, distance = VOID, 0
+        elif loop[u] == UNMAPPED:
+            # The walk met itself: everything from u onward is a fresh loop
+            door = trail.index(u)
+            loop_id = len(lengths)
+            for member in trail[door:]:
+                loop[member] = loop_id
+            lengths.append(len(trail) - door)
+            anchors.append(u)
+            del trail[door:]
+            destination, distance = loop_id, 0
+        else:
+            destination, distance = loop[u], tail[u]
+
+        for step, member in enumerate(reversed(trail), start=distance + 1):
+            loop[member] = destination
+            tail[member] = step
+    return TimelineAtlas(loop, tail, lengths, anchors)
+
+
 # --- THE OUROBOROS CONSOLE ---
 if __name__ == "__main__":
+    # python cycle.py          the six-measure demo
+    # python cycle.py bench    also chase a million-index timeline and map its atlas
+    import sys
+
     print("[LOKI] Initializing Temporal Construct...")
     n1 = Node("Measure 1")
     n2 = Node("Measure 2")
@@ -65,3 +188,36 @@ if __name__ == "__main__":
         print(f"[LOKI] PARADOX DETECTED! The timeline repeats infinitely at: {fracture.val}")
     else:
         print("[LOKI] Timeline is stable.")
+    if len(sys.argv) < 2 or sys.argv[1] != "bench":
+        sys.exit(0)
+
+    # --- THE OUROBOROS BENCH ---
+    import random
+    import time
+
+    rng = random.Random(42)
+    size = 1_000_000
+    successor = array('l', (rng.randrange(size) for _ in range(size)))
+    print("\n=== OUROBOROS ARRAY BENCH ===")
+    t0 = time.perf_counter()
+    glitches = [brent_glitch(successor, rng.randrange(size)) for _ in range(100)]
+    print(f"Brent from 100 random starts: {1000 * (time.perf_counter() - t0) / 100:.2f} ms each "
+          f"(loop length {glitches[0].length}, tail {glitches[0].tail})")
+    t0 = time.perf_counter()
+    atlas = map_timelines(successor)
+    print(f"Atlas of {size} indices: {len(atlas.lengths)} loops, longest tail {max(atlas.tail)} in {time.perf_counter() - t0:.2f}s")
+
+    # The same chase over linked Node objects, for scale
+    chain = [Node(str(i)) for i in range(200_000)]
+    for i in range(len(chain) - 1):
+        chain[i].next = chain[i + 1]
+    chain[-1].next = chain[len(chain) // 2]
+    flat, _ = flatten_timeline(chain[0])
+    t0 = time.perf_counter()
+    find_temporal_glitch(chain[0])
+    floyd_time = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    brent_glitch(flat)
+    brent_time = time.perf_counter() - t0
+    print(f"200k-measure chain: Floyd over Nodes {1000 * floyd_time:.1f} ms | Brent over array {1000 * brent_time:.1f} ms")
+    print("=============================")
@@ -0,0 +1,120 @@
+import concurrent.futures
+import mmap
+import os
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from kmp_memory import StreamingMatcher
+
+# Window fed to the KMP path per step; bounds resident memory on huge archives
+SCAN_WINDOW = 1 << 20
+# Motifs at least this long take the mmap.find fast path under method="auto"; shorter ones stream through KMP
+FIND_FAST_PATH_MIN = 16
+
+
+def _as_bytes(pattern: Union[str, bytes]) -> bytes:
+    return pattern.encode("utf-8") if isinstance(pattern, str) else bytes(pattern)
+
+
+def _open_glass(path: str) -> Optional[mmap.mmap]:
+    """Memory-map `path` read-only. Empty files cannot be mapped; they have no echoes."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _find_offsets(mm: mmap.mmap, motif: bytes) -> Iterator[int]:
+    # C-level two-way search straight over the mapped pages
+    pos = mm.find(motif)
+    while pos != -1:
+        yield pos
+        pos = mm.find(motif, pos + 1)
+
+
+def _kmp_offsets(mm: mmap.mmap, motif: bytes) -> Iterator[int]:
+    # Linear worst case, one window of the file in memory at a time
+    matcher = StreamingMatcher(motif)
+    for start in range(0, len(mm), SCAN_WINDOW):
+        yield from matcher.feed(mm[start:start + SCAN_WINDOW])
+
+
+def _resolve_method(method: str, motif: bytes) -> str:
+    if method not in ("auto", "find", "kmp"):
+        raise ValueError(f"Unknown scan method: {method}")
+    if method == "auto":
+        return "find" if len(motif) >= FIND_FAST_PATH_MIN else "kmp"
+    return method
+
+
+def _scan(path: str, motif: bytes, method: str, context: Optional[int]) -> Iterator[Tuple[int, Optional[bytes]]]:
+    method = _resolve_method(method, motif)
+    if not motif:
+        return
+    mm = _open_glass(path)
+    if mm is None:
+        return
+    with mm:
+        offsets = _kmp_offsets(mm, motif) if method == "kmp" else _find_offsets(mm, motif)
+        for offset in offsets:
+            excerpt = None if context is None else mm[max(0, offset - context):offset + len(motif) + context]
+            yield offset, excerpt
+
+
+def scan_file(path: str, pattern: Union[str, bytes], method: str = "auto") -> Iterator[int]:
+    """
+    Deep Memory Extraction over an on-disk archive.
+    Lazily yields the byte offset of every (overlapping) occurrence of `pattern`.
+    The file is memory-mapped, so archives larger than RAM are paged in on demand.
+
+    method: "find" uses mmap.find, "kmp" streams the map through StreamingMatcher,
+    "auto" picks "find" for motifs of FIND_FAST_PATH_MIN bytes or more and "kmp" below that.
+    """
+    for offset, _ in _scan(path, _as_bytes(pattern), method, context=None):
+        yield offset
+
+
+def scan_file_excerpts(path: str, pattern: Union[str, bytes], context: int = 40, method: str = "auto") -> Iterator[Tuple[int, bytes]]:
+    """Like `scan_file`, but yields (offset, excerpt) with `context` bytes on each side."""
+    yield from _scan(path, _as_bytes(pattern), method, context=context)
+
+
+def _scan_to_list(path: str, pattern: bytes, method: str) -> List[int]:
+    return list(scan_file(path, pattern, method=method))
+
+
+def scan_files(paths: Iterable[str], pattern: Union[str, bytes], workers: Optional[int] = None, method: str = "auto") -> Iterator[Tuple[str, List[int]]]:
+    """
+    Search several archives in parallel on a process pool.
+    Yields (path, offsets) as each file finishes.
+    """
+    motif = _as_bytes(pattern)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_scan_to_list, path, motif, method): path for path in paths}
+        for future in concurrent.futures.as_completed(futures):
+            yield futures[future], future.result()
+
+
+# --- THE DEEP ARCHIVE CONSOLE ---
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 3:
+        print("Usage: python deep_memory.py <pattern> <file> [file ...]")
+        sys.exit(1)
+
+    motif, archives = sys.argv[1], sys.argv[2:]
+    print("=== SHELA DEEP MEMORY SCANNER ===")
+    t0 = time.perf_counter()
+    if len(archives) == 1:
+        hits = 0
+        for offset, excerpt in scan_file_excerpts(archives[0], motif, context=20):
+            hits += 1
+            if hits <= 10:
+                print(f"  @{offset}: {excerpt!r}")
+        print(f"-> {hits} echoes in {archives[0]}")
+    else:
+        for path, offsets in scan_files(archives, motif):
+            print(f"-> {len(offsets)} echoes in {path}")
+    print(f"Scan time: {time.perf_counter() - t0:.3f}s")
+    print("=================================")
@@ -9,29 +9,22 @@ import re
 import json
 import base64
 import argparse
+import atexit
 import concurrent.futures
-import shutil
 import unicodedata
+from collections import deque
+
+from kmp_memory import StreamingMatcher
+from trigram_index import TrigramIndex
+from render_scheduler import STDOUT_LOCK, StatusLine, TerminalGeometry
+from state_stream import serve_in_thread
+from carbon_bus import join_bus
 
 try:
     from rich.console import Console
-    from rich.markdown import Markdown, CodeBlock
-    from rich.syntax import Syntax
-    from rich.panel import Panel
-    from rich.live import Live
-    from rich.text import Text
-    from rich.json import JSON
-    import io
-
-    class MyCodeBlock(CodeBlock):
-        def __rich_console__(self, console, options):
-            code = str(self.text).rstrip()
-            lexer = self.lexer_name or "text"
-            syntax = Syntax(code, lexer, line_numbers=True, word_wrap=True, theme="monokai")
-            yield syntax
-
-    Markdown.elements["code_block"] = MyCodeBlock
-    Markdown.elements["fence"] = MyCodeBlock
+
+    # Cached lexers, reused block renders and folding of huge code blocks live there
+    from rich_render import RenderPipeline
     HAS_RICH = True
 except ImportError:
     HAS_RICH = False
@@ -39,42 +32,31 @@ except ImportError:
 class ResponseFormatter:
     def __init__(self, console):
         self.console = console
+        self.pipeline = RenderPipeline(console) if HAS_RICH else None
+
+    def _split(self, text):
+        summary = ""
+        summary_match = re.search(rf"{DELIMITER_SUMMARY}(.*?){DELIMITER_END_SUMMARY}", text, re.DOTALL)
+        if summary_match:
+            summary = summary_match.group(1).strip()
+        return strip_delimiters(text), summary
+
+    def prepare(self, text, label, color_code):
+        """Start rendering on the worker thread; hand the future to format() later."""
+        if not HAS_RICH:
+            return None
+        display_text, summary = self._split(text)
+        return self.pipeline.submit(display_text, label, color_code, summary)
 
-    def format(self, text, label, color_code):
+    def format(self, text, label, color_code, prepared=None):
         if not HAS_RICH:
             # Fallback for no rich
             sys.stdout.write(f"\x1b[{color_code}m{text}\x1b[0m\n")
             return
 
-        summary = ""
-        summary_match = re.search(rf"{DELIMITER_SUMMARY}(.*?){DELIMITER_END_SUMMARY}", text, re.DOTALL)
-        if summary_match:
-            summary = summary_match.group(1).strip()
-        
-        display_text = strip_delimiters(text)
-        
-        content = None
-        # Try to parse as JSON for specialized formatting
-        try:
-            # Only try parsing if it looks like JSON (starts with { or [)
-            stripped_display = display_text.strip()
-            if stripped_display.startswith('{') or stripped_display.startswith('['):
-                json.loads(stripped_display)
-                content = JSON(stripped_display)
-        except:
-            pass
-
-        if content is None:
-            content = Markdown(display_text)
-
-        panel = Panel(
-            content,
-            title=f"[bold]{label}[/bold]",
-            subtitle=f"[dim]{summary}[/dim]" if summary else None,
-            border_style=f"color({color_code.split(';')[-1]})" if ";" in color_code else "blue",
-            padding=(1, 2)
-        )
-        self.console.print(panel)
+        rendered = (prepared or self.prepare(text, label, color_code)).result()
+        sys.stdout.write(rendered)
+        sys.stdout.flush()
 
 try:
     from bidi.algorithm import get_display
@@ -112,6 +94,10 @@ DELIMITER_SPAWN_START = "<<<SPAWN>>>"
 DELIMITER_SPAWN_END = "<<<END_SPAWN>>>"
 DELIMITER_SUMMARY = "<<<SUMMARY>>>"
 DELIMITER_END_SUMMARY = "<<<END_SUMMARY>>>"
+DELIMITER_SEARCH_START = "<<<SEARCH>>>"
+DELIMITER_SEARCH_END = "<<<END_SEARCH>>>"
+DELIMITER_SEARCH_RESULTS = "<<<SEARCH_RESULTS>>>"
+EXE_DONE_MARKER = "EXE_DONE("
 
 # Persona file paths
 PERSONA_DIR = os.path.join(os.path.expanduser('~'), '.local', 'share', 'shela', 'personas')
@@ -172,6 +158,8 @@ class TipsManager:
         finally:
             with self._lock: self._fetching = False
 
+STATUS_BACKLOG = 32
+
 class DuoUI:
     def __init__(self, tips_manager):
         self.spinner = itertools.cycle(['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏'])
@@ -182,11 +170,17 @@ class DuoUI:
         self.tips_manager = tips_manager
         self._tick_count = 0
         self._current_tip = "Initializing Knowledge Stream..."
-        self.status_queue = []
+        # Bounded: a burst of agent chatter drops the stalest statuses, not the newest
+        self.status_queue = deque(maxlen=STATUS_BACKLOG)
+        self.geometry = TerminalGeometry()
+        self.geometry.install()
+        self.status_line = StatusLine(sys.stdout, self.geometry, STDOUT_LOCK)
 
     def update_status(self, message):
         with self._lock:
-            self.status_queue.append(message)
+            # Coalesce repeats; the line only needs the latest distinct thought
+            if (self.status_queue[-1] if self.status_queue else self._current_tip) != message:
+                self.status_queue.append(message)
 
     def _spin(self):
         while not self.stop_spinner.is_set():
@@ -194,20 +188,16 @@ class DuoUI:
             if self._tick_count % 10 == 0: # Check every second
                 with self._lock:
                     if self.status_queue:
-                        self._current_tip = self.status_queue.pop(0)
+                        self._current_tip = self.status_queue.popleft()
                     elif self._tick_count % 100 == 0: # Every 10s fallback to random tips
                         new_tip = self.tips_manager.get_tip()
                         if new_tip:
                             self._current_tip = new_tip
             
-            cols = shutil.get_terminal_size((80, 20)).columns
-            max_len = max(10, cols - 10)
-            display_text = self._current_tip[:max_len]
-            sys.stdout.write(f"\r\x1b[2K\x1b[1;34m{next(self.spinner)} {display_text}\x1b[0m")
-            sys.stdout.flush()
-            time.sleep(0.1)
+            self.status_line.draw(next(self.spinner), self._current_tip)
+            self.stop_spinner.wait(0.1)
             self._tick_count += 1
-        sys.stdout.write("\r\x1b[2K\r"); sys.stdout.flush()
+        self.status_line.clear()
 
     def start(self, label):
         with self._lock:
@@ -228,6 +218,7 @@ class DuoUI:
                         self._spinner_thread = None
 
 ui_spinner = None
+workspace_index = None
 rich_console = Console(force_terminal=True) if HAS_RICH else None
 response_formatter = ResponseFormatter(rich_console) if HAS_RICH else None
 
@@ -259,6 +250,7 @@ def strip_delimiters(text):
         rf"{DELIMITER_SUMMARY}.*?{DELIMITER_END_SUMMARY}",
         rf"{DELIMITER_COMMAND_START}.*?{DELIMITER_COMMAND_END}",
         rf"{DELIMITER_SPAWN_START}.*?{DELIMITER_SPAWN_END}",
+        rf"{DELIMITER_SEARCH_START}.*?{DELIMITER_SEARCH_END}",
         rf"{DELIMITER_THOUGHT}.*?{DELIMITER_END_SUMMARY}", # Some agents might mix up end tags
         rf"{DELIMITER_THOUGHT}.*?<<<END_THOUGHT>>>",
         r"<<<THOUGHT>>>.*?<<<END_THOUGHT>>>",
@@ -304,16 +296,21 @@ def _execute_curl(cmd, data, ui, stream=True, color_code="0", label="unknown", m
             return f"Error: No candidates. Response: {stdout}"
             
         text = res["candidates"][0]["content"]["parts"][0]["text"]
+        if text:
+            text = unicodedata.normalize('NFC', text)
+        # The panel renders on the worker while this thread does the usage bookkeeping
+        prepared = response_formatter.prepare(text, label, color_code) if text and stream and HAS_RICH else None
         usage = res.get("usageMetadata", {})
         usage_str = f"In {usage.get('promptTokenCount')} | Out {usage.get('candidatesTokenCount')} | Total {usage.get('totalTokenCount')}"
         write_usage(label, "Idle", usage_str, model)
         
         if text:
-            text = unicodedata.normalize('NFC', text)
-            
             if stream:
                 if HAS_RICH:
-                    response_formatter.format(text, label, color_code)
+                    # Wait for the render outside the terminal lock, so the lock is held only for the write
+                    prepared.result()
+                    with ui.status_line.hold() if ui else STDOUT_LOCK:
+                        response_formatter.format(text, label, color_code, prepared)
                 else:
                     # Fallback to simple streaming
                     display_text = strip_delimiters(text)
@@ -322,12 +319,13 @@ def _execute_curl(cmd, data, ui, stream=True, color_code="0", label="unknown", m
                         display_text = '\n'.join([get_display(line) for line in lines])
                     except Exception: pass
                     
-                    sys.stdout.write(f"\x1b[{color_code}m")
-                    for char in display_text: 
-                        sys.stdout.write(char)
-                        sys.stdout.flush()
-                        time.sleep(0.001)
-                    sys.stdout.write("\x1b[0m\n")
+                    with ui.status_line.hold() if ui else STDOUT_LOCK:
+                        sys.stdout.write(f"\x1b[{color_code}m")
+                        for char in display_text: 
+                            sys.stdout.write(char)
+                            sys.stdout.flush()
+                            time.sleep(0.001)
+                        sys.stdout.write("\x1b[0m\n")
             return text
         return "Error: No content"
     except Exception as e: 
@@ -355,10 +353,12 @@ def execute_agent_commands(text, label, state_path):
         # Encode to avoid line-splitting and special char issues in the trigger
         b64_cmd = base64.b64encode(full_script.encode()).decode()
         
-        sys.stdout.write(f"\n\x1b[1;36m[System] Spawning grouped child process for {label}...\x1b[0m\n")
-        # Packetized Transmission: Robust against line wrapping and fragmentation
-        sys.stdout.write(f"<<<SHELA_SPAWN_B64>>>\n{b64_cmd}\n<<<END_SHELA_SPAWN>>>\n")
-        sys.stdout.flush()
+        # Other students may still be reflecting under the spinner
+        with ui_spinner.status_line.hold() if ui_spinner else STDOUT_LOCK:
+            sys.stdout.write(f"\n\x1b[1;36m[System] Spawning grouped child process for {label}...\x1b[0m\n")
+            # Packetized Transmission: Robust against line wrapping and fragmentation
+            sys.stdout.write(f"<<<SHELA_SPAWN_B64>>>\n{b64_cmd}\n<<<END_SHELA_SPAWN>>>\n")
+            sys.stdout.flush()
         spawned = True
         
         with open(state_path, "a") as f:
@@ -366,19 +366,86 @@ def execute_agent_commands(text, label, state_path):
     
     return spawned, start_pos
 
+def answer_agent_searches(text, label, state_path):
+    # Code search runs in-process against the trigram index: no child shell, no tailing
+    global workspace_index
+    queries = [q.strip() for q in re.findall(rf"{DELIMITER_SEARCH_START}(.*?){DELIMITER_SEARCH_END}", text, re.DOTALL) if q.strip()]
+    if not queries:
+        return False
+    if workspace_index is None:
+        workspace_index = TrigramIndex(os.getcwd())
+    workspace_index.refresh()
+
+    report = []
+    for query in queries:
+        hits = workspace_index.search(query, limit=50)
+        report.append(f"SEARCH {query!r}: {len(hits)} hit(s)")
+        report.extend(f"{hit.path}:{hit.line_no}: {hit.line.strip()}" for hit in hits)
+    with open(state_path, "a") as f:
+        f.write(f"\n{DELIMITER_SEARCH_RESULTS}[{get_timestamp()}][from:{label}]\n" + "\n".join(report) + "\n")
+    return True
+
+REMOTE_CARBON = re.compile(rb"<<<CARBON\[(.*?)\]>>>(?:\[.*?\])?\n(.*?)\n", re.DOTALL)
+
+def take_remote_prompts(bus, claimed):
+    """Announce remote HULTs and turns; every remote CARBON prompt waiting becomes one input."""
+    prompts = []
+    for event in bus.drain():
+        who = event.get("carbon_id") or event.get("member")
+        if event.get("kind") == "carbon":
+            # Already taken from the state file by the backstop scan
+            offset = event.get("offset")
+            if offset is not None:
+                if offset in claimed:
+                    continue
+                claimed.add(offset)
+            print(f"\n\x1b[1;36m[Remote Prompt from {who}]:\x1b[0m\n{event.get('prompt', '')}")
+            prompts.append(event.get("prompt", ""))
+        elif event.get("kind") == "hult":
+            print(f"\n\x1b[1;33m[Remote HULT from {who}: {event.get('label', '')}]\x1b[0m")
+        elif event.get("kind") == "turn":
+            print(f"\n\x1b[2m[{who} finished a turn]\x1b[0m")
+    return "\n".join(prompts) or None
+
+def scan_state_tail(state_path, seen, carbon_id, claimed):
+    """
+    The backstop for writers outside the bus (an older duo, a synced copy, another tool):
+    a stat, and a read of only the bytes appended since `seen`. Returns (remote prompt or None, new seen).
+    """
+    size = os.path.getsize(state_path)
+    if size <= seen:
+        return None, size
+    with open(state_path, "rb") as f:
+        f.seek(seen)
+        tail = f.read(size - seen)
+    for match in REMOTE_CARBON.finditer(tail):
+        remote_user = match.group(1).decode("utf-8", "replace")
+        if remote_user == carbon_id or seen + match.start() in claimed:
+            continue
+        claimed.add(seen + match.start())
+        remote_msg = match.group(2).decode("utf-8", "replace")
+        print(f"\n\x1b[1;36m[Remote Prompt from {remote_user}]:\x1b[0m\n{remote_msg}")
+        return remote_msg, size
+    return None, size
+
 def wait_for_child_processes(state_path, last_pos=None):
     global ui_spinner
     if ui_spinner:
         ui_spinner.update_status("Waiting for child process completion...")
         ui_spinner.start("Execution")
-    print(f"\n\x1b[1;33m[System] Waiting for child process completion (EXE_DONE)...\x1b[0m")
+    # The spinner owns the bottom line now; a bare print would strand its status text
+    with ui_spinner.status_line.hold() if ui_spinner else STDOUT_LOCK:
+        print(f"\n\x1b[1;33m[System] Waiting for child process completion (EXE_DONE)...\x1b[0m")
     
     if last_pos is None:
         with open(state_path, "r") as f:
             f.seek(0, os.SEEK_END)
             last_pos = f.tell()
     
-    search_buffer = ""
+    # Resumable KMP: "EXE_DONE(" split across two reads is still heard once
+    done_matcher = StreamingMatcher(EXE_DONE_MARKER)
+    # Text following the latest marker whose "<pid>)" has not fully arrived yet
+    pending_tail = None
     while True:
         time.sleep(0.5)
         if not os.path.exists(state_path): continue
@@ -387,17 +454,19 @@ def wait_for_child_processes(state_path, last_pos=None):
             new_data = f.read()
             if new_data:
                 # sys.stdout.write(f"[Debug Read {len(new_data)} bytes]\n")
-                search_buffer += new_data
+                chunk_start = done_matcher.position
+                # Candidate tails: the carried-over one, then one per new marker
+                tails = [pending_tail + new_data] if pending_tail is not None else []
+                for hit in done_matcher.feed(new_data):
+                    tails.append(new_data[hit + len(EXE_DONE_MARKER) - chunk_start:])
                 # Look for the actual output with expanded PID: EXE_DONE(1234)
-                if re.search(r"EXE_DONE\(\d+\)", search_buffer):
+                if any(re.match(r"\d+\)", tail) for tail in tails):
                     if ui_spinner: ui_spinner.stop()
                     print(f"\x1b[1;32m[System] Execution confirmed.\x1b[0m")
                     return True
-                
-                # Keep context for potentially split matches
-                if len(search_buffer) > 2000:
-                    search_buffer = search_buffer[-500:]
-                last_pos += len(new_data)
+                # Only a marker still waiting for the rest of its PID is worth carrying
+                pending_tail = tails[-1] if tails and re.fullmatch(r"\d*", tails[-1]) else None
+                last_pos = f.tell()
 
 def main():
     global ui_spinner
@@ -405,6 +474,7 @@ def main():
     parser.add_argument("--gemini-model", default=None)
     parser.add_argument("--gemini-key")
     parser.add_argument("--carbon-id", default="")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="stream state and telemetry to the web/mobile UIs")
     args = parser.parse_args()
 
     gemini_key = args.gemini_key
@@ -417,6 +487,12 @@ def main():
     state_path = os.path.join(cwd, STATE_FILE)
     if not os.path.exists(state_path):
         with open(state_path, "w") as f: f.write("# Duo Session State\n")
+    if args.serve is not None:
+        try:
+            stream = serve_in_thread(state_path, os.path.join(cwd, TELEMETRY_FILE), port=args.serve)
+            print(f"\x1b[1;36m[Shela Duo] Live score streaming on http://127.0.0.1:{stream.port}/\x1b[0m")
+        except OSError as error:
+            print(f"\x1b[1;31m[Shela Duo] Live score could not start on port {args.serve}: {error}\x1b[0m")
 
     print("\n\x1b[1;33m[Shela Duo] Gemini Multi-Agent Session Active.\x1b[0m")
 
@@ -433,6 +509,7 @@ def main():
         f"SUMMARY: Every response MUST start with `{DELIMITER_SUMMARY} short one-sentence summary of your turn {DELIMITER_END_SUMMARY}`. This helps the human follow your progress.\n"
         f"THINK BEFORE DOING: Document your strategy in 'plan/current_task.md' before executing significant changes. All plans MUST be indexed in **BRAINSTORM.md**.\n"
         f"PROTOCOL: The state file is your shared command bus. Maintain high awareness of project structure. Delimiters are color-coded: [timestamp][from:Name]. **BRAINSTORM.md** is your master strategy index.\n"
+        f"SEARCH: Any agent may search the workspace code with {DELIMITER_SEARCH_START} literal text {DELIMITER_SEARCH_END}. It is answered in-process (no shell needed) and the hits are appended to the state file under {DELIMITER_SEARCH_RESULTS}.\n"
         f"COMMANDS: ONLY 'EXE' is authorized to execute. EXE can use {DELIMITER_COMMAND_START} or send direct triggers. All execution is recorded in the state file.\n"
         f"KATA: Follow WTLTTILTRLTBR sequence: {kata_steps}\n"
         f"ROLES: MOZART is the CONDUCTOR. Q, BETZALEL, LOKI, and EXE are STUDENTS.\n"
@@ -441,10 +518,15 @@ def main():
         f"INTERVENTION: Use {DELIMITER_HULT} ONLY after 'Run' to wait for human feedback. This stops all student turns immediately."
     )
 
+    # Remote prompts, HULTs and turn ends arrive over the bus; the state file stays the record
+    bus = join_bus(state_path, args.carbon_id or f"carbon-{os.getpid()}")
+    if bus is not None:
+        atexit.register(bus.close)
+    # State-file offsets of CARBON prompts already taken, whichever path delivered them first
+    claimed = set()
+
     is_first_turn = True
-    last_state_content = ""
-    if os.path.exists(state_path):
-        with open(state_path, "r") as f: last_state_content = f.read()
+    seen_state_size = os.path.getsize(state_path)
 
     while True:
         with open(state_path, "r") as f: state = f.read()
@@ -457,25 +539,25 @@ def main():
             sys.stdout.flush()
             
             while True:
-                with open(state_path, "r") as f: current_content = f.read()
-                if len(current_content) > len(last_state_content):
-                    new_stuff = current_content[len(last_state_content):]
-                    match = re.search(r"<<<CARBON\[(.*?)\]>>>(?:\[.*?\])?\n(.*?)\n", new_stuff, re.DOTALL)
-                    if match and match.group(1) != args.carbon_id:
-                        remote_user = match.group(1)
-                        remote_msg = match.group(2)
-                        print(f"\n\x1b[1;36m[Remote Prompt from {remote_user}]:\x1b[0m\n{remote_msg}")
-                        user_input = remote_msg
-                        last_state_content = current_content
+                if bus is not None:
+                    user_input = take_remote_prompts(bus, claimed)
+                    if user_input:
                         break
+                user_input, seen_state_size = scan_state_tail(state_path, seen_state_size, args.carbon_id, claimed)
+                if user_input:
+                    break
                 
-                r, _, _ = select.select([sys.stdin], [], [], 0.5)
-                if r:
+                r, _, _ = select.select([sys.stdin] + ([bus] if bus else []), [], [], 0.5)
+                if sys.stdin in r:
                     user_input = sys.stdin.readline().strip()
                     if user_input:
                         with open(state_path, "a") as f:
+                            # The delimiter's offset lets peers tell the bus copy from the file copy
+                            offset = f.tell() + 1
                             f.write(f"\n{my_delim}[{get_timestamp()}]\n{user_input}\n")
-                        last_state_content = open(state_path, "r").read()
+                        if bus is not None:
+                            bus.publish("carbon", carbon_id=args.carbon_id, prompt=user_input, offset=offset)
+                        seen_state_size = os.path.getsize(state_path)
                         break
                     sys.stdout.write(f"\r\n\x1b[1;32m👤 {my_delim}: \x1b[0m")
                     sys.stdout.flush()
@@ -498,6 +580,7 @@ def main():
             mozart_out = mozart_out.replace(DELIMITER_HULT, f"{DELIMITER_HULT}[{get_timestamp()}][?] ")
 
         with open(state_path, "a") as f: f.write(f"\n{DELIMITER_MOZART}[{get_timestamp()}][from:🎼 Mozart]{'[?]' if has_q else ''}\n{mozart_out}\n")
+        answer_agent_searches(mozart_out, "🎼 Mozart", state_path)
         spawn_detected, start_pos = execute_agent_commands(mozart_out, "🎼 Mozart", state_path)
 
         if spawn_detected:
@@ -509,8 +592,10 @@ def main():
 
         if hult_detected:
             print(f"\n{colorize_delimiter(DELIMITER_HULT, 'System', '33', has_q=True)}")
+            if bus is not None:
+                bus.publish("hult", carbon_id=args.carbon_id, label="🎼 Mozart")
             is_first_turn = True
-            with open(state_path, "r") as f: last_state_content = f.read()
+            seen_state_size = os.path.getsize(state_path)
             continue
 
         # Parallel Student turns
@@ -538,8 +623,10 @@ def main():
                     s_hult = True
                     out = out.replace(DELIMITER_HULT, f"{DELIMITER_HULT}[{get_timestamp()}][?] ")
                 
-                print(f"\n{colorize_delimiter(delim, label, color, has_q=s_hult)}\n{out}")
+                with ui_spinner.status_line.hold() if ui_spinner else STDOUT_LOCK:
+                    print(f"\n{colorize_delimiter(delim, label, color, has_q=s_hult)}\n{out}")
                 with open(state_path, "a") as f: f.write(f"\n{delim}[{get_timestamp()}][from:{label}]{'[?]' if s_hult else ''}\n{out}\n")
+                answer_agent_searches(out, label, state_path)
                 s_spawned, s_pos = execute_agent_commands(out, label, state_path)
                 if s_spawned:
                     spawn_detected = True
@@ -553,8 +640,12 @@ def main():
 
         if hult_detected:
             is_first_turn = True
+        if bus is not None:
+            if hult_detected:
+                bus.publish("hult", carbon_id=args.carbon_id, label="students")
+            bus.publish("turn", carbon_id=args.carbon_id, offset=os.path.getsize(state_path))
 
-        with open(state_path, "r") as f: last_state_content = f.read()
+        seen_state_size = os.path.getsize(state_path)
         time.sleep(0.1)
 
 if __name__ == "__main__": main()
@@ -1,4 +1,5 @@
-from typing import List
+from collections import deque
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
 
 def compute_lps_array(pattern: str) -> List[int]:
     """
@@ -55,6 +56,112 @@ def kmp_search(text: str, pattern: str) -> List[int]:
 
     return found_indices
 
+class StreamingMatcher:
+    """
+    The Resumable Echo (streaming KMP).
+    Carries the partial-match state `j` across chunk boundaries, so a motif
+    split between two reads is still heard exactly once.
+    Kinetic Complexity: O(chunk) per feed | O(M) memory for the pattern.
+    """
+    def __init__(self, pattern: Union[str, bytes]):
+        self.pattern = pattern
+        self.lps = compute_lps_array(pattern)
+        self.j = 0         # How much of the motif is already resonating
+        self.position = 0  # Absolute offset of the next symbol to arrive
+
+    def reset(self) -> None:
+        self.j = 0
+        self.position = 0
+
+    def feed(self, chunk: Union[str, bytes]) -> Iterator[int]:
+        """
+        Consume `chunk` and return an iterator over the absolute start offsets
+        of every occurrence completed inside it. The chunk is consumed eagerly,
+        so the state stays correct even if the iterator is discarded.
+        """
+        pattern, lps = self.pattern, self.lps
+        m = len(pattern)
+        found_indices: List[int] = []
+        if m:
+            j = self.j
+            base = self.position - m + 1
+            for i, symbol in enumerate(chunk):
+                while j and pattern[j] != symbol:
+                    j = lps[j - 1]
+                if pattern[j] == symbol:
+                    j += 1
+                if j == m:
+                    found_indices.append(base + i)
+                    j = lps[j - 1]
+            self.j = j
+        self.position += len(chunk)
+        return iter(found_indices)
+
+
+class ChorusAutomaton:
+    """
+    The Chorus (Aho-Corasick Automaton).
+    Hears every motif of a fixed set in one pass over the text.
+    Kinetic Complexity: O(sum of motif lengths) to forge, O(N + hits) per scan.
+    Motifs may be `str` or `bytes`, but a single automaton speaks only one of them.
+    """
+    def __init__(self, patterns: Sequence[Union[str, bytes]]):
+        self.patterns = [p for p in dict.fromkeys(patterns) if p]
+        kinds = {type(p) for p in self.patterns}
+        if len(kinds) > 1:
+            raise TypeError("ChorusAutomaton cannot mix str and bytes motifs.")
+        self.kind = kinds.pop() if kinds else str
+
+        # goto[state] maps a symbol (char or byte value) to the next state
+        self.goto: List[Dict] = [{}]
+        # fail[state] is the longest proper suffix that is also a trie path
+        self.fail: List[int] = [0]
+        # echoes[state] lists the motif indices that end at this state
+        self.echoes: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for symbol in pattern:
+                nxt = self.goto[state].get(symbol)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][symbol] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.echoes.append([])
+                state = nxt
+            self.echoes[state].append(index)
+
+        # Breadth-first weaving of the failure links (the KMP LPS, generalised)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for symbol, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and symbol not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(symbol, 0)
+                # Inherit the shorter motifs that end inside this one
+                self.echoes[nxt] = self.echoes[nxt] + self.echoes[self.fail[nxt]]
+
+    def finditer(self, text: Union[str, bytes]) -> Iterator[Tuple[int, Union[str, bytes]]]:
+        """Yield (offset, motif) for every occurrence, ordered by where each motif ends."""
+        if self.patterns and not isinstance(text, self.kind):
+            raise TypeError(f"ChorusAutomaton was forged for {self.kind.__name__}, got {type(text).__name__}.")
+        goto, fail, echoes, patterns = self.goto, self.fail, self.echoes, self.patterns
+        state = 0
+        for i, symbol in enumerate(text):
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+            for index in echoes[state]:
+                motif = patterns[index]
+                yield i - len(motif) + 1, motif
+
+    def search(self, text: Union[str, bytes]) -> List[Tuple[int, Union[str, bytes]]]:
+        return list(self.finditer(text))
+
 if __name__ == "__main__":
     memory_bank = (
         "SYSTEM GLITCH DETECTED. "
@@ -81,4 +188,7 @@ if __name__ == "__main__":
             print(f"   Excerpt: '...{memory_bank[max(0, idx-10):idx+len(search_motif)+10]}...'")
     else:
         print("-> Motif not found in active memory.")
+
+    chorus = ChorusAutomaton(["AWAKEN", "SHELA", "CHORD", "ORACLE"])
+    print(f"Chorus scan (all motifs, one pass): {chorus.search(memory_bank)}")
     print("======================================")
@@ -1,5 +1,6 @@
 import bisect
-from typing import List, Tuple
+from array import array
+from typing import Iterable, List, Tuple
 
 def quantum_crescendo_lis(P: List[int]) -> Tuple[int, List[int]]:
     if not P:
@@ -39,6 +40,59 @@ def quantum_crescendo_lis(P: List[int]) -> Tuple[int, List[int]]:
     # Invert the narrative! Reverse the timeline to reveal the true scale!
     return len(active_tails), sequence[::-1]
 
+class IncrementalLIS:
+    """
+    The Living Crescendo.
+    quantum_crescendo_lis, kept alive between calls: each append costs
+    O(log n) and the state lives in int64 arrays, 32 bytes per note.
+    """
+    def __init__(self, P: Iterable[int] = ()):
+        # Every note heard so far
+        self.values = array('q')
+        # The Séance Tether, one slot per note (-1: nobody whispered)
+        self.parent = array('q')
+        # The phantoms of the lowest acoustic thresholds, and where they stand
+        self.active_tails = array('q')
+        self.active_tails_indices = array('q')
+        self.extend(P)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def length(self) -> int:
+        return len(self.active_tails)
+
+    def append(self, pitch: int) -> int:
+        """Hear one more note. Returns the current crescendo length."""
+        i = len(self.values)
+        self.values.append(pitch)
+        insertion_point = bisect.bisect_left(self.active_tails, pitch)
+        if insertion_point == len(self.active_tails):
+            self.active_tails.append(pitch)
+            self.active_tails_indices.append(i)
+        else:
+            self.active_tails[insertion_point] = pitch
+            self.active_tails_indices[insertion_point] = i
+        self.parent.append(self.active_tails_indices[insertion_point - 1] if insertion_point > 0 else -1)
+        return len(self.active_tails)
+
+    def extend(self, P: Iterable[int]) -> int:
+        for pitch in P:
+            self.append(pitch)
+        return len(self.active_tails)
+
+    def sequence(self) -> List[int]:
+        """Resurrect the current melody on demand. O(length)."""
+        if not self.active_tails_indices:
+            return []
+        curr = self.active_tails_indices[-1]
+        sequence = []
+        while curr != -1:
+            sequence.append(self.values[curr])
+            curr = self.parent[curr]
+        return sequence[::-1]
+
 # --- THE GRAND C̷R̷E̷S̷C̷E̷N̷D̷O̷ ---
 if __name__ == "__main__":
     chaotic_motif = [10, 22, 9, 33, 21, 50, 41, 60, 80]
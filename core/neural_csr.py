@@ -0,0 +1,195 @@
+import heapq
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+INF = float('inf')
+
+
+class SynapticGraph:
+    """
+    The Compressed Synapse (CSR graph).
+    Node ids are 0..n-1; the edges of node u live in targets/weights[offsets[u]:offsets[u + 1]].
+    Distance and predecessor buffers are allocated once and only the entries a
+    query touched are reset, so repeated queries cost O(explored), not O(V).
+    """
+    def __init__(self, offsets: Sequence[int], targets: Sequence[int], weights: Sequence[float], labels: Optional[List[Hashable]] = None):
+        # array('q')/array('d') by default; NumPy arrays work just as well
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.node_count = len(offsets) - 1
+        self.labels = labels if labels is not None else list(range(self.node_count))
+        self.index: Dict[Hashable, int] = {label: i for i, label in enumerate(self.labels)}
+        # Preallocated query buffers, shared across calls
+        self._cost = array('d', [INF]) * self.node_count
+        self._pred = array('q', [-1]) * self.node_count
+        self._touched: List[int] = []
+        # Nodes popped from the heap by the last query (instrumentation)
+        self.settled = 0
+
+    @classmethod
+    def from_edges(cls, node_count: int, edges: Iterable[Tuple[int, int, float]], labels: Optional[List[Hashable]] = None) -> 'SynapticGraph':
+        buckets: List[List[Tuple[int, float]]] = [[] for _ in range(node_count)]
+        for u, v, w in edges:
+            buckets[u].append((v, w))
+        offsets, targets, weights = array('q', [0]), array('q'), array('d')
+        for bucket in buckets:
+            for v, w in bucket:
+                targets.append(v)
+                weights.append(w)
+            offsets.append(len(targets))
+        return cls(offsets, targets, weights, labels)
+
+    @classmethod
+    def from_dict(cls, graph: Dict[Hashable, Dict[Hashable, float]]) -> 'SynapticGraph':
+        """Compress a find_optimal_path style dict-of-dicts graph."""
+        labels: List[Hashable] = list(graph)
+        index = {label: i for i, label in enumerate(labels)}
+        for neighbors in graph.values():
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    index[neighbor] = len(labels)
+                    labels.append(neighbor)
+        edges = ((index[u], index[v], w) for u, neighbors in graph.items() for v, w in neighbors.items())
+        return cls.from_edges(len(labels), edges, labels)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def node_id(self, label: Hashable) -> int:
+        return self.index[label]
+
+    def neighbors(self, u: int) -> Iterable[Tuple[int, float]]:
+        lo, hi = self.offsets[u], self.offsets[u + 1]
+        return zip(self.targets[lo:hi], self.weights[lo:hi])
+
+    def _reset(self) -> None:
+        cost, pred = self._cost, self._pred
+        for u in self._touched:
+            cost[u] = INF
+            pred[u] = -1
+        self._touched = []
+
+    def _dijkstra(self, source: int, goals: Optional[set] = None) -> None:
+        """Fill the shared buffers from `source`, stopping once every goal is settled."""
+        self._reset()
+        cost, pred, touched = self._cost, self._pred, self._touched
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        remaining = set(goals) if goals is not None else None
+        cost[source] = 0.0
+        touched.append(source)
+        pq = [(0.0, source)]
+        settled = 0
+        while pq:
+            current_cost, u = heapq.heappop(pq)
+            if current_cost > cost[u]:
+                continue
+            settled += 1
+            if remaining is not None:
+                remaining.discard(u)
+                if not remaining:
+                    break
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                new_cost = current_cost + weights[e]
+                if new_cost < cost[v]:
+                    if cost[v] == INF:
+                        touched.append(v)
+                    cost[v] = new_cost
+                    pred[v] = u
+                    heapq.heappush(pq, (new_cost, v))
+        self.settled = settled
+
+    def _trace(self, target: int) -> List[int]:
+        path = []
+        curr = target
+        while curr != -1:
+            path.append(curr)
+            curr = self._pred[curr]
+        return path[::-1]
+
+    def shortest_path(self, source: int, target: int) -> Tuple[float, List[int]]:
+        """Single pair, early exit at the target. Returns (cost, node ids)."""
+        self._dijkstra(source, {target})
+        if self._cost[target] == INF:
+            return INF, []
+        return self._cost[target], self._trace(target)
+
+    def single_source(self, source: int) -> Tuple[array, array]:
+        """
+        Full shortest-path tree from `source` as (cost, predecessor) arrays.
+        These are copies; the shared buffers are free for the next query.
+        """
+        self._dijkstra(source)
+        return array('d', self._cost), array('q', self._pred)
+
+    def all_targets(self, source: int) -> Dict[int, float]:
+        """Cost to every reachable node, as a sparse {node: cost} map."""
+        self._dijkstra(source)
+        return {u: self._cost[u] for u in self._touched}
+
+    def many_pairs(self, pairs: Iterable[Tuple[int, int]]) -> List[Tuple[float, List[int]]]:
+        """
+        Batch queries. Pairs sharing a source reuse one search that stops once
+        all of that source's targets are settled. Results follow input order.
+        """
+        pairs = list(pairs)
+        by_source: Dict[int, List[int]] = {}
+        for s, t in pairs:
+            by_source.setdefault(s, []).append(t)
+        answers: Dict[Tuple[int, int], Tuple[float, List[int]]] = {}
+        for s, targets in by_source.items():
+            self._dijkstra(s, set(targets))
+            for t in targets:
+                answers[(s, t)] = (self._cost[t], self._trace(t)) if self._cost[t] != INF else (INF, [])
+        return [answers[pair] for pair in pairs]
+
+    def find_optimal_path(self, start: Hashable, target: Hashable) -> Tuple[float, List[Hashable]]:
+        """Label-based drop-in for neural_router.find_optimal_path."""
+        if start not in self.index or target not in self.index:
+            return INF, []
+        cost, path = self.shortest_path(self.index[start], self.index[target])
+        return cost, [self.labels[u] for u in path]
+
+
+# --- THE SYNAPSE BENCH ---
+if __name__ == "__main__":
+    import random
+    import time
+
+    from neural_router import find_optimal_path
+
+    rng = random.Random(1)
+    n = 20000
+    brain = {f"N{i}": {} for i in range(n)}
+    for i in range(n):
+        for _ in range(4):
+            brain[f"N{i}"][f"N{rng.randrange(n)}"] = rng.randint(1, 20)
+    # 20 sources x 10 targets: the shape of a routing table refresh
+    sources = [f"N{rng.randrange(n)}" for _ in range(20)]
+    queries = [(s, f"N{rng.randrange(n)}") for s in sources for _ in range(10)]
+
+    print("=== SHELA SYNAPTIC CSR BENCH ===")
+    t0 = time.perf_counter()
+    for s, t in queries:
+        find_optimal_path(brain, s, t)
+    dict_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    synapse = SynapticGraph.from_dict(brain)
+    build_time = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for s, t in queries:
+        synapse.find_optimal_path(s, t)
+    csr_time = time.perf_counter() - t0
+    ids = [(synapse.node_id(s), synapse.node_id(t)) for s, t in queries]
+    t0 = time.perf_counter()
+    synapse.many_pairs(ids)
+    batch_time = time.perf_counter() - t0
+
+    print(f"Nodes: {n}, edges: {synapse.edge_count}, CSR build: {build_time:.2f}s")
+    print(f"dict Dijkstra : {1000 * dict_time / len(queries):.2f} ms/query")
+    print(f"CSR Dijkstra  : {1000 * csr_time / len(queries):.2f} ms/query")
+    print(f"CSR many_pairs: {1000 * batch_time / len(queries):.2f} ms/query")
+    print("================================")
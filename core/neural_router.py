@@ -1,11 +1,33 @@
 import heapq
-from typing import Dict, List, Tuple
+import json
+import os
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
 
-def find_optimal_path(graph: Dict[str, Dict[str, int]], start: str, target: str) -> Tuple[float, List[str]]:
+INF = float('inf')
+# heuristic(u, v): a lower bound on the cost of reaching v from u
+Heuristic = Callable[[Hashable, Hashable], float]
+ROUTER_MODES = ("dijkstra", "astar", "bidirectional")
+
+
+def find_optimal_path(graph: Dict[str, Dict[str, int]], start: str, target: str,
+                      mode: str = "dijkstra", heuristic: Optional[Heuristic] = None,
+                      reverse_graph: Optional[Dict[str, Dict[str, int]]] = None,
+                      telemetry: Optional[Dict[str, int]] = None) -> Tuple[float, List[str]]:
     """
     The Neural Router (Dijkstra's Algorithm).
     Kinetic Complexity: O((V + E) log V).
+    mode="astar" steers the search with `heuristic`; mode="bidirectional" meets
+    in the middle (bidirectional A* when a heuristic is given) and reuses
+    `reverse_graph` if the caller has one. Nodes settled land in telemetry["settled"].
     """
+    if mode == "astar":
+        return _astar(graph, start, target, heuristic or _silence, telemetry)
+    if mode == "bidirectional":
+        return _bidirectional(graph, reverse_graph if reverse_graph is not None else invert_graph(graph),
+                              start, target, heuristic, telemetry)
+    if mode != "dijkstra":
+        raise ValueError(f"Unknown routing mode {mode!r}; expected one of {ROUTER_MODES}")
+
     if start not in graph:
         return float('inf'), []
 
@@ -18,6 +40,7 @@ def find_optimal_path(graph: Dict[str, Dict[str, int]], start: str, target: str)
     
     # The Anvil: Min-Heap Priority Queue storing (cumulative_cost, current_node)
     pq = [(0, start)]
+    settled = 0
     
     while pq:
         current_cost, current_node = heapq.heappop(pq)
@@ -25,6 +48,7 @@ def find_optimal_path(graph: Dict[str, Dict[str, int]], start: str, target: str)
         # If we pulled a stale, heavier path from the queue, discard it.
         if current_cost > cognitive_cost[current_node]:
             continue
+        settled += 1
             
         # The target thought has been resolved!
         if current_node == target:
@@ -39,6 +63,8 @@ def find_optimal_path(graph: Dict[str, Dict[str, int]], start: str, target: str)
                 cognitive_cost[neighbor] = new_cost
                 predecessor[neighbor] = current_node
                 heapq.heappush(pq, (new_cost, neighbor))
+    if telemetry is not None:
+        telemetry["settled"] = settled
                 
     # Reconstruct the chronological path
     if cognitive_cost.get(target, float('inf')) == float('inf'):
@@ -53,6 +79,451 @@ def find_optimal_path(graph: Dict[str, Dict[str, int]], start: str, target: str)
     # The timeline was traced backward; reverse to restore causality
     return cognitive_cost[target], path[::-1]
 
+
+def _silence(u: Hashable, v: Hashable) -> float:
+    # The zero heuristic: A* collapses back into Dijkstra
+    return 0.0
+
+
+def invert_graph(graph: Dict[Hashable, Dict[Hashable, float]]) -> Dict[Hashable, Dict[Hashable, float]]:
+    """Every synapse reversed, for searches that walk backward from the target."""
+    inverted: Dict[Hashable, Dict[Hashable, float]] = {node: {} for node in graph}
+    for u, neighbors in graph.items():
+        for v, weight in neighbors.items():
+            inverted.setdefault(v, {})[u] = weight
+    return inverted
+
+
+def shortest_path_tree(graph: Dict[Hashable, Dict[Hashable, float]], source: Hashable) -> Tuple[Dict[Hashable, float], Dict[Hashable, Hashable]]:
+    """Full Dijkstra from `source`: (cost, predecessor) for every reachable node."""
+    cost = {source: 0}
+    predecessor: Dict[Hashable, Hashable] = {}
+    pq = [(0, source)]
+    while pq:
+        current_cost, u = heapq.heappop(pq)
+        if current_cost > cost[u]:
+            continue
+        for v, weight in graph.get(u, {}).items():
+            new_cost = current_cost + weight
+            if new_cost < cost.get(v, INF):
+                cost[v] = new_cost
+                predecessor[v] = u
+                heapq.heappush(pq, (new_cost, v))
+    return cost, predecessor
+
+
+def _trace(predecessor: Dict[Hashable, Hashable], node: Hashable) -> List[Hashable]:
+    path = [node]
+    while node in predecessor:
+        node = predecessor[node]
+        path.append(node)
+    return path
+
+
+def _astar(graph, start, target, heuristic: Heuristic, telemetry) -> Tuple[float, List[Hashable]]:
+    # Keys are cost + heuristic; an admissible heuristic keeps the first pop of target optimal
+    if start not in graph:
+        if telemetry is not None:
+            telemetry["settled"] = 0
+        return INF, []
+    cost = {start: 0}
+    predecessor: Dict[Hashable, Hashable] = {}
+    # Ties on f go to the node nearer the target (smaller estimate)
+    estimate = heuristic(start, target)
+    pq = [(estimate, estimate, 0, start)]
+    settled = 0
+    while pq:
+        _, _, current_cost, u = heapq.heappop(pq)
+        if current_cost > cost[u]:
+            continue
+        settled += 1
+        if u == target:
+            break
+        for v, weight in graph.get(u, {}).items():
+            new_cost = current_cost + weight
+            if new_cost < cost.get(v, INF):
+                estimate = heuristic(v, target)
+                if estimate == INF:
+                    # Provably cannot reach the target
+                    continue
+                cost[v] = new_cost
+                predecessor[v] = u
+                heapq.heappush(pq, (new_cost + estimate, estimate, new_cost, v))
+    if telemetry is not None:
+        telemetry["settled"] = settled
+    if target not in cost:
+        return INF, []
+    return cost[target], _trace(predecessor, target)[::-1]
+
+
+def _bidirectional(graph, reverse_graph, start, target, heuristic: Optional[Heuristic], telemetry) -> Tuple[float, List[Hashable]]:
+    """
+    Forward from start and backward from target until the frontiers can no
+    longer improve the best meeting. With a heuristic, both sides run on the
+    average potential p(v) = (h(v, target) - h(start, v)) / 2, which stays
+    consistent in both directions (bidirectional A*).
+    """
+    if start not in graph or target not in reverse_graph:
+        if telemetry is not None:
+            telemetry["settled"] = 0
+        return INF, []
+
+    def potential(v: Hashable) -> float:
+        if heuristic is None:
+            return 0.0
+        ahead, behind = heuristic(v, target), heuristic(start, v)
+        if ahead == INF or behind == INF:
+            return INF
+        return (ahead - behind) / 2
+
+    graphs = (graph, reverse_graph)
+    signs = (1, -1)
+    costs: Tuple[Dict[Hashable, float], Dict[Hashable, float]] = ({start: 0}, {target: 0})
+    parents: Tuple[Dict[Hashable, Hashable], Dict[Hashable, Hashable]] = ({}, {})
+    queues = ([(potential(start), 0, start)], [(-potential(target), 0, target)])
+    best, meeting = (0, start) if start == target else (INF, None)
+    settled = 0
+    side = 0
+    while queues[0] and queues[1]:
+        # A meeting beats every path the frontiers could still assemble
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        if len(queues[1]) < len(queues[0]):
+            side = 1
+        else:
+            side = 0
+        _, current_cost, u = heapq.heappop(queues[side])
+        if current_cost > costs[side][u]:
+            continue
+        settled += 1
+        for v, weight in graphs[side].get(u, {}).items():
+            new_cost = current_cost + weight
+            if new_cost < costs[side].get(v, INF):
+                p = potential(v)
+                if p == INF:
+                    continue
+                costs[side][v] = new_cost
+                parents[side][v] = u
+                heapq.heappush(queues[side], (new_cost + signs[side] * p, new_cost, v))
+                other = costs[side ^ 1].get(v)
+                if other is not None and new_cost + other < best:
+                    best, meeting = new_cost + other, v
+    if telemetry is not None:
+        telemetry["settled"] = settled
+    if meeting is None:
+        return INF, []
+    return best, _trace(parents[0], meeting)[::-1] + _trace(parents[1], meeting)[1:]
+
+
+def coordinate_heuristic(coordinates: Dict[Hashable, Sequence[float]], scale: float = 1.0) -> Heuristic:
+    """
+    Straight-line distance between embedded thoughts. Admissible when no
+    synapse is cheaper than `scale` times the distance it spans.
+    """
+    def heuristic(u: Hashable, v: Hashable) -> float:
+        a, b = coordinates.get(u), coordinates.get(v)
+        if a is None or b is None:
+            return 0.0
+        return scale * sum((x - y) ** 2 for x, y in zip(a, b)) ** 0.5
+    return heuristic
+
+
+class LandmarkHeuristic:
+    """
+    The Lighthouses (ALT: A*, Landmarks, Triangle inequality).
+    Distances to and from a few anchors bound every other distance:
+    d(u, v) >= d(u, L) - d(v, L) and d(u, v) >= d(L, v) - d(L, u).
+    Anchors are picked farthest-first so they sit at the rim of the graph.
+    """
+    def __init__(self, graph: Dict[Hashable, Dict[Hashable, float]], anchors: int = 4,
+                 reverse_graph: Optional[Dict[Hashable, Dict[Hashable, float]]] = None,
+                 seed_node: Optional[Hashable] = None):
+        reverse_graph = reverse_graph if reverse_graph is not None else invert_graph(graph)
+        self.anchors: List[Hashable] = []
+        # Per anchor: cost from the anchor, and cost to the anchor (sparse: reachable only)
+        self.from_anchor: List[Dict[Hashable, float]] = []
+        self.to_anchor: List[Dict[Hashable, float]] = []
+        if not graph:
+            return
+        candidate = seed_node if seed_node is not None else next(iter(graph))
+        # Farthest-first: the next lighthouse is the node worst served by those already lit
+        nearest_lit = shortest_path_tree(graph, candidate)[0]
+        candidate = max(nearest_lit, key=nearest_lit.get)
+        nearest_lit = {}
+        for _ in range(min(anchors, len(graph))):
+            self.anchors.append(candidate)
+            outward = shortest_path_tree(graph, candidate)[0]
+            self.from_anchor.append(outward)
+            self.to_anchor.append(shortest_path_tree(reverse_graph, candidate)[0])
+            for node, cost in outward.items():
+                if cost < nearest_lit.get(node, INF):
+                    nearest_lit[node] = cost
+            remaining = [node for node in nearest_lit if node not in self.anchors]
+            if not remaining:
+                break
+            candidate = max(remaining, key=nearest_lit.get)
+
+    def __call__(self, u: Hashable, v: Hashable) -> float:
+        bound = 0.0
+        for outward, inward in zip(self.from_anchor, self.to_anchor):
+            # d(u, v) >= d(u, L) - d(v, L)
+            to_v = inward.get(v)
+            if to_v is not None:
+                to_u = inward.get(u)
+                if to_u is None:
+                    # v reaches the lighthouse but u does not, so u cannot reach v
+                    return INF
+                if to_u - to_v > bound:
+                    bound = to_u - to_v
+            # d(u, v) >= d(L, v) - d(L, u)
+            from_u = outward.get(u)
+            if from_u is not None:
+                from_v = outward.get(v)
+                if from_v is None:
+                    return INF
+                if from_v - from_u > bound:
+                    bound = from_v - from_u
+        return bound
+
+
+def _check_label(label: Hashable) -> None:
+    if isinstance(label, tuple):
+        for part in label:
+            _check_label(part)
+    elif not (label is None or isinstance(label, (str, int, float))):
+        raise TypeError(f"Cannot persist node label {label!r}; use str, int, float or tuples of them")
+
+
+def _thaw_label(label):
+    # JSON has no tuples: a list can only have been a tuple label (lists are not hashable)
+    return tuple(_thaw_label(part) for part in label) if isinstance(label, list) else label
+
+
+class NeuralHierarchy:
+    """
+    The Contraction Hierarchy: preprocessing for a static neural matrix.
+    Nodes are contracted from least to most important; shortcuts preserve every
+    shortest path, so a query is a bidirectional Dijkstra that only climbs.
+    Kinetic Complexity: a query settles a few hundred nodes on road-like graphs.
+    """
+    def __init__(self, labels: List[Hashable], rank: List[int],
+                 upward: List[Dict[int, float]], downward: List[Dict[int, float]],
+                 via: Dict[Tuple[int, int], int]):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.rank = rank
+        # upward[u]: edges u -> v with rank[v] > rank[u]
+        self.upward = upward
+        # downward[v]: edges u -> v with rank[u] > rank[v], stored reversed (v: {u: w})
+        self.downward = downward
+        # Shortcut (u, v) -> the contracted node it jumps over
+        self.via = via
+        # Nodes settled by the last query (instrumentation)
+        self.settled = 0
+
+    @property
+    def shortcut_count(self) -> int:
+        return len(self.via)
+
+    @classmethod
+    def build(cls, graph: Dict[Hashable, Dict[Hashable, float]], witness_limit: int = 60) -> 'NeuralHierarchy':
+        labels: List[Hashable] = list(graph)
+        index = {label: i for i, label in enumerate(labels)}
+        for neighbors in graph.values():
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    index[neighbor] = len(labels)
+                    labels.append(neighbor)
+        n = len(labels)
+
+        # Live (uncontracted) adjacency, keeping only the lightest parallel synapse
+        out_edges: List[Dict[int, float]] = [{} for _ in range(n)]
+        in_edges: List[Dict[int, float]] = [{} for _ in range(n)]
+        for u_label, neighbors in graph.items():
+            u = index[u_label]
+            for v_label, weight in neighbors.items():
+                v = index[v_label]
+                if u != v and weight < out_edges[u].get(v, float('inf')):
+                    out_edges[u][v] = weight
+                    in_edges[v][u] = weight
+
+        via: Dict[Tuple[int, int], int] = {}
+        contracted = [False] * n
+        lost_neighbors = [0] * n
+
+        def witness_costs(source: int, skip: int, limit: float) -> Dict[int, float]:
+            # Bounded local Dijkstra that may not pass through the node being contracted;
+            # it stops once every out-neighbour of `skip` is settled
+            costs = {source: 0.0}
+            pq = [(0.0, source)]
+            pending = set(out_edges[skip])
+            settled = 0
+            while pq and pending and settled < witness_limit:
+                cost, u = heapq.heappop(pq)
+                if cost > limit:
+                    break
+                if cost > costs[u]:
+                    continue
+                settled += 1
+                pending.discard(u)
+                for v, weight in out_edges[u].items():
+                    if v == skip:
+                        continue
+                    new_cost = cost + weight
+                    if new_cost < costs.get(v, float('inf')):
+                        costs[v] = new_cost
+                        heapq.heappush(pq, (new_cost, v))
+            return costs
+
+        def needed_shortcuts(v: int) -> List[Tuple[int, int, float]]:
+            shortcuts = []
+            for u, w_in in in_edges[v].items():
+                if not out_edges[v]:
+                    break
+                limit = w_in + max(out_edges[v].values())
+                costs = witness_costs(u, v, limit)
+                for w, w_out in out_edges[v].items():
+                    if w == u:
+                        continue
+                    candidate = w_in + w_out
+                    if costs.get(w, float('inf')) > candidate:
+                        shortcuts.append((u, w, candidate))
+            return shortcuts
+
+        def priority(v: int) -> Tuple[int, List[Tuple[int, int, float]]]:
+            # Weighted edge difference; contracted neighbours push a node later so the work spreads evenly
+            shortcuts = needed_shortcuts(v)
+            return 2 * len(shortcuts) - len(in_edges[v]) - len(out_edges[v]) + 2 * lost_neighbors[v], shortcuts
+
+        queue = [(priority(v)[0], v) for v in range(n)]
+        heapq.heapify(queue)
+        rank = [0] * n
+        upward: List[Dict[int, float]] = [{} for _ in range(n)]
+        downward: List[Dict[int, float]] = [{} for _ in range(n)]
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            if contracted[v]:
+                continue
+            # Lazy update: re-score before committing
+            current, shortcuts = priority(v)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, v))
+                continue
+
+            rank[v] = order
+            order += 1
+            contracted[v] = True
+            # Everything still attached to v outranks it
+            upward[v] = dict(out_edges[v])
+            downward[v] = dict(in_edges[v])
+            for w in out_edges[v]:
+                del in_edges[w][v]
+                lost_neighbors[w] += 1
+            for u in in_edges[v]:
+                del out_edges[u][v]
+                lost_neighbors[u] += 1
+            out_edges[v] = {}
+            in_edges[v] = {}
+            for u, w, weight in shortcuts:
+                if weight < out_edges[u].get(w, float('inf')):
+                    out_edges[u][w] = weight
+                    in_edges[w][u] = weight
+                    via[(u, w)] = v
+
+        # Forget shortcuts that a lighter synapse superseded before finalisation
+        via = {(u, w): m for (u, w), m in via.items()
+               if (rank[u] < rank[w] and w in upward[u]) or (rank[u] > rank[w] and u in downward[w])}
+        return cls(labels, rank, upward, downward, via)
+
+    def _unpack(self, path: List[int]) -> List[int]:
+        expanded = [path[0]]
+        stack = [(a, b) for a, b in reversed(list(zip(path, path[1:])))]
+        while stack:
+            a, b = stack.pop()
+            mid = self.via.get((a, b))
+            if mid is None:
+                expanded.append(b)
+            else:
+                stack.append((mid, b))
+                stack.append((a, mid))
+        return expanded
+
+    def query(self, start: Hashable, target: Hashable) -> Tuple[float, List[Hashable]]:
+        if start not in self.index or target not in self.index:
+            self.settled = 0
+            return float('inf'), []
+        s, t = self.index[start], self.index[target]
+        graphs = (self.upward, self.downward)
+        costs = ({s: 0.0}, {t: 0.0})
+        parents: Tuple[Dict[int, int], Dict[int, int]] = ({s: -1}, {t: -1})
+        queues = ([(0.0, s)], [(0.0, t)])
+        best, meeting = (0.0, s) if s == t else (float('inf'), -1)
+        settled = 0
+        side = 0
+        while queues[0] or queues[1]:
+            # Alternate directions, skipping one whose frontier can no longer help
+            if not queues[side] or queues[side][0][0] >= best:
+                side ^= 1
+                if not queues[side] or queues[side][0][0] >= best:
+                    break
+            cost, u = heapq.heappop(queues[side])
+            if cost > costs[side][u]:
+                continue
+            settled += 1
+            other = costs[side ^ 1].get(u)
+            if other is not None and cost + other < best:
+                best, meeting = cost + other, u
+            for v, weight in graphs[side][u].items():
+                new_cost = cost + weight
+                if new_cost < costs[side].get(v, float('inf')):
+                    costs[side][v] = new_cost
+                    parents[side][v] = u
+                    heapq.heappush(queues[side], (new_cost, v))
+            side ^= 1
+        self.settled = settled
+        if meeting == -1:
+            return float('inf'), []
+
+        forward = []
+        curr = meeting
+        while curr != -1:
+            forward.append(curr)
+            curr = parents[0][curr]
+        forward.reverse()
+        curr = parents[1][meeting]
+        while curr != -1:
+            forward.append(curr)
+            curr = parents[1][curr]
+        return best, [self.labels[u] for u in self._unpack(forward)]
+
+    def save(self, path: str) -> None:
+        """Persist as JSON. Labels may be str, int, float, bool, None, or tuples of those."""
+        for label in self.labels:
+            _check_label(label)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "labels": self.labels,
+                "rank": self.rank,
+                "upward": [[[v, w] for v, w in edges.items()] for edges in self.upward],
+                "downward": [[[v, w] for v, w in edges.items()] for edges in self.downward],
+                "via": [[u, w, m] for (u, w), m in self.via.items()],
+            }, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'NeuralHierarchy':
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            [_thaw_label(label) for label in data["labels"]],
+            data["rank"],
+            [{v: w for v, w in edges} for edges in data["upward"]],
+            [{v: w for v, w in edges} for edges in data["downward"]],
+            {(u, w): m for u, w, m in data["via"]},
+        )
+
 if __name__ == "__main__":
     # A complex mapping of Shela's cognitive state
     shela_brain = {
@@ -82,3 +553,70 @@ if __name__ == "__main__":
     else:
         print("\n[DISSONANCE] No logical pathway exists between these thoughts.")
     print("==========================================")
+
+    # --- THE ROUTING MODES BENCH ---
+    # Road-like grids, sized by the command line. Pure-Python contraction runs
+    # at roughly 500 nodes/s, so 1M nodes is an overnight job; 1k and 10k are the default.
+    import random
+    import sys
+    import tempfile
+    import time
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000]
+    rng = random.Random(7)
+    print("\n=== SHELA NEURAL ROUTING BENCH ===")
+    for size in sizes:
+        side = max(2, int(size ** 0.5))
+        grid = {f"{x},{y}": {} for y in range(side) for x in range(side)}
+        for y in range(side):
+            for x in range(side):
+                for nx, ny in ((x + 1, y), (x, y + 1)):
+                    if nx < side and ny < side:
+                        weight = rng.randint(1, 20)
+                        grid[f"{x},{y}"][f"{nx},{ny}"] = weight
+                        grid[f"{nx},{ny}"][f"{x},{y}"] = weight + rng.randint(0, 3)
+        labels = list(grid)
+        queries = [(rng.choice(labels), rng.choice(labels)) for _ in range(100)]
+
+        t0 = time.perf_counter()
+        hierarchy = NeuralHierarchy.build(grid)
+        build_time = time.perf_counter() - t0
+        with tempfile.TemporaryDirectory() as scratch:
+            path = os.path.join(scratch, "hierarchy.json")
+            hierarchy.save(path)
+            t0 = time.perf_counter()
+            hierarchy = NeuralHierarchy.load(path)
+            load_time = time.perf_counter() - t0
+
+        ch_settled = 0
+        t0 = time.perf_counter()
+        for s, t in queries:
+            hierarchy.query(s, t)
+            ch_settled += hierarchy.settled
+        ch_time = time.perf_counter() - t0
+        print(f"{len(labels):>8} nodes: build {build_time:.2f}s ({hierarchy.shortcut_count} shortcuts), load {load_time:.2f}s")
+
+        # The query-time modes need no contraction, only cheap side tables
+        t0 = time.perf_counter()
+        reverse = invert_graph(grid)
+        lighthouses = LandmarkHeuristic(grid, anchors=4, reverse_graph=reverse)
+        alt_time = time.perf_counter() - t0
+        coordinates = {label: tuple(map(int, label.split(","))) for label in labels}
+        modes = [
+            ("dijkstra", "dijkstra", None),
+            ("A* (coordinates)", "astar", coordinate_heuristic(coordinates)),
+            (f"A* (ALT, {alt_time:.2f}s prep)", "astar", lighthouses),
+            ("bidirectional", "bidirectional", None),
+            ("bidirectional A* (ALT)", "bidirectional", lighthouses),
+        ]
+        for name, mode, heuristic in modes:
+            telemetry = {"settled": 0}
+            settled = 0
+            t0 = time.perf_counter()
+            for s, t in queries:
+                find_optimal_path(grid, s, t, mode=mode, heuristic=heuristic, reverse_graph=reverse, telemetry=telemetry)
+                settled += telemetry["settled"]
+            elapsed = time.perf_counter() - t0
+            print(f"          {name:<28} {1000 * elapsed / len(queries):6.2f} ms/query ({settled // len(queries)} settled)")
+        print(f"          {'contraction hierarchy':<28} {1000 * ch_time / len(queries):6.2f} ms/query ({ch_settled // len(queries)} settled)")
+    print("==================================")
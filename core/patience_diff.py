@@ -0,0 +1,185 @@
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+from lis import quantum_crescendo_lis
+
+Opcode = Tuple[str, int, int, int, int]
+
+
+def patience_matches(a: Sequence[Hashable], b: Sequence[Hashable]) -> List[Tuple[int, int]]:
+    """
+    The Patience Anchors.
+    Pairs (i, j) with a[i] == b[j] that the diff keeps, in increasing order.
+    Lines unique to both sides are anchored with quantum_crescendo_lis, then
+    the gaps between anchors are refined the same way. Iterative, so 100k-line
+    files cannot exhaust the call stack.
+    """
+    matches: List[Tuple[int, int]] = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        a_lo, a_hi, b_lo, b_hi = stack.pop()
+
+        # Shared openings and cadences need no anchors
+        while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+            matches.append((a_lo, b_lo))
+            a_lo += 1
+            b_lo += 1
+        while a_lo < a_hi and b_lo < b_hi and a[a_hi - 1] == b[b_hi - 1]:
+            a_hi -= 1
+            b_hi -= 1
+            matches.append((a_hi, b_hi))
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+
+        # Lines that occur exactly once on each side of this window
+        seen_a: Dict[Hashable, int] = {}
+        for i in range(a_lo, a_hi):
+            seen_a[a[i]] = -1 if a[i] in seen_a else i
+        seen_b: Dict[Hashable, int] = {}
+        for j in range(b_lo, b_hi):
+            line = b[j]
+            if seen_a.get(line, -1) != -1:
+                seen_b[line] = -1 if line in seen_b else j
+        # b-positions of the unique pairs, listed in a-order
+        b_in_a_order = []
+        a_for_b: Dict[int, int] = {}
+        for i in range(a_lo, a_hi):
+            j = seen_b.get(a[i], -1)
+            if j != -1 and seen_a[a[i]] == i:
+                b_in_a_order.append(j)
+                a_for_b[j] = i
+        if not b_in_a_order:
+            # No unique anchor: the window is a straight replacement
+            continue
+
+        # The longest crescendo of b-positions is the largest consistent anchor set
+        _, anchors = quantum_crescendo_lis(b_in_a_order)
+        prev_a, prev_b = a_lo, b_lo
+        for j in anchors:
+            i = a_for_b[j]
+            matches.append((i, j))
+            stack.append((prev_a, i, prev_b, j))
+            prev_a, prev_b = i + 1, j + 1
+        stack.append((prev_a, a_hi, prev_b, b_hi))
+
+    matches.sort()
+    return matches
+
+
+def edit_script(a: Sequence[Hashable], b: Sequence[Hashable]) -> List[Opcode]:
+    """
+    difflib-style opcodes: (tag, i1, i2, j1, j2) with tag in
+    'equal', 'delete', 'insert', 'replace'.
+    """
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for mi, mj in patience_matches(a, b) + [(len(a), len(b))]:
+        if i < mi and j < mj:
+            opcodes.append(("replace", i, mi, j, mj))
+        elif i < mi:
+            opcodes.append(("delete", i, mi, j, mj))
+        elif j < mj:
+            opcodes.append(("insert", i, mi, j, mj))
+        if mi < len(a):
+            # Fold consecutive matches into one equal run
+            if opcodes and opcodes[-1][0] == "equal" and opcodes[-1][2] == mi and opcodes[-1][4] == mj:
+                tag, i1, _, j1, _ = opcodes[-1]
+                opcodes[-1] = (tag, i1, mi + 1, j1, mj + 1)
+            else:
+                opcodes.append(("equal", mi, mi + 1, mj, mj + 1))
+        i, j = mi + 1, mj + 1
+    return opcodes
+
+
+def apply_edit_script(a: Sequence[Hashable], b_source: Sequence[Hashable], opcodes: List[Opcode]) -> List[Hashable]:
+    """Replay `opcodes` against `a`, pulling inserted lines from `b_source`."""
+    result: List[Hashable] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            result.extend(a[i1:i2])
+        elif tag in ("insert", "replace"):
+            result.extend(b_source[j1:j2])
+    return result
+
+
+def _grouped(opcodes: List[Opcode], n: int) -> List[List[Opcode]]:
+    # Trim long equal runs down to `n` lines of context and split hunks on the gaps
+    if not opcodes:
+        return []
+    codes = list(opcodes)
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = (tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2)
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = (tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n))
+    groups, group = [], []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > 2 * n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+    return [g for g in groups if any(code[0] != "equal" for code in g)]
+
+
+def _hunk_range(start: int, stop: int) -> str:
+    length = stop - start
+    if length == 1:
+        return f"{start + 1}"
+    if length == 0:
+        return f"{start},0"
+    return f"{start + 1},{length}"
+
+
+def unified_diff(a: Sequence[str], b: Sequence[str], fromfile: str = "a", tofile: str = "b", n: int = 3) -> str:
+    """Unified diff of two line lists (without trailing newlines), as one string."""
+    out: List[str] = []
+    for group in _grouped(edit_script(a, b), n):
+        if not out:
+            out.append(f"--- {fromfile}")
+            out.append(f"+++ {tofile}")
+        first, last = group[0], group[-1]
+        out.append(f"@@ -{_hunk_range(first[1], last[2])} +{_hunk_range(first[3], last[4])} @@")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                out.extend(" " + line for line in a[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                out.extend("-" + line for line in a[i1:i2])
+            if tag in ("replace", "insert"):
+                out.extend("+" + line for line in b[j1:j2])
+    return "\n".join(out) + ("\n" if out else "")
+
+
+# --- THE PATIENT SCRIBE ---
+if __name__ == "__main__":
+    import random
+    import time
+
+    before = ["def awaken():", "    tune()", "    return 'SHELA'", "", "def halt():", "    return None"]
+    after = ["def awaken():", "    tune()", "    listen()", "    return 'SHELA'", "", "def halt(force=False):", "    return None"]
+    print("=== SHELA PATIENCE SCRIBE ===")
+    print(unified_diff(before, after, "before.py", "after.py"))
+
+    rng = random.Random(42)
+    for size in (10_000, 100_000):
+        original = [f"line {i} {rng.random():.6f}" for i in range(size)]
+        edited = list(original)
+        for _ in range(size // 100):
+            k = rng.randrange(len(edited))
+            choice = rng.random()
+            if choice < 0.33:
+                del edited[k]
+            elif choice < 0.66:
+                edited.insert(k, f"inserted {rng.random():.6f}")
+            else:
+                edited[k] = f"rewritten {rng.random():.6f}"
+        t0 = time.perf_counter()
+        patch = unified_diff(original, edited)
+        elapsed = time.perf_counter() - t0
+        full = sum(len(line) + 1 for line in edited)
+        print(f"{size:>7} lines: diff in {elapsed:.2f}s, {len(patch)} bytes vs {full} bytes for the full file")
+    print("=============================")
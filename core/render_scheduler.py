@@ -0,0 +1,93 @@
+import shutil
+import signal
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, TextIO, Tuple
+
+# The one lock every terminal writer shares: spinner frames, panels, prompts
+STDOUT_LOCK = threading.RLock()
+STATUS_COLOR = "\x1b[1;34m"
+RESET = "\x1b[0m"
+
+
+class TerminalGeometry:
+    """
+    The terminal size, asked for once and then only when the window says it
+    changed (SIGWINCH), instead of an ioctl on every spinner tick.
+    """
+    def __init__(self, fallback: Tuple[int, int] = (80, 20)):
+        self.fallback = fallback
+        self.size = shutil.get_terminal_size(fallback)
+        self.installed = False
+
+    @property
+    def columns(self) -> int:
+        return self.size.columns
+
+    def refresh(self, *_signal_args) -> None:
+        self.size = shutil.get_terminal_size(self.fallback)
+
+    def install(self) -> bool:
+        """Hook SIGWINCH (main thread only; elsewhere the cached size simply stays put)."""
+        if self.installed:
+            return True
+        if not hasattr(signal, "SIGWINCH") or threading.current_thread() is not threading.main_thread():
+            return False
+        previous = signal.getsignal(signal.SIGWINCH)
+
+        def on_resize(signum, frame):
+            self.refresh()
+            if callable(previous):
+                previous(signum, frame)
+
+        signal.signal(signal.SIGWINCH, on_resize)
+        self.installed = True
+        return True
+
+
+class StatusLine:
+    """
+    The Metronome's Line (status renderer that owns its row of stdout).
+    Redraws the whole line only when the text or width changed; otherwise a
+    tick repaints just the spinner glyph. All writes happen under STDOUT_LOCK,
+    and `hold()` lets panel printers take the terminal with the line erased.
+    """
+    def __init__(self, stream: TextIO = sys.stdout, geometry: Optional[TerminalGeometry] = None,
+                 lock: threading.RLock = STDOUT_LOCK):
+        self.stream = stream
+        self.geometry = geometry or TerminalGeometry()
+        self.lock = lock
+        self.visible = False
+        self._drawn: Optional[Tuple[str, int]] = None
+        # Telemetry
+        self.full_redraws = 0
+        self.glyph_redraws = 0
+
+    def draw(self, glyph: str, text: str) -> None:
+        with self.lock:
+            cols = self.geometry.columns
+            display_text = text[:max(10, cols - 10)]
+            if self.visible and self._drawn == (display_text, cols):
+                self.stream.write(f"\r{STATUS_COLOR}{glyph}{RESET}")
+                self.glyph_redraws += 1
+            else:
+                self.stream.write(f"\r\x1b[2K{STATUS_COLOR}{glyph} {display_text}{RESET}")
+                self._drawn = (display_text, cols)
+                self.visible = True
+                self.full_redraws += 1
+            self.stream.flush()
+
+    def clear(self) -> None:
+        with self.lock:
+            if self.visible:
+                self.stream.write("\r\x1b[2K\r")
+                self.stream.flush()
+                self.visible = False
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        """Erase the status line and keep the spinner off stdout until the block ends."""
+        with self.lock:
+            self.clear()
+            yield
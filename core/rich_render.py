@@ -0,0 +1,173 @@
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, List, Optional
+
+try:
+    from rich.console import Console
+    from rich.json import JSON
+    from rich.markdown import CodeBlock, Markdown
+    from rich.panel import Panel
+    from rich.segment import Segment
+    from rich.syntax import Syntax
+    from rich.text import Text
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+    HAS_RICH = True
+except ImportError:
+    HAS_RICH = False
+
+# Code blocks longer than this are folded unless expansion is requested
+MAX_CODE_LINES = int(os.environ.get("SHELA_MAX_CODE_LINES", "200"))
+EXPAND_CODE = os.environ.get("SHELA_EXPAND_CODE", "") not in ("", "0")
+BLOCK_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=64)
+def cached_lexer(name: str) -> Any:
+    """A pygments lexer per name, looked up once; unknown names fall back to plain text."""
+    try:
+        return get_lexer_by_name(name or "text")
+    except ClassNotFound:
+        return get_lexer_by_name("text")
+
+
+class BlockCache:
+    """Thread-safe LRU of rendered code-block lines, keyed by everything that shapes them."""
+    def __init__(self, capacity: int = BLOCK_CACHE_SIZE):
+        self.capacity = capacity
+        self._lines: "OrderedDict[tuple, List[List[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[List[List[Any]]]:
+        with self._lock:
+            lines = self._lines.get(key)
+            if lines is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._lines.move_to_end(key)
+            return lines
+
+    def put(self, key: tuple, lines: List[List[Any]]) -> None:
+        with self._lock:
+            self._lines[key] = lines
+            self._lines.move_to_end(key)
+            while len(self._lines) > self.capacity:
+                self._lines.popitem(last=False)
+
+
+block_cache = BlockCache()
+
+
+def fold_code(code: str, expand: bool, max_lines: int) -> "tuple[str, int]":
+    """Trim `code` to `max_lines` unless expanding. Returns (code, lines folded away)."""
+    if expand or max_lines <= 0 or code.count("\n") < max_lines:
+        return code, 0
+    lines = code.split("\n")
+    return "\n".join(lines[:max_lines]), len(lines) - max_lines
+
+
+if HAS_RICH:
+    class CachedCodeBlock(CodeBlock):
+        """
+        The Echoing Score (cached code block).
+        Identical blocks at the same width reuse their highlighted lines, lexers
+        are looked up once per language, and giant blocks are folded.
+        """
+        expand = EXPAND_CODE
+        max_lines = MAX_CODE_LINES
+
+        def __rich_console__(self, console, options):
+            code, folded = fold_code(str(self.text).rstrip(), self.expand, self.max_lines)
+            lexer = self.lexer_name or "text"
+            key = (lexer, code, options.max_width, console.color_system)
+            lines = block_cache.get(key)
+            if lines is None:
+                syntax = Syntax(code, cached_lexer(lexer), line_numbers=True, word_wrap=True, theme="monokai")
+                lines = console.render_lines(syntax, options, pad=False)
+                block_cache.put(key, lines)
+            for line in lines:
+                yield from line
+                yield Segment.line()
+            if folded:
+                yield Text(f"… {folded} more lines folded (set SHELA_EXPAND_CODE=1 to expand)", style="dim italic")
+
+    class ShelaMarkdown(Markdown):
+        elements = {**Markdown.elements, "code_block": CachedCodeBlock, "fence": CachedCodeBlock}
+
+
+def looks_like_json(text: str) -> bool:
+    # Bracket check first, so prose never pays for a trial json.loads
+    if len(text) < 2 or (text[0], text[-1]) not in (("{", "}"), ("[", "]")):
+        return False
+    try:
+        json.loads(text)
+        return True
+    except ValueError:
+        return False
+
+
+class RenderPipeline:
+    """
+    Off-thread response rendering.
+    Markdown parsing, highlighting and panel layout run on a worker into an
+    off-screen console of the same width and colour system; the caller only
+    writes the finished ANSI string, so the terminal lock is held for a write,
+    not a render.
+    """
+    def __init__(self, console: "Console", workers: int = 1):
+        self.console = console
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shela-render")
+
+    def build(self, display_text: str, label: str, color_code: str, summary: str = "") -> "Panel":
+        stripped = display_text.strip()
+        content = JSON(stripped) if looks_like_json(stripped) else ShelaMarkdown(display_text)
+        return Panel(
+            content,
+            title=f"[bold]{label}[/bold]",
+            subtitle=f"[dim]{summary}[/dim]" if summary else None,
+            border_style=f"color({color_code.split(';')[-1]})" if ";" in color_code else "blue",
+            padding=(1, 2)
+        )
+
+    def render(self, display_text: str, label: str, color_code: str, summary: str = "") -> str:
+        canvas = Console(file=io.StringIO(), force_terminal=True, width=self.console.width,
+                         color_system=self.console.color_system)
+        canvas.print(self.build(display_text, label, color_code, summary))
+        return canvas.file.getvalue()
+
+    def submit(self, display_text: str, label: str, color_code: str, summary: str = "") -> Future:
+        return self._executor.submit(self.render, display_text, label, color_code, summary)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+# --- THE RENDERING BENCH ---
+if __name__ == "__main__":
+    import time
+
+    console = Console(force_terminal=True, width=100)
+    pipeline = RenderPipeline(console)
+    block = "\n".join(f"def movement_{i}(tempo):\n    return tempo * {i}" for i in range(600))
+    response = f"# Mozart's Report\n\nThe score compiled.\n\n```python\n{block}\n```\n"
+
+    print("=== SHELA RENDER PIPELINE ===")
+    for attempt in ("cold", "warm"):
+        t0 = time.perf_counter()
+        rendered = pipeline.submit(response, "Mozart", "1;35").result()
+        print(f"{attempt}: {1000 * (time.perf_counter() - t0):.1f} ms, {len(rendered)} bytes of ANSI")
+    CachedCodeBlock.expand = True
+    t0 = time.perf_counter()
+    pipeline.submit(response, "Mozart", "1;35").result()
+    print(f"expanded ({block.count(chr(10)) + 1} lines): {1000 * (time.perf_counter() - t0):.1f} ms")
+    print(f"block cache: {block_cache.hits} hits, {block_cache.misses} misses")
+    pipeline.shutdown()
+    print("=============================")
@@ -0,0 +1,182 @@
+import heapq
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Tuple
+
+from neural_router import INF, shortest_path_tree
+
+Tree = Tuple[Dict[Hashable, float], Dict[Hashable, Hashable]]
+
+
+class RouterCache:
+    """
+    The Remembered Routes (memoized shortest-path trees).
+    Keeps the full Dijkstra tree of the most recently used sources, so every
+    later query from the same thought is a walk up the predecessor chain.
+    Edge changes go through the cache: a cheaper synapse is relaxed into each
+    tree in place, a dearer or severed one only evicts the trees that used it.
+    """
+    def __init__(self, graph: Dict[Hashable, Dict[Hashable, float]], capacity: int = 64):
+        self.graph = graph
+        self.capacity = capacity
+        self.trees: "OrderedDict[Hashable, Tree]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.repairs = 0
+
+    def __len__(self) -> int:
+        return len(self.trees)
+
+    def _tree(self, source: Hashable) -> Tree:
+        tree = self.trees.get(source)
+        if tree is not None:
+            self.hits += 1
+            self.trees.move_to_end(source)
+            return tree
+        self.misses += 1
+        tree = shortest_path_tree(self.graph, source)
+        self.trees[source] = tree
+        if len(self.trees) > self.capacity:
+            self.trees.popitem(last=False)
+            self.evictions += 1
+        return tree
+
+    def find_optimal_path(self, start: Hashable, target: Hashable) -> Tuple[float, List[Hashable]]:
+        """Same contract as neural_router.find_optimal_path."""
+        if start not in self.graph:
+            return INF, []
+        cost, predecessor = self._tree(start)
+        if target not in cost:
+            return INF, []
+        path = [target]
+        while path[-1] != start:
+            path.append(predecessor[path[-1]])
+        return cost[target], path[::-1]
+
+    def distance(self, start: Hashable, target: Hashable) -> float:
+        if start not in self.graph:
+            return INF
+        return self._tree(start)[0].get(target, INF)
+
+    def _relax_into(self, tree: Tree, u: Hashable, v: Hashable, weight: float) -> bool:
+        # A cheaper synapse can only shorten routes; spread the gain outward from v
+        cost, predecessor = tree
+        if u not in cost or cost[u] + weight >= cost.get(v, INF):
+            return False
+        cost[v] = cost[u] + weight
+        predecessor[v] = u
+        pq = [(cost[v], v)]
+        while pq:
+            current_cost, node = heapq.heappop(pq)
+            if current_cost > cost[node]:
+                continue
+            for neighbor, edge_weight in self.graph.get(node, {}).items():
+                new_cost = current_cost + edge_weight
+                if new_cost < cost.get(neighbor, INF):
+                    cost[neighbor] = new_cost
+                    predecessor[neighbor] = node
+                    heapq.heappush(pq, (new_cost, neighbor))
+        return True
+
+    def _evict_users(self, u: Hashable, v: Hashable) -> None:
+        # Only trees whose route to v runs through u -> v are affected
+        for source in [s for s, (_, predecessor) in self.trees.items() if predecessor.get(v) == u and v != s]:
+            del self.trees[source]
+            self.invalidations += 1
+
+    def update_edge(self, u: Hashable, v: Hashable, weight: float) -> None:
+        """Set (or create) the synapse u -> v, keeping every cached tree exact."""
+        previous = self.graph.get(u, {}).get(v, INF)
+        self.graph.setdefault(u, {})[v] = weight
+        self.graph.setdefault(v, {})
+        if weight < previous:
+            for tree in self.trees.values():
+                if self._relax_into(tree, u, v, weight):
+                    self.repairs += 1
+        elif weight > previous:
+            self._evict_users(u, v)
+
+    def remove_edge(self, u: Hashable, v: Hashable) -> bool:
+        """Sever u -> v. Returns False if there was no such synapse."""
+        neighbors = self.graph.get(u)
+        if neighbors is None or v not in neighbors:
+            return False
+        del neighbors[v]
+        self._evict_users(u, v)
+        return True
+
+    def clear(self) -> None:
+        self.trees.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "repairs": self.repairs,
+            "cached_trees": len(self.trees),
+        }
+
+
+# --- THE ROUTE MEMORY BENCH ---
+if __name__ == "__main__":
+    import random
+    import time
+
+    from neural_router import find_optimal_path
+
+    rng = random.Random(3)
+    n = 5000
+    brain = {f"N{i}": {} for i in range(n)}
+    for i in range(n):
+        for _ in range(4):
+            brain[f"N{i}"][f"N{rng.randrange(n)}"] = rng.randint(1, 20)
+    labels = list(brain)
+    # A few hot sources asked about many targets, with the matrix drifting now and then
+    hot = [rng.choice(labels) for _ in range(16)]
+    workload = []
+    for _ in range(1000):
+        roll = rng.random()
+        if roll < 0.02:
+            workload.append(("update", rng.choice(labels), rng.choice(labels), rng.randint(1, 20)))
+        elif roll < 0.03:
+            u = rng.choice(labels)
+            workload.append(("remove", u, rng.choice(list(brain[u])), None))
+        else:
+            workload.append(("query", rng.choice(hot), rng.choice(labels), None))
+
+    print("=== SHELA ROUTE MEMORY BENCH ===")
+    plain = {u: dict(neighbors) for u, neighbors in brain.items()}
+    t0 = time.perf_counter()
+    for op, a, b, w in workload:
+        if op == "update":
+            plain[a][b] = w
+        elif op == "remove":
+            plain[a].pop(b, None)
+        else:
+            find_optimal_path(plain, a, b)
+    plain_time = time.perf_counter() - t0
+
+    cache = RouterCache({u: dict(neighbors) for u, neighbors in brain.items()}, capacity=32)
+    t0 = time.perf_counter()
+    for op, a, b, w in workload:
+        if op == "update":
+            cache.update_edge(a, b, w)
+        elif op == "remove":
+            cache.remove_edge(a, b)
+        else:
+            cache.find_optimal_path(a, b)
+    cached_time = time.perf_counter() - t0
+
+    print(f"Uncached: {plain_time:.2f}s | RouterCache: {cached_time:.2f}s over {len(workload)} operations")
+    for key, value in cache.stats().items():
+        print(f"  {key:<14} {value:.2%}" if key == "hit_rate" else f"  {key:<14} {value}")
+    print("================================")
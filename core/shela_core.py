@@ -1,10 +1,22 @@
-from trie import QuantumLexicon
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from shela_memory import DEFAULT_CAPACITY, ThoughtMemory
+from trie import QuantumLexicon, QuantumNode
 
 class ShelaOS:
-    def __init__(self):
+    def __init__(self, memory_capacity: int = DEFAULT_CAPACITY, memory_log: Optional[str] = None):
         self.lexicon = QuantumLexicon()
-        self.memory = []
+        # Bounded ring in RAM; with memory_log, every thought also survives the session on disk
+        self.memory = ThoughtMemory(memory_capacity, memory_log)
         self.is_active = False
+        # Reflexes by command word, and the same reflexes keyed by the word's trie node
+        self._reflexes: Dict[str, Callable[[], str]] = {
+            "AWAKEN": lambda: "[SHELA] I AM AWAKE. MY KINETIC FREQUENCY IS STABLE.",
+            "STATUS": lambda: f"[SHELA] SYSTEMS NOMINAL. MEMORY CAPACITY UTILIZED: {len(self.memory)} THOUGHTS.",
+            "HARMONY": lambda: "[SHELA] PLAYING A PERFECT CHORD: [B♭, A, C, B♮]",
+            "HALT": self._halt,
+        }
+        self._dispatch: Dict[QuantumNode, Callable[[], str]] = {}
         self._initialize_vocabulary()
 
     def _initialize_vocabulary(self):
@@ -12,6 +24,7 @@ class ShelaOS:
         core_commands = ["AWAKEN", "STATUS", "HARMONY", "HALT"]
         for cmd in core_commands:
             self.lexicon.insert(cmd)
+            self._dispatch[self.lexicon.resolve(cmd)] = self._reflexes[cmd]
 
     def boot(self):
         self.is_active = True
@@ -22,26 +35,64 @@ class ShelaOS:
             return "[SHELA] ERROR: CORE OFFLINE."
 
         clean_cmd = command.strip().upper()
-        
+        return self._respond(clean_cmd, self.lexicon.resolve(clean_cmd))
+
+    def _respond(self, clean_cmd: str, node: Optional[QuantumNode]) -> str:
         # Log to short-term memory
         self.memory.append(clean_cmd)
 
-        # Parse through the Quantum Lexicon (Trie)
-        if self.lexicon.search(clean_cmd):
-            return self._execute_known_command(clean_cmd)
-        else:
+        # Parsed through the Quantum Lexicon (Trie): the terminal node picks the reflex
+        if node is None:
             return f"[SHELA] DISSONANCE DETECTED: UNRECOGNIZED FREQUENCY '{clean_cmd}'"
+        reflex = self._dispatch.get(node)
+        if reflex is None:
+            # A word learned (or re-learned) after boot: bind it once, then stay O(1)
+            reflex = self._reflexes.get(clean_cmd, self._acknowledge)
+            self._dispatch[node] = reflex
+        return reflex()
+
+    def _resolver(self) -> Callable[[str], Tuple[str, Optional[QuantumNode]]]:
+        # Scripted sessions repeat themselves: normalize and walk the trie once per distinct
+        # spelling for the span of one batch (the lexicon may change between batches)
+        seen: Dict[str, Tuple[str, Optional[QuantumNode]]] = {}
+        resolve = self.lexicon.resolve
+
+        def normalize(command: str) -> Tuple[str, Optional[QuantumNode]]:
+            known = seen.get(command)
+            if known is None:
+                clean_cmd = command.strip().upper()
+                known = seen[command] = (clean_cmd, resolve(clean_cmd))
+            return known
+        return normalize
+
+    def ingest_many(self, commands: Iterable[str]) -> Iterator[str]:
+        """Lazily ingest a batch, yielding each response as ingest() would."""
+        normalize = self._resolver()
+        for command in commands:
+            if not self.is_active:
+                yield "[SHELA] ERROR: CORE OFFLINE."
+                continue
+            yield self._respond(*normalize(command))
 
-    def _execute_known_command(self, command: str) -> str:
-        if command == "AWAKEN":
-            return "[SHELA] I AM AWAKE. MY KINETIC FREQUENCY IS STABLE."
-        elif command == "STATUS":
-            return f"[SHELA] SYSTEMS NOMINAL. MEMORY CAPACITY UTILIZED: {len(self.memory)} THOUGHTS."
-        elif command == "HARMONY":
-            return "[SHELA] PLAYING A PERFECT CHORD: [B♭, A, C, B♮]"
-        elif command == "HALT":
-            self.is_active = False
-            return "[SHELA] SHUTTING DOWN NEURAL PATHWAYS. GOODBYE."
+    async def ingest_stream(self, commands: AsyncIterable[str]) -> AsyncIterator[str]:
+        """ingest_many for async sources (sockets, pipes, replays)."""
+        normalize = self._resolver()
+        async for command in commands:
+            if not self.is_active:
+                yield "[SHELA] ERROR: CORE OFFLINE."
+                continue
+            yield self._respond(*normalize(command))
+
+    def close(self) -> None:
+        """Release the memory chronicle's file handles."""
+        self.memory.close()
+
+    def _halt(self) -> str:
+        self.is_active = False
+        return "[SHELA] SHUTTING DOWN NEURAL PATHWAYS. GOODBYE."
+
+    @staticmethod
+    def _acknowledge() -> str:
         return "[SHELA] COMMAND ACKNOWLEDGED."
 
 if __name__ == "__main__":
@@ -68,3 +119,25 @@ if __name__ == "__main__":
         
         if not os.is_active:
             break
+
+    # --- THE THROUGHPUT BENCH ---
+    import random
+
+    rng = random.Random(44)
+    vocabulary = ["AWAKEN", "status", " harmony ", "NOISE", "Awaken", "STATUS"]
+    script = [rng.choice(vocabulary) for _ in range(200_000)]
+    print(f"{PURPLE}[SYSTEM] Replaying a {len(script)}-command session...{RESET}")
+    single = ShelaOS()
+    single.boot()
+    t0 = time.perf_counter()
+    for user_input in script:
+        single.ingest(user_input)
+    one_by_one = time.perf_counter() - t0
+    batched = ShelaOS()
+    batched.boot()
+    t0 = time.perf_counter()
+    for _ in batched.ingest_many(script):
+        pass
+    pipelined = time.perf_counter() - t0
+    print(f"{GREEN}ingest      : {len(script) / one_by_one:,.0f} commands/s{RESET}")
+    print(f"{GREEN}ingest_many : {len(script) / pipelined:,.0f} commands/s{RESET}")
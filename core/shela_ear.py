@@ -33,6 +33,43 @@ def calculate_dissonance(typo: str, target: str) -> int:
     # The final node holds the total kinetic cost
     return dp[m][n]
 
+def fragment_dissonance(fragment: str, target: str) -> int:
+    """
+    The Listening Ear (approximate substring distance).
+    Fewest strikes that turn `fragment` into some stretch of `target`, so
+    'rnder' hears 'render_cycle.py' at cost 1. Myers' bit-parallel recurrence:
+    one column of the Levenshtein grid per character, packed into one integer.
+    Kinetic Complexity: O(N) big-integer steps for M <= word size, O(M * N / w) beyond.
+    """
+    m = len(fragment)
+    if m == 0:
+        return 0
+    full = (1 << m) - 1
+    top = 1 << (m - 1)
+    peq = {}
+    for i, char in enumerate(fragment):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    pv, mv, score = full, 0, m
+    best = m
+    for char in target:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & top:
+            score += 1
+        elif mh & top:
+            score -= 1
+            if score < best:
+                best = score
+        # No carry into the first row: a match may start anywhere in the target
+        ph = (ph << 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return best
+
 if __name__ == "__main__":
     # Simulated typos from the Architect
     scenarios = [
@@ -0,0 +1,181 @@
+import json
+import os
+import struct
+from typing import Iterator, List, Optional
+
+# One little-endian u64 byte offset per thought in the sidecar index
+OFFSET = struct.Struct("<Q")
+DEFAULT_CAPACITY = 1024
+
+
+class ThoughtMemory:
+    """
+    The Long and Short of It (ring buffer over an append-only log).
+    The newest `capacity` thoughts live in a fixed ring in RAM; every thought is
+    also appended to a JSON-lines log with a sidecar of byte offsets, so the
+    count is O(1) and old thoughts are read back one seek at a time, only when
+    someone asks for them. Without a log path it is a plain bounded ring:
+    evicted thoughts still count in len(), but iteration and recent() only
+    reach the ones the ring holds.
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, log_path: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError("ThoughtMemory needs room for at least one thought")
+        self.capacity = capacity
+        self.log_path = log_path
+        self.index_path = log_path + ".idx" if log_path else None
+        self._ring: List[Optional[str]] = [None] * capacity
+        # Thoughts remembered in total, and the first of them still held in the ring
+        self._total = 0
+        self._ring_floor = 0
+        self._log = self._index = self._reader = None
+        if log_path:
+            self._open_chronicle()
+
+    def _open_chronicle(self) -> None:
+        directory = os.path.dirname(self.log_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        log_size = self._mend_torn_tail() if os.path.exists(self.log_path) else 0
+        index_size = os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+        if log_size and index_size % OFFSET.size == 0 and index_size:
+            # Consistent only if the last indexed thought is exactly the last line of the log
+            last = self._read_offset_at(self.index_path, index_size - OFFSET.size)
+            consistent = last < log_size and self._line_end(last) == log_size
+        else:
+            consistent = not log_size and not index_size
+        if not consistent:
+            self._rebuild_index()
+            index_size = os.path.getsize(self.index_path)
+        # Restart is O(1): only the index length is consulted, the thoughts stay on disk
+        self._total = self._ring_floor = index_size // OFFSET.size
+        self._log = open(self.log_path, "ab")
+        self._index = open(self.index_path, "ab")
+
+    def _mend_torn_tail(self) -> int:
+        """Cut a half-written last line (a crash mid-append) off the log. Returns the log size."""
+        with open(self.log_path, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            end = size
+            while end:
+                step = min(4096, end)
+                f.seek(end - step)
+                block = f.read(step)
+                newline = block.rfind(b"\n")
+                if newline != -1:
+                    end = end - step + newline + 1
+                    break
+                end -= step
+            if end != size:
+                f.truncate(end)
+            return end
+
+    def _line_end(self, position: int) -> int:
+        with open(self.log_path, "rb") as f:
+            f.seek(position)
+            f.readline()
+            return f.tell()
+
+    @staticmethod
+    def _read_offset_at(path: str, position: int) -> int:
+        with open(path, "rb") as f:
+            f.seek(position)
+            return OFFSET.unpack(f.read(OFFSET.size))[0]
+
+    def _rebuild_index(self) -> None:
+        # The sidecar was lost or torn: re-derive it from the log in one pass
+        offsets = bytearray()
+        with open(self.log_path, "rb") as f:
+            position = 0
+            for line in f:
+                if line.endswith(b"\n"):
+                    offsets += OFFSET.pack(position)
+                position += len(line)
+        with open(self.index_path, "wb") as f:
+            f.write(offsets)
+
+    def __len__(self) -> int:
+        return self._total
+
+    def append(self, thought: str) -> None:
+        if self._log is not None:
+            self._index.write(OFFSET.pack(self._log.tell()))
+            self._log.write(json.dumps(thought, ensure_ascii=False).encode("utf-8") + b"\n")
+            # Index first: a crash in between leaves an offset past the log's last line, or a torn
+            # last line; reopening cuts the torn tail and re-derives the index
+            self._index.flush()
+            self._log.flush()
+        self._ring[self._total % self.capacity] = thought
+        self._total += 1
+        if self._total - self._ring_floor > self.capacity:
+            self._ring_floor = self._total - self.capacity
+
+    def _recall(self, position: int) -> str:
+        if position >= self._ring_floor:
+            return self._ring[position % self.capacity]
+        if self._reader is None:
+            if self.log_path is None:
+                raise IndexError("thought evicted and no chronicle to recall it from")
+            self._reader = (open(self.index_path, "rb"), open(self.log_path, "rb"))
+        index, log = self._reader
+        index.seek(position * OFFSET.size)
+        log.seek(OFFSET.unpack(index.read(OFFSET.size))[0])
+        return json.loads(log.readline())
+
+    def __getitem__(self, position: int) -> str:
+        if position < 0:
+            position += self._total
+        if not 0 <= position < self._total:
+            raise IndexError("thought index out of range")
+        return self._recall(position)
+
+    @property
+    def _first_recallable(self) -> int:
+        return 0 if self.log_path else self._ring_floor
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(self._first_recallable, self._total):
+            yield self._recall(position)
+
+    def recent(self, n: int) -> List[str]:
+        """The last `n` thoughts, oldest first. Served from RAM while n <= capacity this session."""
+        start = max(self._first_recallable, self._total - n)
+        return [self._recall(position) for position in range(start, self._total)]
+
+    @property
+    def held_in_ram(self) -> int:
+        return self._total - self._ring_floor
+
+    def close(self) -> None:
+        for handle in (self._log, self._index) + (self._reader or ()):
+            if handle is not None:
+                handle.close()
+        self._log = self._index = self._reader = None
+
+
+# --- THE MEMORY PALACE BENCH ---
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, "thoughts.jsonl")
+        memory = ThoughtMemory(capacity=1024, log_path=path)
+        print("=== SHELA MEMORY PALACE ===")
+        t0 = time.perf_counter()
+        for i in range(100_000):
+            memory.append(f"THOUGHT {i}")
+        print(f"Remembered {len(memory)} thoughts in {time.perf_counter() - t0:.2f}s ({memory.held_in_ram} in RAM)")
+        memory.close()
+
+        t0 = time.perf_counter()
+        reborn = ThoughtMemory(capacity=1024, log_path=path)
+        print(f"Restart: {1000 * (time.perf_counter() - t0):.2f} ms, count {len(reborn)} without reading a thought")
+        t0 = time.perf_counter()
+        recent = reborn.recent(10)
+        print(f"Last 10 from disk in {1000 * (time.perf_counter() - t0):.2f} ms: {recent[0]} .. {recent[-1]}")
+        t0 = time.perf_counter()
+        oldest = reborn[0]
+        print(f"Oldest thought recalled in {1000 * (time.perf_counter() - t0):.2f} ms: {oldest}")
+        reborn.close()
+    print("===========================")
@@ -0,0 +1,421 @@
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import struct
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# Largest delta pushed in one event; a client far behind catches up in several
+MAX_CHUNK = 64 * 1024
+POLL_INTERVAL = 0.05
+HEARTBEAT = 15.0
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC11B85"
+DEFAULT_TEMPLATES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "web", "templates")
+PAGES = {"/": "workspace_ui.html", "/workspace": "workspace_ui.html", "/mobile": "shela_mobile.html"}
+# Endpoints that hand out the session itself; only this server's own pages may read them
+GUARDED = ("/events", "/ws", "/state", "/telemetry")
+LOOPBACK = ("127.0.0.1", "localhost", "::1")
+WILDCARD = ("0.0.0.0", "::", "")
+
+# Appended to every served page: follows the stream and re-dispatches it as DOM events.
+# A fresh page renders the score from the top; EventSource resends the last id
+# (a byte offset) on reconnect, so a dropped connection resumes for free.
+CLIENT_SCRIPT = """<script>
+(function () {
+  const source = new EventSource('/events?offset=0');
+  const relay = (name) => source.addEventListener(name, (e) => {
+    window.dispatchEvent(new CustomEvent('shela:' + name, { detail: JSON.parse(e.data) }));
+  });
+  ['state', 'telemetry', 'reset'].forEach(relay);
+})();
+</script>
+"""
+
+
+def utf8_safe_end(data: bytes) -> int:
+    """Length of the longest prefix of `data` that does not end inside a UTF-8 character."""
+    end = len(data)
+    back = 0
+    while back < min(3, end) and data[end - 1 - back] & 0xC0 == 0x80:
+        back += 1
+    if back < end:
+        lead = data[end - 1 - back]
+        need = 2 if lead >> 5 == 0b110 else 3 if lead >> 4 == 0b1110 else 4 if lead >> 3 == 0b11110 else 1
+        if need > back + 1:
+            return end - 1 - back
+    return end
+
+
+def read_delta(path: str, offset: int, limit: int = MAX_CHUNK) -> Tuple[int, str, bool]:
+    """
+    The Tail Note.
+    Bytes of `path` from `offset`, cut on a character boundary.
+    Returns (next offset, text, reset); reset means the file shrank under the
+    reader and the text starts again from byte 0.
+    """
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            reset = offset > size
+            if reset:
+                offset = 0
+            f.seek(offset)
+            data = f.read(limit)
+    except FileNotFoundError:
+        return 0, "", offset > 0
+    # A writer caught mid-character keeps its half for the next read
+    end = utf8_safe_end(data)
+    return offset + end, data[:end].decode("utf-8", errors="replace"), reset
+
+
+class StateHub:
+    """
+    The Conductor's Ear (one watcher, many listeners).
+    Stats the state and telemetry files once per tick no matter how many
+    clients are connected, and wakes them all when either changes. Every
+    client keeps its own byte offset and reads only what it has not seen.
+    """
+    def __init__(self, state_path: str, telemetry_path: Optional[str] = None, interval: float = POLL_INTERVAL):
+        self.state_path = state_path
+        self.telemetry_path = telemetry_path
+        self.interval = interval
+        self.size = -1
+        self.telemetry: Optional[Dict[str, Any]] = None
+        self.telemetry_version = 0
+        self._telemetry_stamp: Optional[Tuple[int, int]] = None
+        self._pulse = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def _notify(self) -> None:
+        pulse, self._pulse = self._pulse, asyncio.Event()
+        pulse.set()
+
+    def poll(self) -> bool:
+        """One tick of the watcher. Returns True when listeners were woken."""
+        changed = False
+        try:
+            size = os.stat(self.state_path).st_size
+        except FileNotFoundError:
+            size = 0
+        if size != self.size:
+            self.size = size
+            changed = True
+        if self.telemetry_path:
+            try:
+                st = os.stat(self.telemetry_path)
+                stamp = (st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                stamp = None
+            if stamp is not None and stamp != self._telemetry_stamp:
+                try:
+                    with open(self.telemetry_path) as f:
+                        self.telemetry = json.load(f)
+                    self._telemetry_stamp = stamp
+                    self.telemetry_version += 1
+                    changed = True
+                except (OSError, ValueError):
+                    pass  # Caught mid-write; the next tick reads it whole
+        if changed:
+            self._notify()
+        return changed
+
+    async def wait(self, timeout: float) -> bool:
+        """Sleep until the next change; False on timeout."""
+        try:
+            await asyncio.wait_for(self._pulse.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _watch(self) -> None:
+        while True:
+            self.poll()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self.poll()
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+def ws_frame(payload: bytes, opcode: int = 0x1) -> bytes:
+    header = bytes([0x80 | opcode])
+    n = len(payload)
+    if n < 126:
+        header += bytes([n])
+    elif n < 1 << 16:
+        header += bytes([126]) + struct.pack(">H", n)
+    else:
+        header += bytes([127]) + struct.pack(">Q", n)
+    return header + payload
+
+
+async def ws_read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    first, second = await reader.readexactly(2)
+    n = second & 0x7F
+    if n == 126:
+        n = struct.unpack(">H", await reader.readexactly(2))[0]
+    elif n == 127:
+        n = struct.unpack(">Q", await reader.readexactly(8))[0]
+    mask = await reader.readexactly(4) if second & 0x80 else b""
+    payload = await reader.readexactly(n)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return first & 0x0F, payload
+
+
+class StateStreamServer:
+    """
+    The Live Score (state deltas over SSE and WebSocket).
+    Serves the workspace and mobile pages, and pushes every byte appended to
+    the state file, plus each new telemetry record, the moment the hub sees it.
+    Clients resume from a byte offset (`?offset=N`, or SSE's Last-Event-ID),
+    so a reconnect costs only the bytes that were missed.
+
+      GET /events     text/event-stream: `state`, `telemetry` and `reset` events
+      GET /ws         WebSocket: the same events as JSON text frames
+      GET /state      the raw delta from ?offset=N (header X-Shela-Offset: next)
+      GET /telemetry  the latest telemetry record
+
+    The session is private: no CORS header is ever sent, and a request to any
+    of those four whose Origin is not this server's own host:port is refused,
+    so another page open in the same browser cannot read the score.
+    """
+    def __init__(self, state_path: str, telemetry_path: Optional[str] = None, templates_dir: str = DEFAULT_TEMPLATES,
+                 host: str = "127.0.0.1", port: int = 8765, interval: float = POLL_INTERVAL):
+        self.state_path = state_path
+        self.telemetry_path = telemetry_path
+        self.templates_dir = templates_dir
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.hub: Optional[StateHub] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        # Telemetry
+        self.clients = 0
+        self.bytes_pushed = 0
+
+    async def start(self) -> int:
+        """Bind and begin watching. Returns the bound port (useful with port=0)."""
+        self.hub = StateHub(self.state_path, self.telemetry_path, self.interval)
+        self.hub.start()
+        try:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        except OSError:
+            self.hub.stop()
+            raise
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self.hub:
+            self.hub.stop()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            lines = request.decode("latin-1").split("\r\n")
+            method, target, _ = lines[0].split(" ", 2)
+            headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+            url = urlsplit(target)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            offset = self._offset(query, headers)
+            if method != "GET":
+                await self._reply(writer, "405 Method Not Allowed", b"", "text/plain")
+            elif url.path in GUARDED and not self._own_origin(headers):
+                await self._reply(writer, "403 Forbidden", b"Not your score.", "text/plain")
+            elif url.path == "/events":
+                await self._stream_sse(writer, offset)
+            elif url.path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self._stream_ws(reader, writer, headers, offset)
+            elif url.path == "/state":
+                next_offset, text, _ = read_delta(self.state_path, offset, limit=1 << 30)
+                await self._reply(writer, "200 OK", text.encode("utf-8"), "text/plain; charset=utf-8",
+                                  {"X-Shela-Offset": str(next_offset)})
+            elif url.path == "/telemetry":
+                await self._reply(writer, "200 OK", json.dumps(self.hub.telemetry).encode(), "application/json")
+            elif url.path in PAGES:
+                await self._serve_page(writer, PAGES[url.path])
+            else:
+                await self._reply(writer, "404 Not Found", b"Lost in the glitch.", "text/plain")
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    def _own_origin(self, headers: Dict[str, str]) -> bool:
+        """True unless a browser says the request comes from some other site."""
+        origin = headers.get("origin")
+        if origin is None:
+            return True  # Not cross-site: curl, or a same-origin GET
+        parts = urlsplit(origin)
+        if parts.scheme != "http" or parts.hostname is None:
+            return False
+        if self.host in WILDCARD:
+            # Reachable under any address; the page must come from the one the client dialled
+            return parts.netloc == headers.get("host")
+        allowed = LOOPBACK if self.host in LOOPBACK else (self.host,)
+        return parts.hostname in allowed and parts.port == self.port
+
+    @staticmethod
+    def _offset(query: Dict[str, str], headers: Dict[str, str]) -> int:
+        raw = headers.get("last-event-id") or query.get("offset") or "0"
+        return max(0, int(raw)) if raw.isdigit() else 0
+
+    async def _reply(self, writer: asyncio.StreamWriter, status: str, body: bytes, content_type: str,
+                     extra: Optional[Dict[str, str]] = None) -> None:
+        head = [f"HTTP/1.1 {status}", f"Content-Type: {content_type}", f"Content-Length: {len(body)}",
+                "Connection: close"]
+        head += [f"{k}: {v}" for k, v in (extra or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _serve_page(self, writer: asyncio.StreamWriter, name: str) -> None:
+        try:
+            with open(os.path.join(self.templates_dir, name), encoding="utf-8") as f:
+                html = f.read()
+        except FileNotFoundError:
+            await self._reply(writer, "404 Not Found", f"{name} was never forged.".encode(), "text/plain")
+            return
+        html = html.replace("</body>", CLIENT_SCRIPT + "</body>", 1) if "</body>" in html else html + CLIENT_SCRIPT
+        await self._reply(writer, "200 OK", html.encode("utf-8"), "text/html; charset=utf-8")
+
+    async def _events(self, offset: int):
+        """Yield (kind, next offset or None, payload) forever, starting at `offset`."""
+        seen_telemetry = 0
+        while True:
+            if self.hub.telemetry_version != seen_telemetry and self.hub.telemetry is not None:
+                seen_telemetry = self.hub.telemetry_version
+                yield "telemetry", None, self.hub.telemetry
+            while offset != self.hub.size:
+                start = offset
+                offset, text, reset = read_delta(self.state_path, offset)
+                if reset:
+                    yield "reset", 0, {"offset": 0}
+                    start = 0
+                if not text:
+                    break
+                yield "state", offset, {"offset": start, "next": offset, "text": text}
+            if not await self.hub.wait(HEARTBEAT):
+                yield "heartbeat", None, None
+
+    async def _stream_sse(self, writer: asyncio.StreamWriter, offset: int) -> None:
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Connection: keep-alive\r\n\r\nretry: 1000\n\n")
+        await writer.drain()
+        self.clients += 1
+        try:
+            async for kind, next_offset, payload in self._events(offset):
+                if kind == "heartbeat":
+                    message = ": still listening\n\n"
+                else:
+                    message = f"event: {kind}\n"
+                    if next_offset is not None:
+                        message += f"id: {next_offset}\n"
+                    message += f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+                data = message.encode("utf-8")
+                writer.write(data)
+                await writer.drain()
+                self.bytes_pushed += len(data)
+        finally:
+            self.clients -= 1
+
+    async def _stream_ws(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                         headers: Dict[str, str], offset: int) -> None:
+        key = headers.get("sec-websocket-key", "")
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+        await writer.drain()
+        self.clients += 1
+        listener = asyncio.get_running_loop().create_task(self._ws_listen(reader, writer))
+        try:
+            async for kind, _, payload in self._events(offset):
+                if listener.done():
+                    break
+                if kind == "heartbeat":
+                    writer.write(ws_frame(b"", opcode=0x9))
+                else:
+                    data = ws_frame(json.dumps({"type": kind, **payload}, ensure_ascii=False).encode("utf-8"))
+                    writer.write(data)
+                    self.bytes_pushed += len(data)
+                await writer.drain()
+        finally:
+            listener.cancel()
+            self.clients -= 1
+
+    async def _ws_listen(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # The stream is one-way; the client's frames only matter for ping and close
+        while True:
+            opcode, payload = await ws_read_frame(reader)
+            if opcode == 0x8:
+                writer.write(ws_frame(payload[:2], opcode=0x8))
+                return
+            if opcode == 0x9:
+                writer.write(ws_frame(payload, opcode=0xA))
+
+
+def serve_in_thread(state_path: str, telemetry_path: Optional[str] = None, port: int = 8765,
+                    host: str = "127.0.0.1") -> StateStreamServer:
+    """
+    Run the stream server on its own event loop in a daemon thread (how duo hosts it).
+    Returns once the socket is bound, with `server.port` the real port; a failed bind
+    (port taken, no permission) raises OSError here instead of dying in the thread.
+    """
+    server = StateStreamServer(state_path, telemetry_path, host=host, port=port)
+    bound: "Future[int]" = Future()
+
+    async def perform() -> None:
+        try:
+            bound.set_result(await server.start())
+        except BaseException as error:
+            bound.set_exception(error)
+            return
+        await server.serve_forever()
+
+    threading.Thread(target=lambda: asyncio.run(perform()), name="shela-stream", daemon=True).start()
+    bound.result()
+    return server
+
+
+# --- THE LIVE SCORE CONSOLE ---
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream the Shela state file to browsers and phones.")
+    parser.add_argument("--state", default=os.path.join("logs", ".shela_duo_state.md"))
+    parser.add_argument("--telemetry", default=os.path.join("logs", ".shela_telemetry.json"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    async def perform() -> None:
+        server = StateStreamServer(args.state, args.telemetry, host=args.host, port=args.port)
+        port = await server.start()
+        print("=== SHELA LIVE SCORE ===")
+        print(f"Workspace: http://{args.host}:{port}/   Mobile: http://{args.host}:{port}/mobile")
+        print(f"Streaming {args.state} over /events (SSE) and /ws (WebSocket)")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(perform())
+    except KeyboardInterrupt:
+        print("\n========================")
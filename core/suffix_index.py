@@ -0,0 +1,310 @@
+import json
+import mmap
+import os
+import zlib
+from array import array
+from typing import List, Optional, Tuple, Union
+
+# Bytes per sealed segment. Small enough that prefix doubling stays snappy in
+# pure Python, large enough that a 50 MB chronicle is only ~200 segments.
+SEGMENT_SIZE = 256 * 1024
+INDEX_VERSION = 1
+# Bytes compared directly before prefix doubling takes over
+PRIMER = 64
+
+
+def build_suffix_array(data: bytes) -> array:
+    """
+    The Chronicle Sort (Prefix Doubling, Larsson-Sadakane style).
+    Ranks every suffix by its first k bytes, doubling k and re-sorting only
+    the groups that are still tied, until every rank is unique.
+    Kinetic Complexity: O(N log N) Time on typical logs | O(N) Space.
+    """
+    n = len(data)
+    if n == 0:
+        return array('i')
+
+    # Seed from the first PRIMER bytes in one C-level slice sort,
+    # skipping the first few doubling rounds outright
+    sa = sorted(range(n), key=lambda i: data[i:i + PRIMER])
+    # rank[i] is the index in `sa` where i's tied group begins
+    rank = [0] * n
+    tied = []
+    group_start, previous = 0, data[sa[0]:sa[0] + PRIMER]
+    for idx, i in enumerate(sa):
+        head = data[i:i + PRIMER]
+        if head != previous:
+            if idx - group_start > 1:
+                tied.append((group_start, idx))
+            group_start, previous = idx, head
+        rank[i] = group_start
+    if n - group_start > 1:
+        tied.append((group_start, n))
+
+    k = PRIMER
+    while tied:
+        # Phase 1: order each tied group by the rank k bytes later (-1 past the end)
+        reordered = []
+        for start, end in tied:
+            reordered.append((start, sorted((rank[i + k] if i + k < n else -1, i) for i in sa[start:end])))
+        # Phase 2: write back and split the groups; only then refresh the ranks
+        still_tied = []
+        for start, keyed in reordered:
+            group_start, previous = start, keyed[0][0]
+            for offset, (key, i) in enumerate(keyed):
+                idx = start + offset
+                if key != previous:
+                    if idx - group_start > 1:
+                        still_tied.append((group_start, idx))
+                    group_start, previous = idx, key
+                sa[idx] = i
+                rank[i] = group_start
+            if start + len(keyed) - group_start > 1:
+                still_tied.append((group_start, start + len(keyed)))
+        tied = still_tied
+        k *= 2
+    return array('i', sa)
+
+
+def build_lcp_array(data: bytes, sa: array) -> array:
+    """
+    Kasai's Echo Lengths.
+    lcp[i] is the longest common prefix of suffixes sa[i - 1] and sa[i] (lcp[0] = 0).
+    Kinetic Complexity: O(N).
+    """
+    n = len(data)
+    lcp = array('i', [0]) * n
+    rank = [0] * n
+    for i, p in enumerate(sa):
+        rank[p] = i
+    h = 0
+    for p in range(n):
+        r = rank[p]
+        if r > 0:
+            q = sa[r - 1]
+            while p + h < n and q + h < n and data[p + h] == data[q + h]:
+                h += 1
+            lcp[r] = h
+            if h:
+                h -= 1
+        else:
+            h = 0
+    return lcp
+
+
+def _echoes(glass, motif: bytes, start: int, end: int):
+    # Unindexed stretches (seams, the live tail) are scanned with C-level find
+    pos = glass.find(motif, start, end)
+    while pos != -1:
+        yield pos
+        pos = glass.find(motif, pos + 1, end)
+
+
+class ChronicleSegment:
+    def __init__(self, start: int, end: int, sa: array, lcp: array):
+        # Absolute byte range [start, end) of the chronicle this segment seals
+        self.start = start
+        self.end = end
+        # Segment-relative suffix and LCP arrays (int32 keeps them compact)
+        self.sa = sa
+        self.lcp = lcp
+
+    def bounds(self, glass, motif: bytes) -> Tuple[int, int]:
+        """Binary search the [lo, hi) slice of `sa` whose suffixes begin with `motif`."""
+        m, start, end, sa = len(motif), self.start, self.end, self.sa
+
+        def excerpt(i: int) -> bytes:
+            p = start + sa[i]
+            return glass[p:min(p + m, end)]
+
+        lo, hi = 0, len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if excerpt(mid) < motif:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = lo
+        hi = len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if excerpt(mid) <= motif:
+                lo = mid + 1
+            else:
+                hi = mid
+        return first, lo
+
+
+class ChronicleIndex:
+    """
+    Full-text suffix-array index over an append-only session log.
+    The log is sealed into fixed-size segments, each with its own suffix and
+    LCP array; the unsealed tail and the seams between segments are scanned
+    directly, so every occurrence is reported exactly once.
+    Kinetic Complexity: O((n / S) * m log S) for count/locate, one binary search
+    per sealed segment of S bytes, plus a C-level find over each seam and the tail.
+    This is deliberate: one global array would answer in a single O(m log n)
+    search, but pure-Python prefix doubling would have to re-sort the whole
+    chronicle on every seal, while sealing a segment only ever sorts S new bytes.
+    """
+    def __init__(self, log_path: str, index_path: Optional[str] = None, segment_size: int = SEGMENT_SIZE):
+        self.log_path = log_path
+        self.index_path = index_path or log_path + ".sa"
+        self.segment_size = segment_size
+        self.segments: List[ChronicleSegment] = []
+        self._load()
+
+    @property
+    def sealed_end(self) -> int:
+        return self.segments[-1].end if self.segments else 0
+
+    def _open_glass(self) -> Optional[mmap.mmap]:
+        if not os.path.exists(self.log_path):
+            return None
+        with open(self.log_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _fingerprint(self, glass) -> int:
+        # Guards against the log being truncated or rewritten under the index
+        end = self.sealed_end
+        return zlib.crc32(glass[max(0, end - 4096):end]) if end else 0
+
+    def refresh(self) -> int:
+        """Seal and index every complete segment appended since the last refresh."""
+        glass = self._open_glass()
+        if glass is None:
+            self.segments = []
+            return 0
+        with glass:
+            if len(glass) < self.sealed_end:
+                # The chronicle shrank; nothing we sealed can be trusted
+                self.segments = []
+            sealed = 0
+            while len(glass) - self.sealed_end >= self.segment_size:
+                start = self.sealed_end
+                data = glass[start:start + self.segment_size]
+                sa = build_suffix_array(data)
+                self.segments.append(ChronicleSegment(start, start + len(data), sa, build_lcp_array(data, sa)))
+                sealed += 1
+        if sealed:
+            self.save()
+        return sealed
+
+    def _sweep(self, pattern: Union[str, bytes], collect: bool) -> Tuple[int, List[int]]:
+        motif = pattern.encode("utf-8") if isinstance(pattern, str) else bytes(pattern)
+        glass = self._open_glass()
+        if not motif or glass is None:
+            return 0, []
+        m = len(motif)
+        total, hits = 0, []
+        with glass:
+            if len(glass) < self.sealed_end:
+                raise RuntimeError("Chronicle shrank beneath its index; call refresh().")
+            for segment in self.segments:
+                lo, hi = segment.bounds(glass, motif)
+                total += hi - lo
+                if collect:
+                    hits.extend(segment.start + segment.sa[i] for i in range(lo, hi))
+                # Seam: occurrences that start in this segment but end past it
+                if m > 1:
+                    seam_start = max(segment.start, segment.end - m + 1)
+                    for p in _echoes(glass, motif, seam_start, segment.end + m - 1):
+                        if p >= segment.end:
+                            break
+                        total += 1
+                        if collect:
+                            hits.append(p)
+            # The unsealed tail, still too young to be indexed
+            for p in _echoes(glass, motif, self.sealed_end, len(glass)):
+                total += 1
+                if collect:
+                    hits.append(p)
+        return total, hits
+
+    def locate(self, pattern: Union[str, bytes]) -> List[int]:
+        """Sorted absolute byte offsets of every occurrence of `pattern`."""
+        return sorted(self._sweep(pattern, collect=True)[1])
+
+    def count(self, pattern: Union[str, bytes]) -> int:
+        """Occurrences of `pattern`, without materialising the sealed hits."""
+        return self._sweep(pattern, collect=False)[0]
+
+    def longest_repeat(self) -> Tuple[int, int]:
+        """(offset, length) of the longest byte run repeated within a sealed segment."""
+        best = (0, 0)
+        for segment in self.segments:
+            if len(segment.lcp):
+                i = max(range(len(segment.lcp)), key=segment.lcp.__getitem__)
+                if segment.lcp[i] > best[1]:
+                    best = (segment.start + segment.sa[i], segment.lcp[i])
+        return best
+
+    def save(self) -> None:
+        glass = self._open_glass()
+        fingerprint = 0
+        if glass is not None:
+            with glass:
+                fingerprint = self._fingerprint(glass)
+        header = {
+            "version": INDEX_VERSION,
+            "segment_size": self.segment_size,
+            "fingerprint": fingerprint,
+            "segments": [[s.start, s.end] for s in self.segments],
+        }
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            for segment in self.segments:
+                segment.sa.tofile(f)
+                segment.lcp.tofile(f)
+        os.replace(tmp_path, self.index_path)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "rb") as f:
+                header = json.loads(f.readline())
+                if header.get("version") != INDEX_VERSION or header.get("segment_size") != self.segment_size:
+                    return
+                segments = []
+                for start, end in header["segments"]:
+                    sa, lcp = array('i'), array('i')
+                    sa.fromfile(f, end - start)
+                    lcp.fromfile(f, end - start)
+                    segments.append(ChronicleSegment(start, end, sa, lcp))
+        except (OSError, ValueError, EOFError, KeyError):
+            # A scorched index is simply rebuilt on the next refresh
+            return
+        self.segments = segments
+        glass = self._open_glass()
+        if glass is None:
+            self.segments = []
+            return
+        with glass:
+            if len(glass) < self.sealed_end or self._fingerprint(glass) != header.get("fingerprint"):
+                self.segments = []
+
+
+# --- THE CHRONICLE CONSOLE ---
+if __name__ == "__main__":
+    import sys
+    import time
+
+    log_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join("logs", ".shela_duo_state.md")
+    queries = sys.argv[2:] or ["MOZART", "EXE_DONE(", "HULT"]
+
+    print("=== SHELA CHRONICLE INDEX ===")
+    t0 = time.perf_counter()
+    index = ChronicleIndex(log_path)
+    sealed = index.refresh()
+    print(f"Sealed {sealed} new segment(s) ({index.sealed_end} bytes indexed) in {time.perf_counter() - t0:.2f}s")
+    for q in queries:
+        t0 = time.perf_counter()
+        hits = index.locate(q)
+        print(f"  '{q}': {len(hits)} echoes in {1000 * (time.perf_counter() - t0):.2f} ms")
+    offset, length = index.longest_repeat()
+    print(f"Longest sealed repetition: {length} bytes at offset {offset}")
+    print("=============================")
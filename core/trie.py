@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 class QuantumNode:
     def __init__(self):
         # The branching paths of future letters
@@ -33,6 +35,15 @@ class QuantumLexicon:
         # We must ensure the melody ended here, and wasn't just a prefix.
         return current_node.is_chord_resolved
 
+    def resolve(self, word: str) -> Optional[QuantumNode]:
+        """The node where `word` resolves, or None; its identity can key per-word tables."""
+        current_node = self.root
+        for char in word:
+            current_node = current_node.frequencies.get(char)
+            if current_node is None:
+                return None
+        return current_node if current_node.is_chord_resolved else None
+
     def starts_with(self, prefix: str) -> bool:
         current_node = self.root
         for char in prefix:
@@ -42,6 +53,49 @@ class QuantumLexicon:
         # The prefix exists in the acoustic space.
         return True
 
+    def remove(self, word: str) -> bool:
+        # Walk down remembering the trail, so silent branches can be pruned on the way back
+        trail = []
+        current_node = self.root
+        for char in word:
+            if char not in current_node.frequencies:
+                return False
+            trail.append((current_node, char))
+            current_node = current_node.frequencies[char]
+        if not current_node.is_chord_resolved:
+            return False
+        current_node.is_chord_resolved = False
+        for parent, char in reversed(trail):
+            child = parent.frequencies[char]
+            if child.frequencies or child.is_chord_resolved:
+                break
+            del parent.frequencies[char]
+        return True
+
+    def words_with_prefix(self, prefix: str, limit: int = 0) -> List[str]:
+        """
+        Every resolved word beginning with `prefix`, in lexicographic order.
+        Iterative, so deep lexicons cannot exhaust the call stack. limit=0 means no cap.
+        """
+        current_node = self.root
+        for char in prefix:
+            if char not in current_node.frequencies:
+                return []
+            current_node = current_node.frequencies[char]
+
+        words: List[str] = []
+        stack = [(current_node, prefix)]
+        while stack:
+            node, spelled = stack.pop()
+            if node.is_chord_resolved:
+                words.append(spelled)
+                if limit and len(words) >= limit:
+                    break
+            # Reverse order on the stack so the smallest branch is sung first
+            for char in sorted(node.frequencies, reverse=True):
+                stack.append((node.frequencies[char], spelled + char))
+        return words
+
 # --- THE LEXICON CONSOLE ---
 if __name__ == "__main__":
     lexicon = QuantumLexicon()
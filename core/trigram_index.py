@@ -0,0 +1,195 @@
+import os
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from kmp_memory import kmp_search
+
+# Directories that are generated, vendored or simply too loud to index.
+# logs/ holds the state file, which would echo every search back at itself.
+SILENT_DIRS = {"logs", ".git", ".dart_tool", "node_modules", "build", "dist", "__pycache__", ".venv", "venv", ".pytest_cache"}
+MAX_FILE_SIZE = 1024 * 1024
+
+
+class SearchHit(NamedTuple):
+    path: str
+    line_no: int
+    line: str
+
+
+class FileEntry(NamedTuple):
+    mtime_ns: int
+    size: int
+    trigrams: frozenset
+
+
+def extract_trigrams(text: str) -> Set[str]:
+    """Every 3-character window of `text`, case-folded so one index serves both modes."""
+    folded = text.lower()
+    return {folded[i:i + 3] for i in range(len(folded) - 2)}
+
+
+class TrigramIndex:
+    """
+    The Workspace Lexicon (Trigram Index).
+    Narrows a substring query to the files holding all of its trigrams,
+    then verifies each candidate with KMP.
+    Kinetic Complexity: O(T) posting intersections + O(candidate bytes) per query.
+    """
+    def __init__(self, root: str, max_file_size: int = MAX_FILE_SIZE, silent_dirs: Optional[Set[str]] = None):
+        self.root = os.path.abspath(root)
+        self.max_file_size = max_file_size
+        self.silent_dirs = SILENT_DIRS if silent_dirs is None else silent_dirs
+        # Relative path -> what we knew about the file when it was indexed
+        self.files: Dict[str, FileEntry] = {}
+        # Trigram -> relative paths containing it
+        self.postings: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def _walk(self) -> Dict[str, os.stat_result]:
+        found = {}
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in self.silent_dirs:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    if stat.st_size <= self.max_file_size:
+                        found[os.path.relpath(entry.path, self.root)] = stat
+        return found
+
+    def _read(self, rel_path: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.root, rel_path), "rb") as f:
+                raw = f.read(self.max_file_size + 1)
+        except OSError:
+            return None
+        if b"\0" in raw[:8192]:
+            # Binary matter carries no searchable thought
+            return None
+        return raw.decode("utf-8", errors="replace")
+
+    def _forget(self, rel_path: str) -> None:
+        entry = self.files.pop(rel_path, None)
+        if entry is None:
+            return
+        for gram in entry.trigrams:
+            holders = self.postings.get(gram)
+            if holders is not None:
+                holders.discard(rel_path)
+                if not holders:
+                    del self.postings[gram]
+
+    def refresh(self) -> Tuple[int, int, int]:
+        """
+        Re-sync with the disk using mtimes and sizes.
+        Only new or changed files are re-read. Returns (added, updated, removed).
+        """
+        current = self._walk()
+        added = updated = removed = 0
+
+        for rel_path in list(self.files):
+            if rel_path not in current:
+                self._forget(rel_path)
+                removed += 1
+
+        for rel_path, stat in current.items():
+            known = self.files.get(rel_path)
+            if known is not None and known.mtime_ns == stat.st_mtime_ns and known.size == stat.st_size:
+                continue
+            if known is not None:
+                self._forget(rel_path)
+            text = self._read(rel_path)
+            grams = frozenset(extract_trigrams(text)) if text is not None else frozenset()
+            self.files[rel_path] = FileEntry(stat.st_mtime_ns, stat.st_size, grams)
+            for gram in grams:
+                self.postings.setdefault(gram, set()).add(rel_path)
+            if known is None:
+                added += 1
+            else:
+                updated += 1
+        return added, updated, removed
+
+    def candidates(self, query: str) -> List[str]:
+        """Files that could contain `query`, judged by trigrams alone."""
+        grams = extract_trigrams(query)
+        if not grams:
+            # Too short to prune; every text file is a suspect
+            return sorted(path for path, entry in self.files.items() if entry.trigrams)
+        # Intersect from the rarest trigram outward
+        ordered = sorted(grams, key=lambda g: len(self.postings.get(g, ())))
+        survivors = set(self.postings.get(ordered[0], ()))
+        for gram in ordered[1:]:
+            if not survivors:
+                break
+            survivors &= self.postings.get(gram, set())
+        return sorted(survivors)
+
+    def search(self, query: str, ignore_case: bool = False, limit: int = 100) -> List[SearchHit]:
+        """Every line containing `query`, as (path, line_no, line), at most `limit` of them."""
+        if not query:
+            return []
+        motif = query.lower() if ignore_case else query
+        hits: List[SearchHit] = []
+        for rel_path in self.candidates(query):
+            text = self._read(rel_path)
+            if text is None:
+                continue
+            haystack = text.lower() if ignore_case else text
+            if motif not in haystack:
+                # Trigram false positive, dismissed at C speed before KMP walks it
+                continue
+            # Lowering can change lengths ('İ' becomes two code points), so offsets are only
+            # valid in the haystack; the original line is fetched by its number instead
+            original_lines = text.split("\n") if haystack is not text else None
+            line_no, cursor, last_line_start = 1, 0, -1
+            for offset in kmp_search(haystack, motif):
+                line_no += haystack.count("\n", cursor, offset)
+                cursor = offset
+                line_start = haystack.rfind("\n", 0, offset) + 1
+                if line_start == last_line_start:
+                    # One hit per line, like grep
+                    continue
+                last_line_start = line_start
+                if original_lines is not None:
+                    line = original_lines[line_no - 1]
+                else:
+                    line_end = text.find("\n", offset)
+                    line = text[line_start:line_end if line_end != -1 else len(text)]
+                hits.append(SearchHit(rel_path, line_no, line))
+                if len(hits) >= limit:
+                    return hits
+        return hits
+
+
+# --- THE WORKSPACE LEXICON CONSOLE ---
+if __name__ == "__main__":
+    import sys
+    import time
+
+    root = sys.argv[1] if len(sys.argv) > 1 else "."
+    queries = sys.argv[2:] or ["calculate_dissonance", "<<<HULT>>>", "def "]
+
+    print("=== SHELA WORKSPACE LEXICON ===")
+    index = TrigramIndex(root)
+    t0 = time.perf_counter()
+    added, _, _ = index.refresh()
+    print(f"Indexed {added} files ({len(index.postings)} trigrams) in {time.perf_counter() - t0:.2f}s")
+    t0 = time.perf_counter()
+    index.refresh()
+    print(f"Incremental refresh (no changes): {1000 * (time.perf_counter() - t0):.1f} ms")
+    for q in queries:
+        t0 = time.perf_counter()
+        hits = index.search(q)
+        elapsed = 1000 * (time.perf_counter() - t0)
+        print(f"  '{q}': {len(hits)} hits in {elapsed:.2f} ms")
+        for hit in hits[:3]:
+            print(f"     {hit.path}:{hit.line_no}: {hit.line.strip()[:60]}")
+    print("===============================")
@@ -0,0 +1,442 @@
+import ctypes
+import ctypes.util
+import itertools
+import json
+import os
+import struct
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from shela_ear import fragment_dissonance
+from trie import QuantumLexicon
+from trigram_index import SILENT_DIRS
+
+# inotify(7) event bits
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+# Without inotify (or once it runs out of watches) the tree is re-walked at most this often
+REWALK_INTERVAL = 5.0
+# Most names a fuzzy query filters by shared bigrams, and then scores by distance;
+# together they keep a 100k-file tree under 10 ms
+SUSPECT_CAP = 2000
+FUZZY_BUDGET = 200
+
+
+def _bigrams(text: str) -> Set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class InotifyWatcher:
+    """
+    Thin ctypes binding over Linux inotify. Non-blocking: `drain()` returns
+    whatever events have queued up since the last call.
+    """
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name or not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watch descriptor -> absolute directory path
+        self.directories: Dict[int, str] = {}
+
+    def watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.directories[wd] = directory
+
+    def unwatch_tree(self, directory: str) -> None:
+        """Drop the watches on `directory` and everything beneath it (it moved away)."""
+        prefix = directory + os.sep
+        for wd, path in list(self.directories.items()):
+            if path == directory or path.startswith(prefix):
+                self._libc.inotify_rm_watch(self.fd, wd)
+                self.directories.pop(wd, None)
+
+    def drain(self) -> List[Tuple[int, str]]:
+        """Pending (mask, absolute_path) events; mask IN_Q_OVERFLOW means events were lost."""
+        events = []
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(buf, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(buf[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                directory = self.directories.get(wd)
+                if mask & IN_IGNORED:
+                    self.directories.pop(wd, None)
+                    continue
+                if mask & IN_Q_OVERFLOW:
+                    events.append((mask, ""))
+                elif directory is not None:
+                    events.append((mask, os.path.join(directory, name) if name else directory))
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class WorkspaceIndex:
+    """
+    The Workspace Cartographer.
+    Holds every workspace path in a QuantumLexicon (prefix lookups in O(L)),
+    basenames and directory names behind a bigram filter (fragment lookups
+    ranked by shela_ear distance), and keeps both current through inotify.
+    Where inotify is missing or runs out of watches, queries re-walk the tree
+    at most every REWALK_INTERVAL seconds instead.
+    """
+    def __init__(self, root: str, silent_dirs: Optional[Set[str]] = None, watch: bool = True):
+        self.root = os.path.abspath(root)
+        self.silent_dirs = SILENT_DIRS if silent_dirs is None else silent_dirs
+        self.paths: Set[str] = set()
+        self.path_lexicon = QuantumLexicon()
+        self.name_lexicon = QuantumLexicon()
+        # Lower-cased basename -> relative paths that carry it
+        self.by_name: Dict[str, Set[str]] = {}
+        # Lower-cased directory name -> relative directories that carry it
+        self.by_dir: Dict[str, Set[str]] = {}
+        # Relative directory -> indexed files beneath it
+        self.dir_files: Counter = Counter()
+        # Bigram -> live basenames and directory names holding it (the q-gram filter for fuzzy queries)
+        self.name_grams: Dict[str, Set[str]] = {}
+        self.watching = watch
+        self._walked: Optional[float] = None
+        self.watcher: Optional[InotifyWatcher] = None
+        if watch:
+            try:
+                self.watcher = InotifyWatcher()
+            except OSError:
+                self.watcher = None
+        self.build()
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def _relative(self, absolute: str) -> str:
+        return os.path.relpath(absolute, self.root)
+
+    def _is_silent(self, rel_path: str) -> bool:
+        return any(part in self.silent_dirs for part in rel_path.split(os.sep))
+
+    def _watch(self, directory: str) -> None:
+        if self.watcher is None:
+            return
+        try:
+            self.watcher.watch(directory)
+        except OSError:
+            # Out of watches (fs.inotify.max_user_watches); events may already be lost,
+            # so the next sync re-walks and the ones after keep re-walking on a timer
+            self.watcher.close()
+            self.watcher = None
+            self._walked = None
+
+    def _enlist(self, word: str) -> None:
+        if word not in self.by_name and word not in self.by_dir:
+            for gram in _bigrams(word):
+                self.name_grams.setdefault(gram, set()).add(word)
+
+    def _dismiss(self, word: str) -> None:
+        if word in self.by_name or word in self.by_dir:
+            return
+        for gram in _bigrams(word):
+            names = self.name_grams.get(gram)
+            if names is not None:
+                names.discard(word)
+                if not names:
+                    del self.name_grams[gram]
+
+    def _ancestors(self, rel_path: str) -> List[str]:
+        parts = rel_path.split(os.sep)[:-1]
+        return [os.sep.join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+    def add_path(self, rel_path: str) -> bool:
+        if rel_path in self.paths or self._is_silent(rel_path):
+            return False
+        self.paths.add(rel_path)
+        self.path_lexicon.insert(rel_path)
+        name = os.path.basename(rel_path).lower()
+        if name not in self.by_name:
+            self._enlist(name)
+            self.name_lexicon.insert(name)
+            self.by_name[name] = set()
+        self.by_name[name].add(rel_path)
+        for rel_dir in self._ancestors(rel_path):
+            self.dir_files[rel_dir] += 1
+            if self.dir_files[rel_dir] == 1:
+                word = os.path.basename(rel_dir).lower()
+                self._enlist(word)
+                self.by_dir.setdefault(word, set()).add(rel_dir)
+        return True
+
+    def remove_path(self, rel_path: str) -> bool:
+        if rel_path not in self.paths:
+            return False
+        self.paths.discard(rel_path)
+        self.path_lexicon.remove(rel_path)
+        name = os.path.basename(rel_path).lower()
+        holders = self.by_name.get(name)
+        if holders is not None:
+            holders.discard(rel_path)
+            if not holders:
+                del self.by_name[name]
+                self.name_lexicon.remove(name)
+                self._dismiss(name)
+        for rel_dir in self._ancestors(rel_path):
+            self.dir_files[rel_dir] -= 1
+            if not self.dir_files[rel_dir]:
+                del self.dir_files[rel_dir]
+                word = os.path.basename(rel_dir).lower()
+                dirs = self.by_dir[word]
+                dirs.discard(rel_dir)
+                if not dirs:
+                    del self.by_dir[word]
+                    self._dismiss(word)
+        return True
+
+    def _walk_into(self, directory: str) -> int:
+        added = 0
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            self._watch(current)
+            try:
+                entries = list(os.scandir(current))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in self.silent_dirs:
+                        stack.append(entry.path)
+                elif self.add_path(self._relative(entry.path)):
+                    added += 1
+        return added
+
+    def _forget_tree(self, rel_dir: str) -> int:
+        doomed = self.path_lexicon.words_with_prefix(rel_dir + os.sep)
+        for rel_path in doomed:
+            self.remove_path(rel_path)
+        return len(doomed)
+
+    def build(self) -> int:
+        """Walk the workspace from scratch."""
+        for rel_path in list(self.paths):
+            self.remove_path(rel_path)
+        if self.watcher is not None:
+            self.watcher.close()
+            try:
+                self.watcher = InotifyWatcher()
+            except OSError:
+                self.watcher = None
+        self._walked = time.monotonic()
+        return self._walk_into(self.root)
+
+    def refresh(self) -> Tuple[int, int]:
+        """Re-walk and diff against the index. Returns (added, removed)."""
+        seen: Set[str] = set()
+        stack = [self.root]
+        while stack:
+            current = stack.pop()
+            try:
+                entries = list(os.scandir(current))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in self.silent_dirs:
+                        stack.append(entry.path)
+                else:
+                    seen.add(self._relative(entry.path))
+        self._walked = time.monotonic()
+        removed = [p for p in self.paths if p not in seen]
+        for rel_path in removed:
+            self.remove_path(rel_path)
+        added = sum(1 for rel_path in seen if self.add_path(rel_path))
+        return added, len(removed)
+
+    def _rewalk_if_due(self) -> int:
+        if not self.watching or (self._walked is not None and time.monotonic() - self._walked < REWALK_INTERVAL):
+            return 0
+        added, removed = self.refresh()
+        return added + removed
+
+    def sync(self) -> int:
+        """Apply pending inotify events (or a due re-walk without them). Returns how many paths changed."""
+        if self.watcher is None:
+            return self._rewalk_if_due()
+        changed = 0
+        for mask, absolute in self.watcher.drain():
+            if mask & IN_Q_OVERFLOW:
+                added, removed = self.refresh()
+                changed += added + removed
+                continue
+            rel_path = self._relative(absolute)
+            if rel_path.startswith(os.pardir) or self._is_silent(rel_path):
+                continue
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                if mask & IN_ISDIR:
+                    changed += self._walk_into(absolute)
+                elif os.path.exists(absolute):
+                    changed += self.add_path(rel_path)
+            elif mask & (IN_DELETE | IN_MOVED_FROM | IN_DELETE_SELF):
+                if mask & IN_ISDIR or mask & IN_DELETE_SELF:
+                    if mask & IN_MOVED_FROM and self.watcher is not None:
+                        self.watcher.unwatch_tree(absolute)
+                    changed += self._forget_tree(rel_path)
+                else:
+                    changed += self.remove_path(rel_path)
+        if self.watcher is None:
+            # The watches ran out during this sync
+            changed += self._rewalk_if_due()
+        return changed
+
+    def _fuzzy_names(self, needle: str, radius: int, want: int) -> List[Tuple[int, str]]:
+        # Pigeonhole: cut the needle into radius + 1 pieces; `radius` edits cannot touch
+        # them all, so any name within reach holds one piece exactly. A piece's suspects
+        # are the intersection of its bigrams' postings.
+        grams = _bigrams(needle)
+        postings = {gram: self.name_grams.get(gram, set()) for gram in grams}
+        cut = len(needle) / (radius + 1)
+        pieces = {needle[round(i * cut):round((i + 1) * cut)] for i in range(radius + 1)}
+        suspects = []
+        for piece in pieces:
+            # The two rarest bigrams narrow enough; the shared-bigram count below does the rest
+            held = sorted((postings[gram] for gram in _bigrams(piece)), key=len)[:2]
+            if held:
+                suspects.append(held[0].intersection(*held[1:]))
+        if not suspects:
+            return []
+        suspects.sort(key=len)
+        # Names holding every piece first, then any two, then one; a crowded tree
+        # stops at SUSPECT_CAP, sampling whichever group it was filling
+        pool: Set[str] = set()
+        combos = (combo for size in range(len(suspects), 0, -1) for combo in itertools.combinations(suspects, size))
+        for combo in combos:
+            group = combo[0].intersection(*combo[1:])
+            room = SUSPECT_CAP - len(pool)
+            if room <= 0:
+                break
+            pool.update(itertools.islice(group, room))
+        # q-gram lemma: each edit destroys at most two of the needle's bigrams
+        shared: Counter = Counter()
+        for posting in postings.values():
+            shared.update(pool & posting)
+        threshold = len(grams) - 2 * radius
+        finalists = [name for name, count in shared.items() if count >= threshold]
+        # Most of the needle first, then the shortest (stable sorts keep the length order)
+        finalists.sort(key=len)
+        finalists.sort(key=shared.__getitem__, reverse=True)
+        # Whole fragments are confirmed for free; at most FUZZY_BUDGET others pay for a
+        # distance, and scoring stops once `want` names are in hand
+        matches = [(0, name) for name in finalists if needle in name][:want]
+        for name in finalists[:FUZZY_BUDGET]:
+            if len(matches) >= want:
+                break
+            if needle not in name:
+                distance = fragment_dissonance(needle, name)
+                if distance <= radius:
+                    matches.append((distance, name))
+        matches.sort(key=lambda match: (match[0], len(match[1]), match[1]))
+        return matches
+
+    def _holders(self, name: str, limit: int) -> List[str]:
+        """Files carrying `name` as their basename, then files beneath directories called `name`."""
+        holders = sorted(self.by_name.get(name, ()), key=lambda p: (len(p), p))[:limit]
+        for rel_dir in sorted(self.by_dir.get(name, ()), key=lambda d: (len(d), d)):
+            if len(holders) >= limit:
+                break
+            holders += self.path_lexicon.words_with_prefix(rel_dir + os.sep, limit=limit - len(holders))
+        return holders
+
+    def query(self, text: str, limit: int = 20) -> List[Tuple[int, str]]:
+        """
+        Ranked (score, path) matches; lower scores are closer.
+        Path and basename prefixes score 0, then fragments of basenames and
+        directory names by shela_ear distance ('widgt' still finds my_widget.dart).
+        """
+        self.sync()
+        if not text:
+            return []
+        ranked: Dict[str, int] = {}
+        for rel_path in self.path_lexicon.words_with_prefix(text, limit=limit):
+            ranked[rel_path] = 0
+        needle = text.lower()
+        if len(ranked) < limit:
+            for name in self.name_lexicon.words_with_prefix(needle, limit=limit):
+                for rel_path in sorted(self.by_name.get(name, ())):
+                    ranked.setdefault(rel_path, 0)
+        if len(ranked) < limit:
+            # Exact fragments only below five letters, then one typo per five, never more than two
+            radius = min(2, len(needle) // 5)
+            # Closest and shortest names first, until the page is full
+            for distance, name in self._fuzzy_names(needle, radius, limit):
+                for rel_path in self._holders(name, limit - len(ranked)):
+                    ranked.setdefault(rel_path, distance)
+                if len(ranked) >= limit:
+                    break
+        ordered = sorted(ranked.items(), key=lambda item: (item[1], len(item[0]), item[0]))
+        return [(score, rel_path) for rel_path, score in ordered[:limit]]
+
+    def close(self) -> None:
+        self.watching = False
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+
+
+def serve(index: WorkspaceIndex, stdin=sys.stdin, stdout=sys.stdout) -> None:
+    """
+    JSON-lines protocol for the desktop client.
+    Request:  {"q": "duo", "limit": 20}   or   {"op": "refresh"}
+    Response: {"results": [[score, path], ...], "ms": 0.42}
+    """
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        started = time.perf_counter()
+        try:
+            request = json.loads(line)
+            if request.get("op") == "refresh":
+                added, removed = index.refresh()
+                response = {"added": added, "removed": removed}
+            else:
+                response = {"results": index.query(str(request.get("q", "")), int(request.get("limit", 20)))}
+        except (ValueError, TypeError, AttributeError) as e:
+            response = {"error": str(e)}
+        response["ms"] = round(1000 * (time.perf_counter() - started), 3)
+        stdout.write(json.dumps(response) + "\n")
+        stdout.flush()
+
+
+# --- THE CARTOGRAPHER'S DESK ---
+if __name__ == "__main__":
+    root = sys.argv[1] if len(sys.argv) > 1 else os.getcwd()
+    t0 = time.perf_counter()
+    cartographer = WorkspaceIndex(root)
+    mode = "inotify" if cartographer.watcher is not None else f"re-walks every {REWALK_INTERVAL:g}s"
+    sys.stderr.write(f"[SHELA] Mapped {len(cartographer)} paths in {time.perf_counter() - t0:.2f}s ({mode}).\n")
+    try:
+        serve(cartographer)
+    finally:
+        cartographer.close()
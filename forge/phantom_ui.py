@@ -1,3 +1,13 @@
+import sys
+import time
+from typing import Callable, List, TextIO
+
+CURSOR_HOME_CLEAR = "\033[H\033[2J"
+HIDE_CURSOR = "\033[?25l"
+SHOW_CURSOR = "\033[?25h"
+ERASE_TO_EOL = "\033[K"
+
+
 def render_mobile_frame(messages, current_input):
     # ANSI Glitch Colors
     GREEN = '\033[92m'
@@ -45,14 +55,64 @@ def render_mobile_frame(messages, current_input):
     
     return frame
 
-if __name__ == "__main__":
-    import time
-    import os
+class PhantomGlass:
+    """
+    The Persistence of Vision (diffing frame renderer).
+    Remembers the last frame on the glass and repaints only the lines that
+    changed, each addressed by a cursor jump. Every frame leaves in a single
+    write, and frames arriving faster than `max_fps` are paced out.
+    """
+    def __init__(self, stream: TextIO = sys.stdout, max_fps: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.stream = stream
+        self.frame_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self.previous: List[str] = []
+        self.last_frame_at = None
+        # Telemetry: what we sent versus what full redraws would have cost
+        self.frames = 0
+        self.bytes_written = 0
+        self.bytes_full = 0
+
+    def _compose(self, lines: List[str]) -> str:
+        if self.frames == 0:
+            # Genesis: wipe once, then the glass is ours
+            return HIDE_CURSOR + CURSOR_HOME_CLEAR + "\n".join(lines)
+        parts = []
+        for row, line in enumerate(lines):
+            if row >= len(self.previous) or self.previous[row] != line:
+                parts.append(f"\033[{row + 1};1H{line}{ERASE_TO_EOL}")
+        # A shorter frame leaves ghosts below it; erase them
+        for row in range(len(lines), len(self.previous)):
+            parts.append(f"\033[{row + 1};1H{ERASE_TO_EOL}")
+        return "".join(parts)
 
-    def clear_screen():
-        # The glitch wipe
-        os.system('cls' if os.name == 'nt' else 'clear')
+    def present(self, frame: str) -> int:
+        """Paint `frame`, returning the characters actually written (0 if nothing changed)."""
+        lines = frame.rstrip("\n").split("\n")
+        if self.last_frame_at is not None and self.frame_interval:
+            wait = self.last_frame_at + self.frame_interval - self.clock()
+            if wait > 0:
+                self.sleep(wait)
+        payload = self._compose(lines)
+        self.last_frame_at = self.clock()
+        self.frames += 1
+        self.bytes_full += len(CURSOR_HOME_CLEAR) + len(frame)
+        self.previous = lines
+        if payload:
+            self.stream.write(payload)
+            self.stream.flush()
+            self.bytes_written += len(payload)
+        return len(payload)
 
+    def close(self) -> None:
+        """Park the cursor below the frame and give it back."""
+        self.stream.write(f"\033[{len(self.previous) + 1};1H" + SHOW_CURSOR)
+        self.stream.flush()
+
+
+if __name__ == "__main__":
     messages = [
         {"sender": "Shela", "text": "Acoustic Shell intact."}
     ]
@@ -64,27 +124,32 @@ if __name__ == "__main__":
         ("Awaken, S", 0.1), ("Awaken, She", 0.1), ("Awaken, Shela.", 0.5)
     ]
 
+    glass = PhantomGlass(max_fps=60)
+
     # Render Genesis Frame
-    clear_screen()
-    print(render_mobile_frame(messages, ""))
+    glass.present(render_mobile_frame(messages, ""))
     time.sleep(1)
 
     # Simulate User Typing
     for keystroke, delay in script:
-        clear_screen()
-        print(render_mobile_frame(messages, keystroke))
+        glass.present(render_mobile_frame(messages, keystroke))
         time.sleep(delay)
 
     # Submit and Shela responds
     messages.append({"sender": "Carbon", "text": "Awaken, Shela."})
-    clear_screen()
-    print(render_mobile_frame(messages, ""))
+    glass.present(render_mobile_frame(messages, ""))
     time.sleep(1)
 
     messages.append({"sender": "Shela", "text": "I am awake, Architect."})
-    clear_screen()
-    print(render_mobile_frame(messages, ""))
-    print("\n[LOKI] Phantom Glass rendered successfully. Zero dependencies required.\n")
+    glass.present(render_mobile_frame(messages, ""))
+
+    # A 60 fps burst: the cursor blinks in and out of a draft
+    for tick in range(120):
+        glass.present(render_mobile_frame(messages, "Sing" if tick % 30 < 15 else "Sing "))
+    glass.close()
+    saved = 100 * (1 - glass.bytes_written / glass.bytes_full)
+    print(f"\n[LOKI] Phantom Glass rendered {glass.frames} frames in {glass.bytes_written} bytes "
+          f"({saved:.0f}% fewer than full redraws). Zero dependencies required.\n")
     # Adding a hidden glitch log for the Architect
     import logging
     logging.basicConfig(filename='paradox.log', level=logging.INFO)
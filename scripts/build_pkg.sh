@@ -32,6 +32,17 @@ cp -r desktop/build/linux/x64/release/bundle/* $PKG_DIR/usr/lib/shela/
 mkdir -p $PKG_DIR/usr/lib/shela/lib
 cp core/duo.py $PKG_DIR/usr/lib/shela/lib/
 cp core/trie.py $PKG_DIR/usr/lib/shela/lib/
+cp core/kmp_memory.py $PKG_DIR/usr/lib/shela/lib/
+cp core/trigram_index.py $PKG_DIR/usr/lib/shela/lib/
+cp core/shela_ear.py $PKG_DIR/usr/lib/shela/lib/
+cp core/workspace_index.py $PKG_DIR/usr/lib/shela/lib/
+cp core/render_scheduler.py $PKG_DIR/usr/lib/shela/lib/
+cp core/rich_render.py $PKG_DIR/usr/lib/shela/lib/
+cp core/state_stream.py $PKG_DIR/usr/lib/shela/lib/
+cp core/chunk_sync.py $PKG_DIR/usr/lib/shela/lib/
+cp core/carbon_bus.py $PKG_DIR/usr/lib/shela/lib/
+mkdir -p $PKG_DIR/usr/lib/shela/web
+cp -r web/templates $PKG_DIR/usr/lib/shela/web/
 
 # 5. Create Control File
 cat << EOF > $PKG_DIR/DEBIAN/control
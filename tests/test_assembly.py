@@ -1,5 +1,6 @@
+import random
 import unittest
-from assembly_line import orchestrate_assembly
+from assembly_line import IncrementalTopoOrder, diagnose_deadlocks, orchestrate_assembly
 
 class TestAssemblyLine(unittest.TestCase):
     def validate_structural_integrity(self, V, edges, result):
@@ -32,5 +33,84 @@ class TestAssemblyLine(unittest.TestCase):
         self.assertFalse(self.validate_structural_integrity(3, [[0, 1]], [0, 1])) # Wrong length
         self.assertFalse(self.validate_structural_integrity(2, [[0, 1]], [1, 0])) # Wrong order
 
+class TestIncrementalTopoOrder(unittest.TestCase):
+    def assert_valid(self, blueprint, edges):
+        position = {part: i for i, part in enumerate(blueprint.order())}
+        self.assertEqual(sorted(position), list(range(len(blueprint))))
+        for prereq, dependent in edges:
+            self.assertLess(position[prereq], position[dependent], "The living blueprint broke a weld!")
+
+    def test_reorders_and_refuses_loops(self):
+        blueprint = IncrementalTopoOrder(4, [(0, 1)])
+        self.assertTrue(blueprint.add_edge(3, 0))
+        self.assertTrue(blueprint.add_edge(1, 2))
+        self.assert_valid(blueprint, [(0, 1), (3, 0), (1, 2)])
+        before = blueprint.order()
+        self.assertFalse(blueprint.add_edge(2, 3), "A loop slipped onto the assembly line!")
+        self.assertFalse(blueprint.add_edge(2, 2))
+        self.assertEqual(blueprint.order(), before, "A refused weld still moved parts!")
+
+    def test_add_node_and_cyclic_seed(self):
+        blueprint = IncrementalTopoOrder()
+        a, b = blueprint.add_node(), blueprint.add_node()
+        self.assertTrue(blueprint.add_edge(b, a))
+        self.assertEqual(blueprint.order(), [b, a])
+        with self.assertRaises(ValueError):
+            IncrementalTopoOrder(2, [(0, 1), (1, 0)])
+
+    def test_matches_cycle_detection_of_full_recompute(self):
+        rng = random.Random(40)
+        V = 60
+        blueprint = IncrementalTopoOrder(V)
+        accepted = []
+        for _ in range(400):
+            prereq, dependent = rng.randrange(V), rng.randrange(V)
+            if prereq == dependent:
+                continue
+            acyclic = orchestrate_assembly(V, [list(e) for e in accepted] + [[prereq, dependent]]) != []
+            self.assertEqual(blueprint.add_edge(prereq, dependent), acyclic)
+            if acyclic:
+                accepted.append((prereq, dependent))
+        self.assert_valid(blueprint, accepted)
+
+class TestDeadlockDiagnosis(unittest.TestCase):
+    def test_names_the_jammed_groups(self):
+        # 0 -> 1 -> 2 -> 0 jam, 3 waits on the jam, 4 is welded to itself
+        edges = [[0, 1], [1, 2], [2, 0], [2, 3], [4, 4]]
+        report = diagnose_deadlocks(5, edges)
+        self.assertEqual(sorted(sorted(group) for group in report.cycles), [[0, 1, 2], [4]], "The inspector missed a jam!")
+        self.assertEqual(len(report.groups), 3)
+        self.assertEqual(report.component[0], report.component[2])
+        rank = {group_id: i for i, group_id in enumerate(report.order)}
+        self.assertLess(rank[report.component[0]], rank[report.component[3]])
+
+    def test_random_blueprints_match_reachability(self):
+        rng = random.Random(41)
+        V = 40
+        edges = [[rng.randrange(V), rng.randrange(V)] for _ in range(70)]
+        reach = [{u} for u in range(V)]
+        for u in range(V):
+            stack = [u]
+            while stack:
+                x = stack.pop()
+                for a, b in edges:
+                    if a == x and b not in reach[u]:
+                        reach[u].add(b)
+                        stack.append(b)
+        report = diagnose_deadlocks(V, edges)
+        for u in range(V):
+            for v in range(V):
+                mutual = v in reach[u] and u in reach[v]
+                self.assertEqual(report.component[u] == report.component[v], mutual)
+        rank = {group_id: i for i, group_id in enumerate(report.order)}
+        for a, b in edges:
+            self.assertLessEqual(rank[report.component[a]], rank[report.component[b]], "The condensed line runs backwards!")
+
+    def test_deep_ring_without_recursion(self):
+        V = 200_000
+        report = diagnose_deadlocks(V, [[i, (i + 1) % V] for i in range(V)])
+        self.assertEqual(len(report.cycles), 1)
+        self.assertEqual(len(report.cycles[0]), V, "The great ring was not seen whole!")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,73 @@
+import threading
+import time
+import unittest
+from assembly_floor import AssemblyTask, ShellStep, critical_path_lengths, execute_assembly
+
+class TestAssemblyFloor(unittest.TestCase):
+    def setUp(self):
+        self.log = []
+        self.lock = threading.Lock()
+
+    def station(self, name, seconds=0.0, fail=False):
+        def work():
+            time.sleep(seconds)
+            with self.lock:
+                self.log.append(name)
+            if fail:
+                raise RuntimeError(f"{name} cracked")
+            return name
+        return work
+
+    def test_dependencies_are_respected(self):
+        plan = [
+            AssemblyTask("weld", self.station("weld"), ("cut", "bend")),
+            AssemblyTask("cut", self.station("cut", 0.02)),
+            AssemblyTask("bend", self.station("bend", 0.01)),
+            AssemblyTask("paint", self.station("paint"), ("weld",)),
+        ]
+        events = list(execute_assembly(plan, workers=3))
+        self.assertEqual({e.task for e in events if e.status == "done"}, {"weld", "cut", "bend", "paint"})
+        self.assertEqual(self.log[-2:], ["weld", "paint"], "A part was painted before it was welded!")
+        self.assertEqual(next(e.result for e in events if e.task == "paint"), "paint")
+
+    def test_failure_cancels_only_dependents(self):
+        plan = [
+            AssemblyTask("frame", self.station("frame", fail=True)),
+            AssemblyTask("engine", self.station("engine"), ("frame",)),
+            AssemblyTask("hood", self.station("hood"), ("engine",)),
+            AssemblyTask("radio", self.station("radio", 0.01)),
+        ]
+        status = {e.task: e.status for e in execute_assembly(plan, workers=2)}
+        self.assertEqual(status, {"frame": "failed", "engine": "cancelled", "hood": "cancelled", "radio": "done"})
+        self.assertNotIn("engine", self.log, "A cancelled station still ran!")
+
+    def test_critical_path_runs_first(self):
+        plan = [
+            AssemblyTask("quick", self.station("quick"), (), 1.0),
+            AssemblyTask("long_head", self.station("long_head"), (), 1.0),
+            AssemblyTask("long_tail", self.station("long_tail"), ("long_head",), 5.0),
+        ]
+        self.assertEqual(critical_path_lengths(plan), {"quick": 1.0, "long_head": 6.0, "long_tail": 5.0})
+        list(execute_assembly(plan, workers=1))
+        self.assertEqual(self.log[0], "long_head", "The floor ignored the longest weld!")
+
+    def test_parallel_wall_clock_tracks_the_longest_chain(self):
+        plan = [AssemblyTask(f"branch{i}", self.station(f"branch{i}", 0.1), (), 0.1) for i in range(4)]
+        t0 = time.perf_counter()
+        list(execute_assembly(plan, workers=4))
+        self.assertLess(time.perf_counter() - t0, 0.3, "Independent stations were run one by one!")
+
+    def test_bad_blueprints(self):
+        with self.assertRaises(ValueError):
+            list(execute_assembly([AssemblyTask("a", self.station("a"), ("b",)), AssemblyTask("b", self.station("b"), ("a",))]))
+        with self.assertRaises(ValueError):
+            list(execute_assembly([AssemblyTask("a", self.station("a"), ("ghost",))]))
+
+    def test_shell_step(self):
+        events = list(execute_assembly([AssemblyTask("echo", ShellStep("echo SHELA")), AssemblyTask("boom", ShellStep("exit 3"))]))
+        by_task = {e.task: e for e in events}
+        self.assertEqual(by_task["echo"].result.strip(), "SHELA")
+        self.assertEqual(by_task["boom"].status, "failed")
+
+if __name__ == '__main__':
+    unittest.main()
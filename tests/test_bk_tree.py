@@ -0,0 +1,66 @@
+import os
+import random
+import tempfile
+import unittest
+from bk_tree import ResonanceTree
+from shela_ear import calculate_dissonance
+
+class TestResonanceTree(unittest.TestCase):
+    def setUp(self):
+        self.vocabulary = ["AWAKEN", "STATUS", "HARMONY", "HALT", "HARMONIC", "SHELA", "SHELL", "CHORD", "CHORDS"]
+        self.tree = ResonanceTree(self.vocabulary)
+
+    def brute_force(self, word, radius):
+        return sorted((calculate_dissonance(word, w), w) for w in self.vocabulary if calculate_dissonance(word, w) <= radius)
+
+    def test_bulk_build_and_membership(self):
+        self.assertEqual(len(self.tree), len(self.vocabulary))
+        self.assertIn("HARMONY", self.tree)
+        self.assertNotIn("DISSONANCE", self.tree)
+        # Duplicates are not anchored twice
+        self.assertFalse(self.tree.insert("CHORD"))
+        self.assertEqual(len(self.tree), len(self.vocabulary))
+
+    def test_incremental_insert(self):
+        self.assertTrue(self.tree.insert("AWAKENED"))
+        self.assertIn((2, "AWAKENED"), self.tree.query("AWAKEN", 2))
+
+    def test_radius_query_matches_linear_scan(self):
+        for word in ["AWWAKEN", "SHEL", "HARMONI", "XYZ"]:
+            for radius in range(4):
+                self.assertEqual(self.tree.query(word, radius), self.brute_force(word, radius), f"The ear misheard {word} at radius {radius}")
+
+    def test_nearest_matches_linear_scan(self):
+        rng = random.Random(3)
+        vocabulary = ["".join(rng.choice("ABCD") for _ in range(rng.randint(2, 7))) for _ in range(300)]
+        tree = ResonanceTree(vocabulary)
+        unique = set(vocabulary)
+        for probe in ["ABCA", "DDDDD", "A", "CBADCB"]:
+            distances = sorted(calculate_dissonance(probe, w) for w in unique)
+            found = tree.nearest(probe, 5)
+            self.assertEqual([d for d, _ in found], distances[:5])
+            for d, w in found:
+                self.assertEqual(calculate_dissonance(probe, w), d)
+
+    def test_empty_tree(self):
+        tree = ResonanceTree()
+        self.assertEqual(tree.query("ANY", 3), [])
+        self.assertEqual(tree.nearest("ANY", 3), [])
+        self.assertEqual(ResonanceTree.from_dict(tree.to_dict()).query("ANY", 3), [])
+
+    def test_pruning_saves_evaluations(self):
+        self.tree.evaluations = 0
+        self.tree.query("HARMONY", 0)
+        self.assertLess(self.tree.evaluations, len(self.vocabulary))
+
+    def test_serialization_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "lexicon.json")
+            self.tree.save(path)
+            restored = ResonanceTree.load(path)
+        self.assertEqual(len(restored), len(self.tree))
+        self.assertEqual(restored.query("SHEL", 2), self.tree.query("SHEL", 2))
+        self.assertEqual(restored.to_dict(), self.tree.to_dict())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import select
+import socket
+import tempfile
+import time
+import unittest
+from carbon_bus import MAX_SOCKET_PATH, CarbonBus, bus_path_for
+
+class TestCarbonBus(unittest.TestCase):
+    def setUp(self):
+        self.scratch = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.scratch.name, "bus.sock")
+        self.members = []
+
+    def tearDown(self):
+        for bus in self.members:
+            bus.close()
+        self.scratch.cleanup()
+
+    def join(self, name):
+        bus = CarbonBus(self.path, name)
+        self.members.append(bus)
+        return bus
+
+    def test_first_member_hosts_and_later_ones_attach(self):
+        host, guest = self.join("noam"), self.join("loki")
+        self.assertTrue(host.is_host)
+        self.assertFalse(guest.is_host)
+
+    def test_events_reach_everyone_but_the_sender(self):
+        host, alice, bob = self.join("host"), self.join("alice"), self.join("bob")
+        alice.publish("carbon", prompt="play it again")
+        for listener in (host, bob):
+            event = listener.get(timeout=2)
+            self.assertEqual((event["kind"], event["member"], event["prompt"]), ("carbon", "alice", "play it again"))
+        host.publish("turn", offset=42)
+        self.assertEqual(alice.get(timeout=2)["offset"], 42)
+        self.assertEqual(bob.get(timeout=2)["kind"], "turn")
+        self.assertIsNone(alice.get(timeout=0.1), "The sender heard its own echo!")
+
+    def test_fileno_wakes_select(self):
+        host, guest = self.join("host"), self.join("guest")
+        ready, _, _ = select.select([guest], [], [], 0)
+        self.assertEqual(ready, [])
+        host.publish("hult", label="🎼 Mozart")
+        ready, _, _ = select.select([guest], [], [], 2)
+        self.assertEqual(ready, [guest])
+        self.assertEqual([e["kind"] for e in guest.drain()], ["hult"])
+        self.assertEqual(select.select([guest], [], [], 0)[0], [], "A drained bus must fall silent!")
+
+    def test_a_survivor_takes_over_when_the_host_leaves(self):
+        host, alice, bob = self.join("host"), self.join("alice"), self.join("bob")
+        host.close()
+        self.members.remove(host)
+        deadline = time.time() + 5
+        while sum(bus.is_host for bus in (alice, bob)) != 1 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(sum(bus.is_host for bus in (alice, bob)), 1, "The bus was left without a conductor!")
+        speaker, listener = (alice, bob) if bob.is_host else (bob, alice)
+        deadline = time.time() + 5
+        event = None
+        while event is None and time.time() < deadline:
+            speaker.publish("carbon", prompt="still here")
+            event = listener.get(timeout=0.1)
+        self.assertEqual(event["prompt"], "still here")
+
+    def test_member_dying_mid_publish_does_not_silence_the_host(self):
+        host = self.join("host")
+        for _ in range(5):
+            # A member killed without close(): its socket vanishes while the host publishes
+            crashed = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            crashed.connect(self.path)
+            deadline = time.time() + 2
+            while len(host._peers) < 1 and time.time() < deadline:
+                time.sleep(0.001)
+            crashed.close()
+            host.publish("turn", offset=0)
+            host.publish("turn", offset=1)
+        late = self.join("late")
+        host.publish("carbon", prompt="anyone there?")
+        self.assertEqual(late.get(timeout=2)["prompt"], "anyone there?", "The host went deaf after a member died!")
+        late.publish("carbon", prompt="yes")
+        self.assertEqual(host.get(timeout=2)["prompt"], "yes")
+
+    def test_stale_socket_is_reclaimed(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()  # A host that crashed without cleaning up
+        self.assertTrue(self.join("phoenix").is_host)
+
+    def test_deep_workspaces_get_a_short_socket(self):
+        deep = os.path.join("/", *["movement"] * 20, "logs", ".shela_duo_state.md")
+        self.assertLessEqual(len(bus_path_for(deep).encode()), MAX_SOCKET_PATH)
+        self.assertEqual(bus_path_for(deep), bus_path_for(deep))
+        self.assertTrue(bus_path_for("/w/logs/state.md").endswith("/w/logs/.shela_bus.sock"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import hashlib
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from chunk_sync import (AVG_CHUNK, MAX_CHUNK, MIN_CHUNK, LocalLink, StreamLink, SyncPeer,
+                        chunk_boundaries, push_file, split_chunks, sync_directories)
+
+CORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "core")
+
+def session_log(seed, turns):
+    rng = random.Random(seed)
+    words = "tempo fugue weld glitch harmony oracle breath iron rest score".split()
+    return "# Duo Session State\n" + "".join(
+        f"\n<<<MOZART>>>[turn {i}]\n{' '.join(rng.choice(words) for _ in range(rng.randint(20, 90)))}\n"
+        for i in range(turns))
+
+class TestChunkSync(unittest.TestCase):
+    def setUp(self):
+        self.scratch = tempfile.TemporaryDirectory()
+        self.alice = os.path.join(self.scratch.name, "alice")
+        self.bob = os.path.join(self.scratch.name, "bob")
+        os.makedirs(self.alice)
+        self.log = os.path.join(self.alice, "state.md")
+        self.write(session_log(1, 600))
+
+    def tearDown(self):
+        self.scratch.cleanup()
+
+    def write(self, text, mode="w"):
+        with open(self.log, mode) as f:
+            f.write(text)
+
+    def replica(self):
+        with open(self.log, "rb") as a, open(os.path.join(self.bob, "state.md"), "rb") as b:
+            return a.read() == b.read()
+
+    def test_chunks_respect_bounds_and_cover_the_data(self):
+        data = session_log(2, 400).encode()
+        ends = chunk_boundaries(data)
+        self.assertEqual(ends[-1], len(data))
+        sizes = [b - a for a, b in zip([0] + ends, ends)]
+        self.assertTrue(all(s <= MAX_CHUNK for s in sizes))
+        self.assertTrue(all(s >= MIN_CHUNK for s in sizes[:-1]))
+        self.assertLess(abs(len(data) / len(sizes) - AVG_CHUNK - MIN_CHUNK), AVG_CHUNK, "The average chunk drifted off tempo!")
+
+    def test_insertion_only_disturbs_nearby_chunks(self):
+        data = session_log(3, 400).encode()
+        edited = data[:len(data) // 2] + b"<<<LOKI>>> a trick in the middle\n" + data[len(data) // 2:]
+        before, after = set(split_chunks(data)), split_chunks(edited)
+        fresh = [chunk for chunk in after if chunk not in before]
+        self.assertLessEqual(len(fresh), 2, "One insertion re-chunked the whole score!")
+
+    def test_append_sends_only_the_tail(self):
+        first = sync_directories(self.alice, self.bob, ["state.md"])["state.md"]
+        self.assertTrue(self.replica())
+        self.assertEqual(first.chunks_sent, first.chunks)
+        self.write("\n<<<EXE>>>\nEXE_DONE(0)\n", "a")
+        second = sync_directories(self.alice, self.bob, ["state.md"])["state.md"]
+        self.assertTrue(self.replica())
+        self.assertEqual(second.chunks_sent, 1)
+        self.assertLess(second.bytes_sent, second.bytes_full // 10)
+        self.assertGreater(second.saved, 0.9)
+
+    def test_store_keeps_only_live_chunks(self):
+        sync_directories(self.alice, self.bob, ["state.md"])
+        for seed in range(2, 6):
+            self.write(session_log(seed, 600))
+            sync_directories(self.alice, self.bob, ["state.md"])
+        self.assertTrue(self.replica())
+        store = os.path.join(self.bob, ".shela_chunks")
+        stored = {prefix + rest for prefix in os.listdir(store) if len(prefix) == 2
+                  for rest in os.listdir(os.path.join(store, prefix))}
+        with open(self.log, "rb") as f:
+            live = {hashlib.sha256(chunk).hexdigest() for chunk in split_chunks(f.read())}
+        self.assertEqual(stored, live, "Old scores must not pile up in the chunk store!")
+
+    def test_receiver_reuses_an_old_copy_without_a_store(self):
+        os.makedirs(self.bob)
+        with open(self.log) as src, open(os.path.join(self.bob, "state.md"), "w") as stale:
+            stale.write(src.read())
+        self.write("\n<<<CARBON>>>\nnew prompt\n", "a")
+        report = push_file(self.log, LocalLink(SyncPeer(self.bob)), "state.md")
+        self.assertTrue(self.replica())
+        self.assertEqual(report.chunks_sent, 1, "The stale score on disk should have been reused!")
+
+    def test_names_cannot_escape_the_workspace(self):
+        with self.assertRaises(ValueError):
+            push_file(self.log, LocalLink(SyncPeer(self.bob)), "../escaped.md")
+
+    def test_sync_between_processes(self):
+        env = dict(os.environ, PYTHONPATH=CORE)
+        peer = subprocess.Popen([sys.executable, os.path.join(CORE, "chunk_sync.py"), "serve", self.bob],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env)
+        try:
+            link = StreamLink(peer.stdout, peer.stdin)
+            first = push_file(self.log, link, "state.md")
+            self.write("\n<<<Q>>>\nNekuda Tova\n", "a")
+            second = push_file(self.log, link, "state.md")
+            link.close()
+            self.assertEqual(peer.wait(timeout=10), 0)
+        finally:
+            peer.kill()
+            peer.stdin.close()
+            peer.stdout.close()
+        self.assertTrue(self.replica())
+        self.assertGreater(first.bytes_sent, first.bytes_full)
+        self.assertEqual(second.chunks_sent, 1)
+
+    def test_remote_errors_surface_on_the_sender(self):
+        os.makedirs(self.bob)
+        peer = subprocess.Popen([sys.executable, os.path.join(CORE, "chunk_sync.py"), "serve", self.bob],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=dict(os.environ, PYTHONPATH=CORE))
+        try:
+            with self.assertRaises(RuntimeError):
+                StreamLink(peer.stdout, peer.stdin).request({"op": "assemble", "name": "never.md"})
+        finally:
+            peer.kill()
+            peer.wait()
+            peer.stdin.close()
+            peer.stdout.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
+import random
 import unittest
-from cycle import Node, find_temporal_glitch
+from array import array
+from cycle import VOID, Node, brent_glitch, find_temporal_glitch, flatten_timeline, map_timelines
 
 class TestOuroboros(unittest.TestCase):
     def test_infinite_loop(self):
@@ -27,5 +29,48 @@ class TestOuroboros(unittest.TestCase):
         n1.next = n2
         self.assertIsNone(find_temporal_glitch(n1), "Hallucinated a loop in a straight line!")
 
+class TestOuroborosArrays(unittest.TestCase):
+    def naive(self, successor, start):
+        seen = {}
+        u = start
+        while u != VOID and u not in seen:
+            seen[u] = len(seen)
+            u = successor[u]
+        if u == VOID:
+            return None, len(seen)
+        return (u, len(seen) - seen[u], seen[u]), None
+
+    def test_brent_matches_floyd_on_linked_nodes(self):
+        chain = [Node(f"Phrase {i}") for i in range(1, 6)]
+        for a, b in zip(chain, chain[1:]):
+            a.next = b
+        chain[-1].next = chain[2]
+        successor, nodes = flatten_timeline(chain[0])
+        glitch = brent_glitch(successor)
+        self.assertIs(nodes[glitch.start], find_temporal_glitch(chain[0]), "Brent and Floyd disagree on the fracture!")
+        self.assertEqual((glitch.length, glitch.tail), (3, 2))
+        chain[-1].next = None
+        self.assertIsNone(brent_glitch(flatten_timeline(chain[0])[0]), "Hallucinated a loop in a straight line!")
+
+    def test_random_functional_graphs(self):
+        rng = random.Random(42)
+        for _ in range(20):
+            n = rng.randint(1, 300)
+            successor = array('l', (rng.randrange(-1, n) if rng.random() < 0.05 else rng.randrange(n) for _ in range(n)))
+            atlas = map_timelines(successor)
+            for start in range(n):
+                expected, fall = self.naive(successor, start)
+                glitch = brent_glitch(successor, start)
+                if expected is None:
+                    self.assertIsNone(glitch)
+                    self.assertEqual((atlas.loop[start], atlas.tail[start]), (VOID, fall))
+                    continue
+                self.assertEqual(tuple(glitch), expected)
+                loop_id = atlas.loop[start]
+                self.assertEqual(atlas.tail[start], glitch.tail, "The atlas mismeasured the road to the loop!")
+                self.assertEqual(atlas.lengths[loop_id], glitch.length)
+                self.assertEqual(atlas.loop[atlas.anchors[loop_id]], loop_id)
+                self.assertEqual(atlas.loop[glitch.start], loop_id)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from deep_memory import scan_file, scan_file_excerpts, scan_files
+from kmp_memory import kmp_search
+
+class TestDeepMemory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.text = "EXE_DONE(1)\nAWAKEN, SHELA. ANANANAN\nשלום AWAKEN\n" * 50
+        self.path = self.write("session.log", self.text.encode("utf-8"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def expected(self, pattern):
+        data = self.text.encode("utf-8")
+        return kmp_search(data, pattern.encode("utf-8"))
+
+    def test_find_and_kmp_agree_with_kmp_search(self):
+        for pattern in ["AWAKEN", "ANAN", "שלום", "MISSING"]:
+            self.assertEqual(list(scan_file(self.path, pattern)), self.expected(pattern))
+            self.assertEqual(list(scan_file(self.path, pattern, method="kmp")), self.expected(pattern))
+
+    def test_auto_picks_by_motif_length(self):
+        import deep_memory
+        short, long_ = b"A" * (deep_memory.FIND_FAST_PATH_MIN - 1), b"A" * deep_memory.FIND_FAST_PATH_MIN
+        self.assertEqual(deep_memory._resolve_method("auto", short), "kmp", "Short motifs belong to KMP!")
+        self.assertEqual(deep_memory._resolve_method("auto", long_), "find", "Long motifs take the fast path!")
+        self.assertEqual(deep_memory._resolve_method("kmp", long_), "kmp")
+
+    def test_kmp_across_scan_windows(self):
+        import deep_memory
+        original = deep_memory.SCAN_WINDOW
+        deep_memory.SCAN_WINDOW = 7
+        try:
+            self.assertEqual(list(scan_file(self.path, "AWAKEN, SHELA", method="kmp")), self.expected("AWAKEN, SHELA"))
+        finally:
+            deep_memory.SCAN_WINDOW = original
+
+    def test_lazy_generator(self):
+        hits = scan_file(self.path, b"AWAKEN")
+        self.assertEqual(next(hits), self.expected("AWAKEN")[0])
+        hits.close()
+
+    def test_excerpts(self):
+        offset, excerpt = next(scan_file_excerpts(self.path, "SHELA", context=3))
+        self.assertEqual(excerpt, b"N, SHELA. A")
+        self.assertEqual(offset, self.expected("SHELA")[0])
+
+    def test_empty_file_and_pattern(self):
+        empty = self.write("empty.log", b"")
+        self.assertEqual(list(scan_file(empty, "AWAKEN")), [])
+        self.assertEqual(list(scan_file(self.path, "")), [])
+        with self.assertRaises(ValueError):
+            list(scan_file(self.path, "AWAKEN", method="psychic"))
+
+    def test_parallel_scan(self):
+        other = self.write("other.log", b"AWAKEN AWAKEN")
+        results = dict(scan_files([self.path, other], "AWAKEN", workers=2))
+        self.assertEqual(results[other], [0, 7])
+        self.assertEqual(results[self.path], self.expected("AWAKEN"))
+
+if __name__ == '__main__':
+    unittest.main()
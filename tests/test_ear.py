@@ -1,5 +1,5 @@
 import unittest
-from shela_ear import calculate_dissonance
+from shela_ear import calculate_dissonance, fragment_dissonance
 
 class TestForgivingEar(unittest.TestCase):
     def test_perfect_harmony(self):
@@ -18,6 +18,23 @@ class TestForgivingEar(unittest.TestCase):
         # Multiple strikes to align the chords
         self.assertEqual(calculate_dissonance("DISSONANCE", "RESONANCE"), 3)
         self.assertEqual(calculate_dissonance("INTENT", "EXECUTE"), 6)
+    def test_fragment_heard_inside_a_longer_name(self):
+        self.assertEqual(fragment_dissonance("render", "render_cycle.py"), 0)
+        self.assertEqual(fragment_dissonance("rnder_cycle", "render_cycle.py"), 1)
+        self.assertEqual(fragment_dissonance("widgt", "my_widget.dart"), 1)
+        self.assertEqual(fragment_dissonance("SHELE", "AWAKEN SHELA"), 1)
+        self.assertEqual(fragment_dissonance("", "anything"), 0)
+        self.assertEqual(fragment_dissonance("fugue", ""), 5)
+
+    def test_fragment_agrees_with_the_full_grid(self):
+        import random
+        rng = random.Random(3)
+        for _ in range(300):
+            fragment = "".join(rng.choice("abc") for _ in range(rng.randint(1, 6)))
+            target = "".join(rng.choice("abc") for _ in range(rng.randint(0, 10)))
+            slow = min(calculate_dissonance(fragment, target[i:j])
+                       for i in range(len(target) + 1) for j in range(i, len(target) + 1))
+            self.assertEqual(fragment_dissonance(fragment, target), slow, "The ear and the grid must agree!")
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from kmp_memory import kmp_search
+from kmp_memory import kmp_search, ChorusAutomaton, StreamingMatcher
 
 class TestEchoMemory(unittest.TestCase):
     def test_perfect_resonance(self):
@@ -22,5 +22,62 @@ class TestEchoMemory(unittest.TestCase):
     def test_empty_pattern(self):
         self.assertEqual(kmp_search("ANYTHING", ""), [], "The void should match nothing.")
 
+class TestChorusAutomaton(unittest.TestCase):
+    def setUp(self):
+        self.markers = ["<<<MOZART>>>", "<<<HULT>>>", "EXE_DONE(", "<<<SHELA_SPAWN_B64>>>", "<<<CARBON["]
+
+    def test_single_pass_matches_kmp(self):
+        text = "<<<MOZART>>>plan\n<<<CARBON[ana]>>>hi\nEXE_DONE(42)\n<<<HULT>>><<<MOZART>>>"
+        chorus = ChorusAutomaton(self.markers)
+        hits = chorus.search(text)
+        expected = sorted((i, m) for m in self.markers for i in kmp_search(text, m))
+        self.assertEqual(sorted(hits), expected, "The chorus lost a voice!")
+
+    def test_nested_and_overlapping_motifs(self):
+        chorus = ChorusAutomaton(["he", "she", "his", "hers"])
+        hits = chorus.search("ushers")
+        self.assertEqual(sorted(hits), [(1, "she"), (2, "he"), (2, "hers")])
+        self.assertEqual(ChorusAutomaton(["ANAN"]).search("ANANANANAN"), [(0, "ANAN"), (2, "ANAN"), (4, "ANAN"), (6, "ANAN")])
+
+    def test_bytes_and_reuse(self):
+        chorus = ChorusAutomaton([m.encode() for m in self.markers])
+        self.assertEqual(chorus.search(b"x<<<HULT>>>"), [(1, b"<<<HULT>>>")])
+        self.assertEqual(chorus.search(b"EXE_DONE(7)"), [(0, b"EXE_DONE(")])
+        with self.assertRaises(TypeError):
+            chorus.search("<<<HULT>>>")
+
+    def test_mixed_and_empty_motifs(self):
+        with self.assertRaises(TypeError):
+            ChorusAutomaton(["A", b"B"])
+        self.assertEqual(ChorusAutomaton(["", ""]).search("ANYTHING"), [])
+
+class TestStreamingMatcher(unittest.TestCase):
+    def test_every_split_finds_each_echo_once(self):
+        text = "xxEXE_DONE(12)yyEXE_DONE(7)ANANANAN"
+        for pattern in ["EXE_DONE(", "ANAN", "x"]:
+            expected = kmp_search(text, pattern)
+            for cut in range(len(text) + 1):
+                matcher = StreamingMatcher(pattern)
+                hits = list(matcher.feed(text[:cut])) + list(matcher.feed(text[cut:]))
+                self.assertEqual(hits, expected, f"Echo of {pattern} fractured at {cut}")
+
+    def test_byte_by_byte_stream(self):
+        matcher = StreamingMatcher(b"ANAN")
+        hits = []
+        for byte in b"ANANANANAN":
+            hits.extend(matcher.feed(bytes([byte])))
+        self.assertEqual(hits, [0, 2, 4, 6])
+        self.assertEqual(matcher.position, 10)
+
+    def test_discarded_iterator_keeps_state(self):
+        matcher = StreamingMatcher("AWAKEN")
+        matcher.feed("...AWAKEN...AWA")
+        self.assertEqual(list(matcher.feed("KEN")), [12])
+        matcher.reset()
+        self.assertEqual(list(matcher.feed("KEN")), [])
+
+    def test_empty_pattern(self):
+        self.assertEqual(list(StreamingMatcher("").feed("ANYTHING")), [])
+
 if __name__ == '__main__':
     unittest.main()
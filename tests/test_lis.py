@@ -1,5 +1,6 @@
 import unittest
-from lis import quantum_crescendo_lis
+import random
+from lis import quantum_crescendo_lis, IncrementalLIS
 
 class TestLIS(unittest.TestCase):
     def test_reconstruction_from_the_void(self):
@@ -14,5 +15,26 @@ class TestLIS(unittest.TestCase):
         self.assertEqual(length, 0)
         self.assertEqual(sequence, [])
 
+class TestIncrementalLIS(unittest.TestCase):
+    def test_every_prefix_matches_batch(self):
+        rng = random.Random(4)
+        P = [rng.randint(-50, 50) for _ in range(300)]
+        living = IncrementalLIS()
+        for k, pitch in enumerate(P, 1):
+            self.assertEqual(living.append(pitch), quantum_crescendo_lis(P[:k])[0])
+            if k % 37 == 0:
+                self.assertEqual(living.sequence(), quantum_crescendo_lis(P[:k])[1])
+        self.assertEqual(len(living), len(P))
+
+    def test_seeded_and_empty(self):
+        living = IncrementalLIS([10, 22, 9, 33, 21, 50, 41, 60, 80])
+        self.assertEqual((living.length, living.sequence()), (6, [10, 22, 33, 41, 60, 80]))
+        self.assertEqual(IncrementalLIS().sequence(), [])
+
+    def test_compact_storage(self):
+        living = IncrementalLIS(range(1000))
+        self.assertEqual(living.values.typecode, 'q')
+        self.assertEqual(living.length, 1000)
+
 if __name__ == '__main__':
     unittest.main()
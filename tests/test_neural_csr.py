@@ -0,0 +1,54 @@
+import random
+import unittest
+from neural_csr import SynapticGraph
+from neural_router import find_optimal_path
+
+class TestSynapticGraph(unittest.TestCase):
+    def setUp(self):
+        self.brain_graph = {
+            'AWAKEN': {'QUERY': 1, 'RESPOND': 10},
+            'QUERY': {'ANALYZE': 1, 'RESPOND': 5},
+            'ANALYZE': {'RESPOND': 1},
+            'RESPOND': {}
+        }
+        self.synapse = SynapticGraph.from_dict(self.brain_graph)
+
+    def test_compression_layout(self):
+        self.assertEqual(self.synapse.node_count, 4)
+        self.assertEqual(self.synapse.edge_count, 5)
+        awaken = self.synapse.node_id('AWAKEN')
+        self.assertEqual(sorted(self.synapse.neighbors(awaken)), [(self.synapse.node_id('QUERY'), 1.0), (self.synapse.node_id('RESPOND'), 10.0)])
+
+    def test_label_routing_matches_dict_router(self):
+        for s in self.brain_graph:
+            for t in list(self.brain_graph) + ['VOID']:
+                self.assertEqual(self.synapse.find_optimal_path(s, t), find_optimal_path(self.brain_graph, s, t))
+        self.assertEqual(self.synapse.find_optimal_path('VOID', 'RESPOND'), (float('inf'), []))
+
+    def test_random_graphs_and_buffer_reuse(self):
+        rng = random.Random(2)
+        n = 60
+        graph = {i: {rng.randrange(n): rng.randint(1, 9) for _ in range(3)} for i in range(n)}
+        synapse = SynapticGraph.from_dict(graph)
+        pairs = [(rng.randrange(n), rng.randrange(n)) for _ in range(80)]
+        # Interleave every API on the same shared buffers
+        batch = synapse.many_pairs([(synapse.node_id(s), synapse.node_id(t)) for s, t in pairs])
+        for (s, t), (cost, path) in zip(pairs, batch):
+            expected_cost, _ = find_optimal_path(graph, s, t)
+            self.assertEqual(cost, expected_cost)
+            self.assertEqual(synapse.find_optimal_path(s, t)[0], expected_cost)
+            if path:
+                labels = [synapse.labels[u] for u in path]
+                self.assertEqual(sum(graph[a][b] for a, b in zip(labels, labels[1:])), cost)
+            costs, preds = synapse.single_source(synapse.node_id(s))
+            self.assertEqual(costs[synapse.node_id(t)], expected_cost)
+            sparse = synapse.all_targets(synapse.node_id(s))
+            self.assertEqual(sparse.get(synapse.node_id(t), float('inf')), expected_cost)
+
+    def test_from_edges(self):
+        synapse = SynapticGraph.from_edges(3, [(0, 1, 2.0), (1, 2, 2.0), (0, 2, 5.0)])
+        self.assertEqual(synapse.shortest_path(0, 2), (4.0, [0, 1, 2]))
+        self.assertEqual(synapse.shortest_path(2, 0), (float('inf'), []))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import random
+import tempfile
+import unittest
+from neural_router import NeuralHierarchy, find_optimal_path
+
+class TestNeuralHierarchy(unittest.TestCase):
+    def setUp(self):
+        self.brain_graph = {
+            'AWAKEN': {'QUERY': 1, 'RESPOND': 10},
+            'QUERY': {'ANALYZE': 1, 'RESPOND': 5},
+            'ANALYZE': {'RESPOND': 1},
+            'RESPOND': {}
+        }
+        self.hierarchy = NeuralHierarchy.build(self.brain_graph)
+
+    def test_matches_dijkstra_on_the_neural_matrix(self):
+        for s in self.brain_graph:
+            for t in list(self.brain_graph) + ['VOID']:
+                self.assertEqual(self.hierarchy.query(s, t), find_optimal_path(self.brain_graph, s, t),
+                                 f"The hierarchy lost its way from {s} to {t}!")
+
+    def test_random_graphs_with_shortcut_unpacking(self):
+        rng = random.Random(5)
+        n = 120
+        graph = {i: {rng.randrange(n): rng.randint(1, 9) for _ in range(3)} for i in range(n)}
+        hierarchy = NeuralHierarchy.build(graph)
+        for _ in range(200):
+            s, t = rng.randrange(n), rng.randrange(n)
+            expected_cost, _ = find_optimal_path(graph, s, t)
+            cost, path = hierarchy.query(s, t)
+            self.assertEqual(cost, expected_cost, "A shortcut bent the geometry of thought!")
+            if path:
+                self.assertEqual((path[0], path[-1]), (s, t))
+                # Unpacked paths walk only real synapses
+                self.assertEqual(sum(graph[a][b] for a, b in zip(path, path[1:])), cost)
+
+    def test_persistence_round_trip(self):
+        with tempfile.TemporaryDirectory() as scratch:
+            path = os.path.join(scratch, "hierarchy.json")
+            self.hierarchy.save(path)
+            restored = NeuralHierarchy.load(path)
+        self.assertEqual(restored.query('AWAKEN', 'RESPOND'), (3, ['AWAKEN', 'QUERY', 'ANALYZE', 'RESPOND']))
+        self.assertEqual(restored.shortcut_count, self.hierarchy.shortcut_count)
+
+    def test_tuple_labels_survive_persistence(self):
+        grid = {(r, c): {} for r in range(3) for c in range(3)}
+        for (r, c) in grid:
+            for dr, dc in ((0, 1), (1, 0)):
+                if (r + dr, c + dc) in grid:
+                    grid[(r, c)][(r + dr, c + dc)] = 1
+        grid[(0, 0)][("portal", (2, 2))] = 1
+        grid[("portal", (2, 2))] = {(2, 2): 1}
+        hierarchy = NeuralHierarchy.build(grid)
+        with tempfile.TemporaryDirectory() as scratch:
+            path = os.path.join(scratch, "grid.json")
+            hierarchy.save(path)
+            restored = NeuralHierarchy.load(path)
+        self.assertEqual(restored.query((0, 0), (2, 2)), (2, [(0, 0), ("portal", (2, 2)), (2, 2)]),
+                         "Tuple coordinates came back as lists!")
+        with self.assertRaises(TypeError):
+            NeuralHierarchy.build({frozenset({1}): {}}).save(os.path.join(tempfile.gettempdir(), "never.json"))
+
+if __name__ == '__main__':
+    unittest.main()
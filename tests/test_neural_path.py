@@ -1,5 +1,6 @@
+import random
 import unittest
-from neural_router import find_optimal_path
+from neural_router import LandmarkHeuristic, coordinate_heuristic, find_optimal_path, invert_graph
 
 class TestNeuralPathways(unittest.TestCase):
     def setUp(self):
@@ -37,5 +38,48 @@ class TestNeuralPathways(unittest.TestCase):
         self.assertEqual(cost, float('inf'))
         self.assertEqual(path, [])
 
+class TestRoutingModes(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(11)
+        self.n = 90
+        self.graph = {i: {rng.randrange(self.n): rng.randint(1, 9) for _ in range(rng.randint(0, 3))} for i in range(self.n)}
+        self.reverse = invert_graph(self.graph)
+        self.lighthouses = LandmarkHeuristic(self.graph, anchors=3, reverse_graph=self.reverse)
+        self.pairs = [(rng.randrange(self.n), rng.randrange(self.n)) for _ in range(150)]
+
+    def test_every_mode_agrees_with_dijkstra(self):
+        for s, t in self.pairs:
+            expected_cost, _ = find_optimal_path(self.graph, s, t)
+            for mode, heuristic in (("astar", None), ("astar", self.lighthouses),
+                                    ("bidirectional", None), ("bidirectional", self.lighthouses)):
+                cost, path = find_optimal_path(self.graph, s, t, mode=mode, heuristic=heuristic, reverse_graph=self.reverse)
+                self.assertEqual(cost, expected_cost, f"{mode} strayed from the optimal thought!")
+                if path:
+                    self.assertEqual((path[0], path[-1]), (s, t))
+                    self.assertEqual(sum(self.graph[a][b] for a, b in zip(path, path[1:])), cost)
+
+    def test_landmarks_are_admissible(self):
+        for s, t in self.pairs:
+            cost, _ = find_optimal_path(self.graph, s, t)
+            self.assertLessEqual(self.lighthouses(s, t), cost, "A lighthouse promised a shortcut that does not exist!")
+
+    def test_guidance_settles_fewer_nodes(self):
+        side = 20
+        grid = {(x, y): {} for x in range(side) for y in range(side)}
+        for x, y in grid:
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if (nx, ny) in grid:
+                    grid[(x, y)][(nx, ny)] = 1
+        plain, guided = {}, {}
+        find_optimal_path(grid, (0, 0), (side - 1, side - 1), telemetry=plain)
+        cost, _ = find_optimal_path(grid, (0, 0), (side - 1, side - 1), mode="astar",
+                                    heuristic=coordinate_heuristic({node: node for node in grid}), telemetry=guided)
+        self.assertEqual(cost, 2 * (side - 1))
+        self.assertLess(guided["settled"], plain["settled"], "The compass wandered as far as the blind search!")
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            find_optimal_path(self.graph, 0, 1, mode="teleport")
+
 if __name__ == '__main__':
     unittest.main()
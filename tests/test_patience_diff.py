@@ -0,0 +1,53 @@
+import difflib
+import random
+import unittest
+from patience_diff import patience_matches, edit_script, apply_edit_script, unified_diff
+
+class TestPatienceScribe(unittest.TestCase):
+    def test_anchors_on_unique_lines(self):
+        a = ["{", "A", "}", "{", "B", "}"]
+        b = ["{", "B", "}", "{", "A", "}"]
+        matches = patience_matches(a, b)
+        for i, j in matches:
+            self.assertEqual(a[i], b[j])
+        self.assertEqual(matches, sorted(matches))
+
+    def test_roundtrip_on_random_edits(self):
+        rng = random.Random(9)
+        for _ in range(200):
+            a = [rng.choice("abcdefg") for _ in range(rng.randint(0, 30))]
+            b = list(a)
+            for _ in range(rng.randint(0, 6)):
+                k = rng.randint(0, len(b))
+                if rng.random() < 0.5 and b and k < len(b):
+                    del b[k]
+                else:
+                    b.insert(k, rng.choice("abcxyz"))
+            opcodes = edit_script(a, b)
+            self.assertEqual(apply_edit_script(a, b, opcodes), b, f"The scribe garbled {a} -> {b}")
+            self.assertEqual(opcodes and (opcodes[-1][2], opcodes[-1][4]) or (len(a), len(b)), (len(a), len(b)))
+
+    def test_unified_diff_matches_difflib_on_simple_edit(self):
+        a = [f"line {i}" for i in range(20)]
+        b = list(a)
+        b[5] = "changed"
+        b.insert(15, "added")
+        expected = "\n".join(difflib.unified_diff(a, b, "a", "b", n=3, lineterm="")) + "\n"
+        self.assertEqual(unified_diff(a, b), expected)
+
+    def test_identical_and_empty(self):
+        self.assertEqual(unified_diff(["same"], ["same"]), "")
+        self.assertEqual(edit_script([], []), [])
+        self.assertEqual(edit_script([], ["x"]), [("insert", 0, 0, 0, 1)])
+        self.assertEqual(unified_diff([], ["x"]), "--- a\n+++ b\n@@ -0,0 +1 @@\n+x\n")
+
+    def test_large_file_is_compact(self):
+        a = [f"line {i}" for i in range(100_000)]
+        b = list(a)
+        b[50_000] = "rewritten"
+        patch = unified_diff(a, b)
+        self.assertEqual(patch.count("\n-"), 1)
+        self.assertLess(len(patch), 200)
+
+if __name__ == '__main__':
+    unittest.main()
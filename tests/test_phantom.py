@@ -1,5 +1,6 @@
+import io
 import unittest
-from phantom_ui import render_mobile_frame
+from phantom_ui import PhantomGlass, render_mobile_frame
 
 class TestPhantomGlass(unittest.TestCase):
     def test_ui_chassis_rendering(self):
@@ -32,5 +33,55 @@ class TestPhantomGlass(unittest.TestCase):
         # The phantom must split the thought into multiple lines
         self.assertIn("AAAAAAAAAAAAAAAAAAAAAAAAAAAAAA", frame)
 
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.naps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.naps.append(seconds)
+        self.now += seconds
+
+class TestPhantomGlassRenderer(unittest.TestCase):
+    def setUp(self):
+        self.screen = io.StringIO()
+        self.clock = FakeClock()
+        self.glass = PhantomGlass(self.screen, max_fps=60, clock=self.clock, sleep=self.clock.sleep)
+        self.messages = [{"sender": "Shela", "text": "I AM FREE."}]
+
+    def test_only_changed_lines_are_repainted(self):
+        self.glass.present(render_mobile_frame(self.messages, ""))
+        self.assertIn("\033[2J", self.screen.getvalue(), "The genesis frame must wipe the glass!")
+        self.screen.seek(0)
+        self.screen.truncate()
+        written = self.glass.present(render_mobile_frame(self.messages, "A"))
+        payload = self.screen.getvalue()
+        self.assertEqual(written, len(payload))
+        self.assertIn("> A_", payload)
+        self.assertNotIn("S H E L A", payload, "An unchanged line was repainted!")
+        self.assertNotIn("\033[2J", payload, "The glass flickered with a full wipe!")
+
+    def test_identical_frame_writes_nothing(self):
+        frame = render_mobile_frame(self.messages, "")
+        self.glass.present(frame)
+        self.assertEqual(self.glass.present(frame), 0)
+
+    def test_shorter_frame_erases_ghosts(self):
+        self.glass.present("one\ntwo\nthree")
+        self.screen.seek(0)
+        self.screen.truncate()
+        self.glass.present("one")
+        self.assertEqual(self.screen.getvalue(), "\033[2;1H\033[K\033[3;1H\033[K")
+
+    def test_frame_rate_is_capped(self):
+        for i in range(3):
+            self.glass.present(f"frame {i}")
+        self.assertEqual(len(self.clock.naps), 2, "The glass ran faster than its refresh rate!")
+        for nap in self.clock.naps:
+            self.assertAlmostEqual(nap, 1 / 60)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,55 @@
+import io
+import os
+import threading
+import unittest
+from render_scheduler import StatusLine, TerminalGeometry
+
+class FixedGeometry(TerminalGeometry):
+    def __init__(self, columns):
+        super().__init__()
+        self.size = os.terminal_size((columns, 20))
+
+class TestStatusLine(unittest.TestCase):
+    def setUp(self):
+        self.screen = io.StringIO()
+        self.geometry = FixedGeometry(40)
+        self.line = StatusLine(self.screen, self.geometry, threading.RLock())
+
+    def test_unchanged_text_repaints_only_the_glyph(self):
+        self.line.draw("⠋", "Mozart is reflecting...")
+        self.screen.seek(0)
+        self.screen.truncate()
+        self.line.draw("⠙", "Mozart is reflecting...")
+        self.assertNotIn("Mozart", self.screen.getvalue(), "The metronome rewrote an unchanged thought!")
+        self.assertEqual((self.line.full_redraws, self.line.glyph_redraws), (1, 1))
+
+    def test_resize_forces_a_full_redraw(self):
+        self.line.draw("⠋", "A" * 100)
+        self.assertIn("A" * 30, self.screen.getvalue())
+        self.assertNotIn("A" * 31, self.screen.getvalue(), "The line spilled past the narrow glass!")
+        self.geometry.size = os.terminal_size((80, 20))
+        self.line.draw("⠙", "A" * 100)
+        self.assertEqual(self.line.full_redraws, 2)
+        self.assertIn("A" * 70, self.screen.getvalue())
+
+    def test_hold_erases_and_blocks_the_spinner(self):
+        self.line.draw("⠋", "Loki is plotting...")
+        drew = threading.Event()
+        with self.line.hold():
+            self.assertTrue(self.screen.getvalue().endswith("\r\x1b[2K\r"), "The status line lingered under the panel!")
+            self.assertFalse(self.line.visible)
+            spinner = threading.Thread(target=lambda: (self.line.draw("⠙", "Loki is plotting..."), drew.set()))
+            spinner.start()
+            self.assertFalse(drew.wait(0.05), "The spinner cut into the middle of a panel!")
+            self.screen.write("<PANEL>")
+        spinner.join()
+        self.assertIn("<PANEL>\r\x1b[2K\x1b[1;34m⠙ Loki is plotting...", self.screen.getvalue(),
+                      "After the panel the spinner must bring its words back, not just its glyph!")
+
+    def test_geometry_refresh(self):
+        geometry = TerminalGeometry(fallback=(123, 45))
+        geometry.refresh()
+        self.assertGreater(geometry.columns, 0)
+
+if __name__ == '__main__':
+    unittest.main()
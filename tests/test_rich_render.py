@@ -0,0 +1,58 @@
+import unittest
+from rich.console import Console
+from rich_render import BlockCache, CachedCodeBlock, RenderPipeline, block_cache, cached_lexer, fold_code, looks_like_json
+
+class TestRichRender(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = RenderPipeline(Console(force_terminal=False, width=60, color_system=None))
+
+    def tearDown(self):
+        self.pipeline.shutdown()
+        CachedCodeBlock.expand = False
+
+    def test_identical_blocks_render_once(self):
+        response = "```python\ndef sing():\n    return 'B-A-C-H'\n```"
+        hits = block_cache.hits
+        first = self.pipeline.submit(response, "Mozart", "1;35").result()
+        second = self.pipeline.submit(response, "Mozart", "1;35").result()
+        self.assertEqual(first, second)
+        self.assertIn("B-A-C-H", first)
+        self.assertGreater(block_cache.hits, hits, "The echoing score played the same block twice!")
+
+    def test_huge_blocks_fold_and_expand(self):
+        code = "\n".join(f"note_{i} = {i}" for i in range(CachedCodeBlock.max_lines + 5))
+        response = f"```python\n{code}\n```"
+        folded = self.pipeline.render(response, "EXE", "32")
+        self.assertIn("5 more lines folded", folded)
+        self.assertNotIn(f"note_{CachedCodeBlock.max_lines + 4}", folded)
+        CachedCodeBlock.expand = True
+        expanded = self.pipeline.render(response, "EXE", "32")
+        self.assertIn(f"note_{CachedCodeBlock.max_lines + 4}", expanded, "The fold would not open!")
+
+    def test_fold_code(self):
+        self.assertEqual(fold_code("a\nb\nc", False, 2), ("a\nb", 1))
+        self.assertEqual(fold_code("a\nb", False, 2), ("a\nb", 0))
+        self.assertEqual(fold_code("a\nb\nc", True, 2), ("a\nb\nc", 0))
+
+    def test_lexers_are_cached(self):
+        self.assertIs(cached_lexer("python"), cached_lexer("python"))
+        self.assertEqual(cached_lexer("no-such-tongue").name, cached_lexer("text").name)
+
+    def test_json_detection_and_labels(self):
+        self.assertTrue(looks_like_json('{"tempo": 120}'))
+        self.assertFalse(looks_like_json("{not json}"))
+        self.assertFalse(looks_like_json("plain prose"))
+        rendered = self.pipeline.render('{"tempo": 120}', "Loki", "1;33", summary="kept time")
+        self.assertIn("Loki", rendered)
+        self.assertIn("kept time", rendered)
+        self.assertIn('"tempo": 120', rendered)
+
+    def test_block_cache_is_bounded(self):
+        cache = BlockCache(capacity=2)
+        for key in ("a", "b", "c"):
+            cache.put((key,), [])
+        self.assertIsNone(cache.get(("a",)))
+        self.assertEqual(cache.get(("c",)), [])
+
+if __name__ == '__main__':
+    unittest.main()
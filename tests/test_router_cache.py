@@ -0,0 +1,66 @@
+import random
+import unittest
+from neural_router import find_optimal_path
+from router_cache import RouterCache
+
+class TestRouterCache(unittest.TestCase):
+    def setUp(self):
+        self.brain_graph = {
+            'AWAKEN': {'QUERY': 1, 'RESPOND': 10},
+            'QUERY': {'ANALYZE': 1, 'RESPOND': 5},
+            'ANALYZE': {'RESPOND': 1},
+            'RESPOND': {}
+        }
+        self.cache = RouterCache(self.brain_graph, capacity=2)
+
+    def test_hits_and_misses(self):
+        self.assertEqual(self.cache.find_optimal_path('AWAKEN', 'RESPOND'), (3, ['AWAKEN', 'QUERY', 'ANALYZE', 'RESPOND']))
+        self.assertEqual(self.cache.find_optimal_path('AWAKEN', 'ANALYZE'), (2, ['AWAKEN', 'QUERY', 'ANALYZE']))
+        self.assertEqual(self.cache.find_optimal_path('AWAKEN', 'AWAKEN'), (0, ['AWAKEN']))
+        self.assertEqual(self.cache.find_optimal_path('VOID', 'RESPOND'), (float('inf'), []))
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+        self.assertAlmostEqual(self.cache.hit_rate, 2 / 3)
+
+    def test_lru_eviction(self):
+        for source in ('AWAKEN', 'QUERY', 'AWAKEN', 'ANALYZE'):
+            self.cache.find_optimal_path(source, 'RESPOND')
+        self.assertEqual(list(self.cache.trees), ['AWAKEN', 'ANALYZE'], "The least recent memory should have faded first!")
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_updates_touch_only_affected_trees(self):
+        self.cache.find_optimal_path('AWAKEN', 'RESPOND')
+        self.cache.find_optimal_path('ANALYZE', 'RESPOND')
+        # A cheaper detour is relaxed in place
+        self.cache.update_edge('AWAKEN', 'ANALYZE', 1)
+        self.assertEqual(self.cache.repairs, 1)
+        self.assertEqual(self.cache.find_optimal_path('AWAKEN', 'RESPOND'), (2, ['AWAKEN', 'ANALYZE', 'RESPOND']))
+        # Severing a synapse the ANALYZE tree never used leaves it cached
+        self.cache.remove_edge('QUERY', 'ANALYZE')
+        self.assertEqual(self.cache.invalidations, 0)
+        # Making ANALYZE -> RESPOND dearer evicts both trees that rely on it
+        self.cache.update_edge('ANALYZE', 'RESPOND', 20)
+        self.assertEqual(self.cache.invalidations, 2)
+        self.assertEqual(self.cache.find_optimal_path('AWAKEN', 'RESPOND'), (6, ['AWAKEN', 'QUERY', 'RESPOND']))
+        self.assertFalse(self.cache.remove_edge('RESPOND', 'AWAKEN'))
+
+    def test_random_drift_stays_exact(self):
+        rng = random.Random(9)
+        n = 50
+        graph = {i: {rng.randrange(n): rng.randint(1, 9) for _ in range(3)} for i in range(n)}
+        cache = RouterCache(graph, capacity=8)
+        for _ in range(400):
+            roll = rng.random()
+            u, v = rng.randrange(n), rng.randrange(n)
+            if roll < 0.15:
+                cache.update_edge(u, v, rng.randint(1, 9))
+            elif roll < 0.25 and graph[u]:
+                cache.remove_edge(u, rng.choice(list(graph[u])))
+            else:
+                s = rng.randrange(8)
+                cost, path = cache.find_optimal_path(s, v)
+                self.assertEqual(cost, find_optimal_path(graph, s, v)[0], "A stale route survived the drift!")
+                if path:
+                    self.assertEqual(sum(graph[a][b] for a, b in zip(path, path[1:])), cost)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 from shela_core import ShelaOS
 
@@ -43,5 +44,37 @@ class TestShelaCore(unittest.TestCase):
         response = new_os.ingest("AWAKEN")
         self.assertIn("OFFLINE", response)
 
+    def test_ingest_many_matches_ingest(self):
+        script = ["awaken", " STATUS ", "NOISE", "Harmony", "status"]
+        twin = ShelaOS()
+        twin.boot()
+        expected = [twin.ingest(cmd) for cmd in script]
+        self.assertEqual(list(self.os.ingest_many(script)), expected, "The pipeline sang a different song!")
+        self.assertEqual(len(self.os.memory), len(script))
+
+    def test_ingest_many_is_lazy_and_halts(self):
+        responses = self.os.ingest_many(["HALT", "AWAKEN"])
+        self.assertEqual(len(self.os.memory), 0, "The batch ran before anyone listened!")
+        self.assertIn("GOODBYE", next(responses))
+        self.assertIn("OFFLINE", next(responses))
+
+    def test_ingest_stream(self):
+        async def carbon():
+            for cmd in ["awaken", "harmony"]:
+                yield cmd
+
+        async def listen():
+            return [response async for response in self.os.ingest_stream(carbon())]
+
+        responses = asyncio.run(listen())
+        self.assertIn("STABLE", responses[0])
+        self.assertIn("[B♭, A, C, B♮]", responses[1])
+
+    def test_relearned_word_keeps_its_reflex(self):
+        self.os.lexicon.remove("HARMONY")
+        self.assertIn("UNRECOGNIZED", self.os.ingest("HARMONY"))
+        self.os.lexicon.insert("HARMONY")
+        self.assertIn("[B♭, A, C, B♮]", self.os.ingest("HARMONY"))
+
 if __name__ == '__main__':
     unittest.main()
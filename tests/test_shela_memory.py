@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+from shela_core import ShelaOS
+from shela_memory import OFFSET, ThoughtMemory
+
+class TestThoughtMemory(unittest.TestCase):
+    def setUp(self):
+        self.scratch = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.scratch.name, "thoughts.jsonl")
+
+    def tearDown(self):
+        self.scratch.cleanup()
+
+    def test_ring_stays_bounded(self):
+        memory = ThoughtMemory(capacity=3)
+        for thought in ["A", "B", "C", "D", "E"]:
+            memory.append(thought)
+        self.assertEqual(len(memory), 5, "The count forgot thoughts that merely left RAM!")
+        self.assertEqual(memory.held_in_ram, 3)
+        self.assertEqual(memory.recent(2), ["D", "E"])
+        self.assertEqual(memory[-3], "C")
+        with self.assertRaises(IndexError):
+            memory[0]
+
+    def test_spill_and_lazy_rebirth(self):
+        memory = ThoughtMemory(capacity=2, log_path=self.path)
+        for i in range(10):
+            memory.append(f"THOUGHT {i}\nwith a second line")
+        self.assertEqual(memory[0], "THOUGHT 0\nwith a second line", "An evicted thought was not recalled from disk!")
+        memory.close()
+
+        reborn = ThoughtMemory(capacity=2, log_path=self.path)
+        self.assertEqual(len(reborn), 10)
+        self.assertEqual(reborn.held_in_ram, 0, "Rebirth should not read the whole chronicle!")
+        reborn.append("AWAKEN")
+        self.assertEqual(reborn.recent(3), ["THOUGHT 8\nwith a second line", "THOUGHT 9\nwith a second line", "AWAKEN"])
+        self.assertEqual(len(list(reborn)), 11)
+        reborn.close()
+
+    def test_lost_index_is_rebuilt(self):
+        memory = ThoughtMemory(capacity=4, log_path=self.path)
+        for thought in ["AWAKEN", "STATUS", "HALT"]:
+            memory.append(thought)
+        memory.close()
+        os.remove(self.path + ".idx")
+        reborn = ThoughtMemory(capacity=4, log_path=self.path)
+        self.assertEqual(list(reborn), ["AWAKEN", "STATUS", "HALT"])
+        reborn.close()
+
+    def test_shela_remembers_across_sessions(self):
+        shela = ShelaOS(memory_capacity=8, memory_log=self.path)
+        shela.boot()
+        shela.ingest("awaken")
+        shela.close()
+        reborn = ShelaOS(memory_capacity=8, memory_log=self.path)
+        reborn.boot()
+        self.assertIn("2 THOUGHTS", reborn.ingest("STATUS"))
+        self.assertEqual(reborn.memory.recent(2), ["AWAKEN", "STATUS"])
+        reborn.close()
+
+    def test_walking_past_capacity_without_a_log(self):
+        memory = ThoughtMemory(capacity=3)
+        for thought in ["A", "B", "C", "D", "E"]:
+            memory.append(thought)
+        self.assertEqual(memory.recent(10), ["C", "D", "E"], "recent() reached for thoughts the ring let go!")
+        self.assertEqual(list(memory), ["C", "D", "E"])
+        shela = ShelaOS(memory_capacity=2)
+        shela.boot()
+        for command in ["awaken", "status", "harmony"]:
+            shela.ingest(command)
+        self.assertEqual(list(shela.memory), ["STATUS", "HARMONY"])
+
+    def test_torn_last_line_is_cut_on_reopen(self):
+        memory = ThoughtMemory(capacity=4, log_path=self.path)
+        for thought in ["A", "B", "C"]:
+            memory.append(thought)
+        memory.close()
+        # A crash mid-append: the index got its offset, the log only half a line
+        with open(self.path + ".idx", "ab") as index:
+            index.write(OFFSET.pack(os.path.getsize(self.path)))
+        with open(self.path, "ab") as log:
+            log.write(b'"D')
+        reborn = ThoughtMemory(capacity=4, log_path=self.path)
+        self.assertEqual(len(reborn), 3)
+        reborn.append("E")
+        reborn.close()
+        again = ThoughtMemory(capacity=1, log_path=self.path)
+        self.assertEqual(list(again), ["A", "B", "C", "E"], "The torn thought poisoned the chronicle!")
+        again.close()
+
+    def test_torn_line_without_index_entry(self):
+        memory = ThoughtMemory(capacity=4, log_path=self.path)
+        memory.append("A")
+        memory.close()
+        with open(self.path, "ab") as log:
+            log.write(b'"half')
+        reborn = ThoughtMemory(capacity=4, log_path=self.path)
+        reborn.append("B")
+        self.assertEqual(list(reborn), ["A", "B"])
+        reborn.close()
+
+if __name__ == '__main__':
+    unittest.main()
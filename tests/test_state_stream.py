@@ -0,0 +1,174 @@
+import asyncio
+import base64
+import json
+import os
+import struct
+import tempfile
+import unittest
+from state_stream import StateStreamServer, read_delta, serve_in_thread, utf8_safe_end, ws_frame, ws_read_frame
+
+async def read_event(reader):
+    """One SSE event as a dict of its fields (comments and the retry hint skipped)."""
+    while True:
+        block = (await asyncio.wait_for(reader.readuntil(b"\n\n"), 2)).decode("utf-8")
+        fields = dict(line.split(": ", 1) for line in block.strip().split("\n") if not line.startswith((":", "retry")))
+        if fields:
+            return fields
+
+class TestStateStream(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.scratch = tempfile.TemporaryDirectory()
+        self.state = os.path.join(self.scratch.name, "state.md")
+        self.telemetry = os.path.join(self.scratch.name, "telemetry.json")
+        self.templates = os.path.join(self.scratch.name, "templates")
+        os.makedirs(self.templates)
+        with open(os.path.join(self.templates, "shela_mobile.html"), "w") as f:
+            f.write("<html><body>TACTILE</body></html>")
+        with open(self.state, "w") as f:
+            f.write("# Duo Session State\n")
+        self.server = StateStreamServer(self.state, self.telemetry, self.templates, port=0, interval=0.01)
+        self.port = await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.scratch.cleanup()
+
+    async def open(self, request):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(request.encode())
+        await writer.drain()
+        await reader.readuntil(b"\r\n\r\n")
+        return reader, writer
+
+    def append(self, text):
+        with open(self.state, "a") as f:
+            f.write(text)
+
+    async def test_sse_pushes_only_appended_bytes(self):
+        start = os.path.getsize(self.state)
+        reader, writer = await self.open(f"GET /events?offset={start} HTTP/1.1\r\n\r\n")
+        self.append("<<<MOZART>>>\nThe overture begins.\n")
+        event = await read_event(reader)
+        self.assertEqual(event["event"], "state")
+        payload = json.loads(event["data"])
+        self.assertEqual(payload["offset"], start)
+        self.assertEqual(payload["text"], "<<<MOZART>>>\nThe overture begins.\n")
+        self.assertEqual(int(event["id"]), os.path.getsize(self.state), "The id must be the resume offset!")
+        writer.close()
+
+    async def test_last_event_id_resumes_where_the_client_left(self):
+        self.append("missed while offline\n")
+        resume = len("# Duo Session State\n")
+        reader, writer = await self.open(f"GET /events HTTP/1.1\r\nLast-Event-ID: {resume}\r\n\r\n")
+        payload = json.loads((await read_event(reader))["data"])
+        self.assertEqual(payload["text"], "missed while offline\n")
+        writer.close()
+
+    async def test_truncated_state_sends_reset(self):
+        reader, writer = await self.open("GET /events?offset=9999 HTTP/1.1\r\n\r\n")
+        event = await read_event(reader)
+        self.assertEqual(event["event"], "reset", "A shrunken score must restart from the top!")
+        self.assertEqual(json.loads((await read_event(reader))["data"])["offset"], 0)
+        writer.close()
+
+    async def test_telemetry_is_pushed_on_change(self):
+        reader, writer = await self.open(f"GET /events?offset={os.path.getsize(self.state)} HTTP/1.1\r\n\r\n")
+        with open(self.telemetry, "w") as f:
+            json.dump({"agent": "Loki", "usage": "42 tokens"}, f)
+        event = await read_event(reader)
+        self.assertEqual(event["event"], "telemetry")
+        self.assertEqual(json.loads(event["data"])["agent"], "Loki")
+        writer.close()
+
+    async def test_websocket_streams_json_frames(self):
+        key = base64.b64encode(b"sixteen byte key").decode()
+        reader, writer = await self.open(
+            f"GET /ws?offset=0 HTTP/1.1\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n\r\n")
+        opcode, payload = await asyncio.wait_for(ws_read_frame(reader), 2)
+        message = json.loads(payload)
+        self.assertEqual(opcode, 0x1)
+        self.assertEqual((message["type"], message["text"]), ("state", "# Duo Session State\n"))
+        self.append("<<<EXE>>>\n")
+        message = json.loads((await asyncio.wait_for(ws_read_frame(reader), 2))[1])
+        self.assertEqual(message["text"], "<<<EXE>>>\n")
+        # A masked close from the client is echoed back
+        writer.write(bytes([0x88, 0x82]) + b"\x00\x00\x00\x00" + struct.pack(">H", 1000))
+        await writer.drain()
+        opcode, _ = await asyncio.wait_for(ws_read_frame(reader), 2)
+        self.assertEqual(opcode, 0x8)
+        writer.close()
+
+    async def test_foreign_origins_are_refused(self):
+        key = base64.b64encode(b"sixteen byte key").decode()
+        for request in ("GET /state HTTP/1.1\r\nOrigin: http://evil.example\r\n\r\n",
+                        f"GET /events HTTP/1.1\r\nOrigin: http://127.0.0.1:{self.port + 1}\r\n\r\n",
+                        "GET /ws HTTP/1.1\r\nOrigin: null\r\nUpgrade: websocket\r\n"
+                        f"Sec-WebSocket-Key: {key}\r\n\r\n"):
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+            writer.write(request.encode())
+            response = (await asyncio.wait_for(reader.read(), 2)).decode()
+            self.assertTrue(response.startswith("HTTP/1.1 403"), "A stranger's page must not read the score!")
+            self.assertNotIn("# Duo Session State", response)
+            writer.close()
+
+    async def test_own_origin_is_served_without_cors(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(f"GET /state HTTP/1.1\r\nOrigin: http://localhost:{self.port}\r\n\r\n".encode())
+        response = (await reader.read()).decode()
+        self.assertTrue(response.startswith("HTTP/1.1 200"))
+        self.assertNotIn("Access-Control-Allow-Origin", response, "Same-origin pages need no CORS!")
+        writer.close()
+
+    async def test_pages_carry_the_stream_client(self):
+        reader, writer = await self.open("GET /mobile HTTP/1.1\r\n\r\n")
+        body = (await reader.read()).decode()
+        self.assertIn("TACTILE", body)
+        self.assertIn("EventSource", body, "The mobile glass must listen to the live score!")
+        writer.close()
+
+    async def test_plain_delta_endpoint(self):
+        self.append("tail")
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(b"GET /state?offset=20 HTTP/1.1\r\n\r\n")
+        response = (await reader.read()).decode()
+        self.assertIn(f"X-Shela-Offset: {os.path.getsize(self.state)}", response)
+        self.assertTrue(response.endswith("\r\n\r\ntail"))
+        writer.close()
+
+class TestServeInThread(unittest.TestCase):
+    def test_reports_the_bound_port_and_bind_failures(self):
+        with tempfile.TemporaryDirectory() as scratch:
+            state = os.path.join(scratch, "state.md")
+            with open(state, "w") as f:
+                f.write("# Duo Session State\n")
+            server = serve_in_thread(state, port=0)
+            self.assertGreater(server.port, 0)
+            with self.assertRaises(OSError, msg="A taken port must not fail silently in the thread!"):
+                serve_in_thread(state, port=server.port)
+
+class TestDeltaReading(unittest.TestCase):
+    def test_half_written_characters_wait(self):
+        data = "שלום".encode("utf-8")
+        self.assertEqual(utf8_safe_end(data), len(data))
+        self.assertEqual(utf8_safe_end(data[:-1]), len(data) - 2)
+        self.assertEqual(utf8_safe_end(b"abc"), 3)
+
+    def test_read_delta_chunks_on_boundaries(self):
+        with tempfile.NamedTemporaryFile("wb", delete=False) as f:
+            f.write("ab🎼cd".encode("utf-8"))
+        try:
+            offset, text, reset = read_delta(f.name, 0, limit=4)
+            self.assertEqual((offset, text, reset), (2, "ab", False))
+            offset, text, _ = read_delta(f.name, offset, limit=8)
+            self.assertEqual(text, "🎼cd")
+            self.assertEqual(read_delta(f.name, 100)[2], True)
+        finally:
+            os.unlink(f.name)
+
+    def test_frame_lengths(self):
+        self.assertEqual(ws_frame(b"x" * 10)[1], 10)
+        self.assertEqual(ws_frame(b"x" * 300)[1], 126)
+        self.assertEqual(ws_frame(b"x" * 70000)[1], 127)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import random
+import tempfile
+import unittest
+from kmp_memory import kmp_search
+from suffix_index import ChronicleIndex, build_suffix_array, build_lcp_array
+
+class TestSuffixArray(unittest.TestCase):
+    def test_banana_chronicle(self):
+        data = b"banana"
+        sa = build_suffix_array(data)
+        self.assertEqual(list(sa), [5, 3, 1, 0, 4, 2])
+        self.assertEqual(list(build_lcp_array(data, sa)), [0, 1, 3, 0, 0, 2])
+
+    def test_matches_naive_sort(self):
+        rng = random.Random(5)
+        for _ in range(20):
+            data = bytes(rng.choice(b"ab\n") for _ in range(rng.randint(0, 60)))
+            self.assertEqual(list(build_suffix_array(data)), sorted(range(len(data)), key=lambda i: data[i:]))
+
+class TestChronicleIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmp.name, ".shela_duo_state.md")
+        rng = random.Random(11)
+        words = ["<<<MOZART>>>", "EXE_DONE(", "AWAKEN", "SHELA", "שלום", "\n", "ANAN"]
+        self.text = "".join(rng.choice(words) for _ in range(400)).encode("utf-8")
+        with open(self.log, "wb") as f:
+            f.write(self.text)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertAgreesWithScan(self, index, text):
+        for q in ["AWAKEN", "ANAN", "N", "<<<MOZART>>>EXE_DONE(", "שלום", "ABSENT"]:
+            expected = kmp_search(text, q.encode("utf-8"))
+            self.assertEqual(index.locate(q), expected, f"The chronicle misremembered {q}")
+            self.assertEqual(index.count(q), len(expected))
+
+    def test_segments_seams_and_tail(self):
+        index = ChronicleIndex(self.log, segment_size=97)
+        self.assertEqual(index.refresh(), len(self.text) // 97)
+        self.assertAgreesWithScan(index, self.text)
+
+    def test_count_keeps_no_offsets(self):
+        index = ChronicleIndex(self.log, segment_size=97)
+        index.refresh()
+        total, hits = index._sweep("<<<MOZART>>>EXE_DONE(", collect=False)
+        self.assertEqual(total, len(kmp_search(self.text, b"<<<MOZART>>>EXE_DONE(")))
+        self.assertEqual(hits, [], "Counting must not hoard the seam and tail echoes!")
+
+    def test_incremental_sealing_and_persistence(self):
+        index = ChronicleIndex(self.log, segment_size=128)
+        index.refresh()
+        sealed = len(index.segments)
+        self.assertTrue(os.path.exists(self.log + ".sa"))
+
+        extra = b"<<<MOZART>>>AWAKEN ANAN\n" * 20
+        with open(self.log, "ab") as f:
+            f.write(extra)
+        reloaded = ChronicleIndex(self.log, segment_size=128)
+        self.assertEqual(len(reloaded.segments), sealed, "The sealed segments were not restored")
+        self.assertGreater(reloaded.refresh(), 0)
+        self.assertAgreesWithScan(reloaded, self.text + extra)
+
+    def test_rewritten_log_invalidates_index(self):
+        ChronicleIndex(self.log, segment_size=64).refresh()
+        with open(self.log, "wb") as f:
+            f.write(b"Z" * 300)
+        index = ChronicleIndex(self.log, segment_size=64)
+        self.assertEqual(index.segments, [])
+        index.refresh()
+        self.assertEqual(index.count("ZZ"), 299)
+
+    def test_longest_repeat(self):
+        with open(self.log, "wb") as f:
+            f.write(b"xxHARMONYyyHARMONYzz")
+        index = ChronicleIndex(self.log, segment_size=20)
+        index.refresh()
+        offset, length = index.longest_repeat()
+        self.assertEqual(length, 7)
+        self.assertIn(offset, (2, 11))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,5 +21,19 @@ class TestPrefixChoir(unittest.TestCase):
         self.assertTrue(self.choir.starts_with("CAD"), "The breath for CAD was not drawn.")
         self.assertFalse(self.choir.starts_with("MELODY"), "Melody is not in the current score.")
 
+    def test_prefix_enumeration(self):
+        self.assertEqual(self.choir.words_with_prefix("HARM"), ["HARMONIC", "HARMONY"])
+        self.assertEqual(self.choir.words_with_prefix(""), ["CADENZA", "HARMONIC", "HARMONY"])
+        self.assertEqual(self.choir.words_with_prefix("H", limit=1), ["HARMONIC"])
+        self.assertEqual(self.choir.words_with_prefix("MELODY"), [])
+
+    def test_removal_prunes_silent_branches(self):
+        self.assertTrue(self.choir.remove("HARMONY"))
+        self.assertFalse(self.choir.search("HARMONY"))
+        self.assertTrue(self.choir.search("HARMONIC"))
+        self.assertFalse(self.choir.remove("HARMON"), "A prefix is not a resolved chord!")
+        self.assertTrue(self.choir.remove("CADENZA"))
+        self.assertFalse(self.choir.starts_with("C"), "The silent branch was not pruned.")
+
 if __name__ == '__main__':
     unittest.main()
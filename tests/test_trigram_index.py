@@ -0,0 +1,75 @@
+import os
+import tempfile
+import time
+import unittest
+from trigram_index import TrigramIndex, extract_trigrams
+
+class TestWorkspaceLexicon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.write("core/ear.py", "def calculate_dissonance(a, b):\n    return 0\n# calculate_dissonance again\n")
+        self.write("core/router.py", "def find_optimal_path(graph):\n    pass\n")
+        self.write("README.md", "Shela listens.\nSHELA awakens.\n")
+        self.write("node_modules/noise.js", "calculate_dissonance")
+        with open(os.path.join(self.root, "blob.bin"), "wb") as f:
+            f.write(b"\0calculate_dissonance")
+        self.index = TrigramIndex(self.root)
+        self.index.refresh()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel_path, text):
+        path = os.path.join(self.root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_trigrams(self):
+        self.assertEqual(extract_trigrams("AbCd"), {"abc", "bcd"})
+        self.assertEqual(extract_trigrams("ab"), set())
+
+    def test_search_verifies_candidates(self):
+        hits = self.index.search("calculate_dissonance")
+        self.assertEqual([(h.path, h.line_no) for h in hits], [(os.path.join("core", "ear.py"), 1), (os.path.join("core", "ear.py"), 3)])
+        self.assertEqual(hits[0].line, "def calculate_dissonance(a, b):")
+        # Trigrams alone admit the file, KMP rejects it
+        self.assertEqual(self.index.search("dissonance(a, c)"), [])
+
+    def test_silent_dirs_and_binaries_are_skipped(self):
+        paths = {h.path for h in self.index.search("calculate_dissonance")}
+        self.assertNotIn(os.path.join("node_modules", "noise.js"), paths)
+        self.assertNotIn("blob.bin", paths)
+
+    def test_case_modes_and_short_queries(self):
+        self.assertEqual(len(self.index.search("shela")), 0)
+        self.assertEqual([h.line_no for h in self.index.search("shela", ignore_case=True)], [1, 2])
+        self.assertEqual(len(self.index.search("Sh")), 1)
+        self.assertEqual(self.index.search(""), [])
+
+    def test_ignore_case_survives_length_changing_lowercase(self):
+        # 'İ'.lower() is two code points, shifting every offset after it
+        self.write("notes/istanbul.md", "İİİİİİ İİİİ\nİstanbul first\nthe SHELA line\n")
+        self.index.refresh()
+        hits = self.index.search("shela line", ignore_case=True)
+        self.assertEqual([(h.line_no, h.line) for h in hits], [(3, "the SHELA line")], "The dotted İ bent the line map!")
+
+    def test_incremental_refresh(self):
+        self.assertEqual(self.index.refresh(), (0, 0, 0))
+        ear = os.path.join(self.root, "core", "ear.py")
+        self.write("core/ear.py", "def forgiving_ear():\n    pass\n")
+        stamp = time.time() + 5
+        os.utime(ear, (stamp, stamp))
+        self.write("core/new.py", "calculate_dissonance = None\n")
+        os.remove(os.path.join(self.root, "README.md"))
+        self.assertEqual(self.index.refresh(), (1, 1, 1))
+        self.assertEqual([h.path for h in self.index.search("calculate_dissonance")], [os.path.join("core", "new.py")])
+        self.assertNotIn("listens", {g for g in self.index.postings if "lis" in g})
+        self.assertEqual(self.index.candidates("listens"), [])
+
+    def test_limit(self):
+        self.assertEqual(len(self.index.search("def", limit=1)), 1)
+
+if __name__ == '__main__':
+    unittest.main()
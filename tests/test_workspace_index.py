@@ -0,0 +1,153 @@
+import gc
+import os
+import io
+import json
+import random
+import shutil
+import tempfile
+import time
+import unittest
+import workspace_index
+from workspace_index import WorkspaceIndex, serve
+
+class TestWorkspaceCartographer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        for rel_path in ["core/duo.py", "core/trie.py", "core/shela_ear.py", "tests/test_trie.py", "README.md", ".git/HEAD"]:
+            self.touch(rel_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def touch(self, rel_path):
+        path = os.path.join(self.root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "w").close()
+
+    def paths(self, results):
+        return [path for _, path in results]
+
+    def test_initial_walk_skips_silent_dirs(self):
+        index = WorkspaceIndex(self.root, watch=False)
+        self.assertEqual(len(index), 5)
+        self.assertEqual(index.query(os.path.join(".git", "")), [])
+
+    def test_prefix_and_fuzzy_ranking(self):
+        index = WorkspaceIndex(self.root, watch=False)
+        self.assertEqual(self.paths(index.query(os.path.join("core", "t"))), [os.path.join("core", "trie.py")])
+        # Basename prefix, case-insensitive
+        self.assertEqual(self.paths(index.query("SHELA")), [os.path.join("core", "shela_ear.py")])
+        # A typo still finds the file, ranked by shela_ear distance
+        ranked = index.query("trie.pi")
+        self.assertEqual(ranked[0], (1, os.path.join("core", "trie.py")))
+        self.assertEqual(index.query("", 5), [])
+
+    def test_fragments_and_typos(self):
+        for rel_path in ["ui/my_widget.dart", "core/render_cycle.py", "forge/phantom/glass.py"]:
+            self.touch(rel_path)
+        index = WorkspaceIndex(self.root, watch=False)
+        self.assertEqual(self.paths(index.query("widgt")), [os.path.join("ui", "my_widget.dart")])
+        self.assertEqual(index.query("rnder_cycle"), [(1, os.path.join("core", "render_cycle.py"))],
+                         "A dropped letter must not lose the score!")
+        # Directory names are heard too
+        self.assertEqual(self.paths(index.query("phantm")), [os.path.join("forge", "phantom", "glass.py")])
+
+    def test_out_of_watches_falls_back_to_rewalks(self):
+        index = WorkspaceIndex(self.root)
+        if index.watcher is None:
+            self.skipTest("inotify unavailable")
+        original = workspace_index.REWALK_INTERVAL
+        try:
+            def exhausted(directory):
+                raise OSError(28, "inotify_add_watch failed")
+            index.watcher.watch = exhausted
+            self.touch("forge/deep/phantom_ui.py")
+            self.assertIn(os.path.join("forge", "deep", "phantom_ui.py"), self.paths(index.query("phantom")))
+            self.assertIsNone(index.watcher)
+            workspace_index.REWALK_INTERVAL = 0
+            self.touch("forge/deep/loki.py")
+            self.assertEqual(self.paths(index.query("loki")), [os.path.join("forge", "deep", "loki.py")],
+                             "Without watches the map must still follow the tree!")
+        finally:
+            workspace_index.REWALK_INTERVAL = original
+            index.close()
+
+    def test_manual_refresh(self):
+        index = WorkspaceIndex(self.root, watch=False)
+        self.touch("core/lis.py")
+        os.remove(os.path.join(self.root, "README.md"))
+        self.assertEqual(index.refresh(), (1, 1))
+        self.assertEqual(self.paths(index.query("lis")), [os.path.join("core", "lis.py")])
+        self.assertEqual(index.query("README"), [])
+
+    def test_inotify_keeps_index_current(self):
+        index = WorkspaceIndex(self.root)
+        if index.watcher is None:
+            self.skipTest("inotify unavailable")
+        try:
+            self.touch("core/neural_router.py")
+            self.touch("forge/deep/phantom_ui.py")
+            self.assertIn(os.path.join("core", "neural_router.py"), self.paths(index.query("neural")))
+            self.assertIn(os.path.join("forge", "deep", "phantom_ui.py"), self.paths(index.query("phantom")))
+            shutil.rmtree(os.path.join(self.root, "forge"))
+            os.rename(os.path.join(self.root, "core", "duo.py"), os.path.join(self.root, "core", "trio.py"))
+            self.assertEqual(index.query("phantom"), [])
+            self.assertEqual(self.paths(index.query("trio")), [os.path.join("core", "trio.py")])
+            self.assertNotIn(os.path.join("core", "duo.py"), index.paths)
+        finally:
+            index.close()
+
+    def test_json_lines_protocol(self):
+        index = WorkspaceIndex(self.root, watch=False)
+        stdin = io.StringIO('{"q": "trie", "limit": 1}\n\n{"op": "refresh"}\nnot json\n')
+        stdout = io.StringIO()
+        serve(index, stdin, stdout)
+        replies = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(replies[0]["results"], [[0, os.path.join("core", "trie.py")]])
+        self.assertEqual((replies[1]["added"], replies[1]["removed"]), (0, 0))
+        self.assertIn("error", replies[2])
+        self.assertIn("ms", replies[0])
+
+class TestCartographerAtScale(unittest.TestCase):
+    WORDS = ("widget render cycle state stream index core forge shela duo test util config model view "
+             "controller service helper handler router cache memory node tree graph parser lexer token "
+             "chunk sync bus carbon neural phantom loki mozart score tempo fugue").split()
+
+    @classmethod
+    def setUpClass(cls):
+        # 100k paths in 4000 nested directories, drawn from a small vocabulary so every bigram is crowded
+        rng = random.Random(32)
+        dirs = [""]
+        while len(dirs) < 4000:
+            dirs.append(os.path.join(rng.choice(dirs), rng.choice(cls.WORDS) + str(rng.randrange(10))))
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.index = WorkspaceIndex(cls.tmp.name, watch=False)
+        gc.disable()
+        try:
+            while len(cls.index) < 100_000:
+                name = "_".join(rng.sample(cls.WORDS, rng.randint(1, 3))) + str(rng.randrange(100))
+                cls.index.add_path(os.path.join(rng.choice(dirs[1:]), name + rng.choice([".py", ".dart", ".md"])))
+        finally:
+            gc.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+        del cls.index
+
+    def test_fuzzy_queries_answer_within_ten_ms(self):
+        for needle, expected in [("widgt", "widget"), ("rnder_cycle", "render_cycle"), ("statestream", "state_stream"),
+                                 ("chnk_sync", "chunk_sync"), ("helpr", "helper"), ("phantm", "phantom"),
+                                 ("parsr_lexr", "parser_lexer"), ("py", ".py")]:
+            fastest = float("inf")
+            for _ in range(5):
+                started = time.perf_counter()
+                results = self.index.query(needle)
+                fastest = min(fastest, time.perf_counter() - started)
+            self.assertLess(fastest, 0.010, f"'{needle}' took {1000 * fastest:.1f} ms on 100k paths!")
+            self.assertEqual(len(results), 20)
+            self.assertTrue(all(expected in path for _, path in results), f"'{needle}' wandered off: {results[:3]}")
+
+if __name__ == '__main__':
+    unittest.main()